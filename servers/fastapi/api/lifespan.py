@@ -3,7 +3,18 @@ import os
 
 from fastapi import FastAPI
 
+from api.v1.ppt.endpoints.presentation import generate_presentation_handler
 from services.database import create_db_and_tables
+from services.document_parser_pool import DOCUMENT_PARSER_POOL
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.image_processing_pool import IMAGE_PROCESSING_POOL
+from services.presentation_generation_job_service import (
+    PRESENTATION_GENERATION_JOB_SERVICE,
+)
+from services.renderer_client import RENDERER_CLIENT
+from services.stock_image_client import close_stock_image_clients
+from services.temp_file_service import TEMP_FILE_SERVICE
+from services.warmup_service import WARMUP_SERVICE
 from utils.get_env import get_app_data_directory_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
@@ -14,10 +25,26 @@ from utils.model_availability import (
 async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
-    Initializes the application data directory and checks LLM model availability.
+    Initializes the application data directory, checks LLM model availability
+    and resumes unfinished presentation generation jobs.
+    Heavy services are warmed up in the background, see /health/ready.
 
     """
     os.makedirs(get_app_data_directory_env(), exist_ok=True)
     await create_db_and_tables()
     await check_llm_and_image_provider_api_or_model_availability()
+    await PRESENTATION_GENERATION_JOB_SERVICE.resume(generate_presentation_handler)
+    WARMUP_SERVICE.start(
+        {
+            "temp_files": TEMP_FILE_SERVICE.cleanup_stale_files,
+            "icon_index": ICON_FINDER_SERVICE.warm_up,
+            "document_parser": DOCUMENT_PARSER_POOL.warm_up,
+            "image_processing": IMAGE_PROCESSING_POOL.warm_up,
+        }
+    )
     yield
+    await WARMUP_SERVICE.stop()
+    DOCUMENT_PARSER_POOL.shutdown()
+    IMAGE_PROCESSING_POOL.shutdown()
+    await close_stock_image_clients()
+    await RENDERER_CLIENT.close()
@@ -1,13 +1,14 @@
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from utils.get_env import get_can_change_keys_env
-from utils.user_config import update_env_with_user_config
+from utils.user_config import USER_CONFIG_SNAPSHOT
 
 
-class UserConfigEnvUpdateMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if get_can_change_keys_env() != "false":
-            update_env_with_user_config()
-        return await call_next(request)
+class UserConfigEnvUpdateMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and get_can_change_keys_env() != "false":
+            USER_CONFIG_SNAPSHOT.refresh()
+        await self.app(scope, receive, send)
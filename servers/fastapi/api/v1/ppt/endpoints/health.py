@@ -0,0 +1,17 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from services.warmup_service import WARMUP_SERVICE
+
+HEALTH_ROUTER = APIRouter(prefix="/health", tags=["Health"])
+
+
+@HEALTH_ROUTER.get("", response_model=dict)
+async def get_health():
+    return {"status": "ok", **WARMUP_SERVICE.get_status()}
+
+
+@HEALTH_ROUTER.get("/ready", response_model=dict)
+async def get_readiness():
+    status = WARMUP_SERVICE.get_status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
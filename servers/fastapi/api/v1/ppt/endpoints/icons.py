@@ -1,5 +1,6 @@
 from typing import List
 from fastapi import APIRouter
+from models.icon_search_request import IconSearchRequest
 from services.icon_finder_service import ICON_FINDER_SERVICE
 
 ICONS_ROUTER = APIRouter(prefix="/icons", tags=["Icons"])
@@ -8,3 +9,8 @@ ICONS_ROUTER = APIRouter(prefix="/icons", tags=["Icons"])
 @ICONS_ROUTER.get("/search", response_model=List[str])
 async def search_icons(query: str, limit: int = 20):
     return await ICON_FINDER_SERVICE.search_icons(query, limit)
+
+
+@ICONS_ROUTER.post("/search", response_model=List[List[str]])
+async def search_icons_batch(request: IconSearchRequest):
+    return await ICON_FINDER_SERVICE.search_icons_batch(request.queries, request.limit)
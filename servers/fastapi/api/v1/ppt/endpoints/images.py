@@ -18,11 +18,17 @@ IMAGES_ROUTER = APIRouter(prefix="/images", tags=["Images"])
 
 @IMAGES_ROUTER.get("/generate")
 async def generate_image(
-    prompt: str, sql_session: AsyncSession = Depends(get_async_session)
+    prompt: str,
+    force_fresh: bool = False,
+    sql_session: AsyncSession = Depends(get_async_session),
 ):
+    """
+    - If force_fresh, a new image is generated instead of reusing a cached one
+    for the same prompt.
+    """
     images_directory = get_images_directory()
     image_prompt = ImagePrompt(prompt=prompt)
-    image_generation_service = ImageGenerationService(images_directory)
+    image_generation_service = ImageGenerationService(images_directory, force_fresh)
 
     image = await image_generation_service.generate_image(image_prompt)
     if not isinstance(image, ImageAsset):
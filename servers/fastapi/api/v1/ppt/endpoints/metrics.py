@@ -0,0 +1,38 @@
+from fastapi import APIRouter
+
+from services.context_packer import CONTEXT_PACKER
+from services.document_parse_cache import DOCUMENT_PARSE_CACHE
+from services.export_cache import EXPORT_CACHE
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.image_asset_cache import IMAGE_ASSET_CACHE
+from services.image_processing_pool import IMAGE_PROCESSING_POOL
+from services.layout_cache import LAYOUT_CACHE
+from services.llm_client import LLM_CLIENT_REGISTRY
+from services.llm_response_cache import LLM_RESPONSE_CACHE
+from services.pptx_slide_cache import PPTX_SLIDE_CACHE
+from services.renderer_client import RENDERER_CLIENT
+from services.stock_image_client import STOCK_IMAGE_CLIENTS
+from utils.user_config import USER_CONFIG_SNAPSHOT
+
+METRICS_ROUTER = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@METRICS_ROUTER.get("", response_model=dict)
+async def get_metrics():
+    return {
+        "context_packer": CONTEXT_PACKER.get_stats(),
+        "document_parse_cache": DOCUMENT_PARSE_CACHE.get_stats(),
+        "export_cache": EXPORT_CACHE.get_stats(),
+        "icon_search": ICON_FINDER_SERVICE.get_stats(),
+        "image_asset_cache": IMAGE_ASSET_CACHE.get_stats(),
+        "image_processing": IMAGE_PROCESSING_POOL.get_stats(),
+        "layout_cache": LAYOUT_CACHE.get_stats(),
+        "llm_clients": LLM_CLIENT_REGISTRY.get_stats(),
+        "llm_response_cache": LLM_RESPONSE_CACHE.get_stats(),
+        "pptx_slide_cache": PPTX_SLIDE_CACHE.get_stats(),
+        "renderer_client": RENDERER_CLIENT.get_stats(),
+        "stock_image_clients": {
+            name: client.get_stats() for name, client in STOCK_IMAGE_CLIENTS.items()
+        },
+        "user_config": {"reloads": USER_CONFIG_SNAPSHOT.reloads},
+    }
@@ -1,16 +1,13 @@
-from datetime import datetime, timedelta
-import json
+import time
 from typing import List
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, BackgroundTasks, HTTPException
 
 from api.v1.ppt.background_tasks import pull_ollama_model_background_task
 from constants.supported_ollama_models import SUPPORTED_OLLAMA_MODELS
 from models.ollama_model_metadata import OllamaModelMetadata
 from models.ollama_model_status import OllamaModelStatus
-from models.sql.ollama_pull_status import OllamaPullStatus
-from services.database import get_container_db_async_session
-from utils.ollama import list_pulled_ollama_models
+from services.state_store import STATE_STORE
+from utils.ollama import get_ollama_pull_status_key, list_pulled_ollama_models
 
 OLLAMA_ROUTER = APIRouter(prefix="/ollama", tags=["Ollama"])
 
@@ -29,7 +26,6 @@ async def get_available_models():
 async def pull_model(
     model: str,
     background_tasks: BackgroundTasks,
-    session: AsyncSession = Depends(get_container_db_async_session),
 ):
 
     if model not in SUPPORTED_OLLAMA_MODELS:
@@ -53,25 +49,26 @@ async def pull_model(
             detail=f"Failed to check pulled models: {e}",
         )
 
+    pull_status_key = get_ollama_pull_status_key(model)
     saved_pull_status = None
     saved_model_status = None
     try:
-        saved_pull_status = await session.get(OllamaPullStatus, model)
-        saved_model_status = saved_pull_status.status
+        saved_pull_status = await STATE_STORE.get(pull_status_key)
+        saved_model_status = saved_pull_status["status"]
     except Exception as e:
         pass
 
     # If the model is being pulled, return the model
     if saved_model_status:
         # If the model is being pulled, return the model
-        # ? If the model status is pulled in database but was not found while listing pulled models,
+        # ? If the model status is pulled in state store but was not found while listing pulled models,
         # ? it means the model was deleted and we need to pull it again
         if (
             saved_model_status["status"] == "error"
             or saved_model_status["status"] == "pulled"
-            or saved_pull_status.last_updated < (datetime.now() - timedelta(seconds=10))
+            or saved_pull_status["last_updated"] < (time.time() - 10)
         ):
-            await session.delete(saved_pull_status)
+            await STATE_STORE.delete(pull_status_key)
         else:
             return saved_model_status
 
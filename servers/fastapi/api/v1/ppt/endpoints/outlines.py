@@ -9,6 +9,7 @@ from models.presentation_outline_model import PresentationOutlineModel
 from models.sql.presentation import PresentationModel
 from models.sse_response import SSECompleteResponse, SSEResponse, SSEStatusResponse
 from services.temp_file_service import TEMP_FILE_SERVICE
+from services.context_packer import CONTEXT_PACKER
 from services.database import get_async_session
 from services.documents_loader import DocumentsLoader
 from services.score_based_chunker import ScoreBasedChunker
@@ -37,14 +38,16 @@ async def stream_outlines(
         additional_context = ""
         if presentation.file_paths:
             documents_loader = DocumentsLoader(file_paths=presentation.file_paths)
-            await documents_loader.load_documents(temp_dir)
-            documents = documents_loader.documents
-            if documents and len(documents) == 1:
-                additional_context = documents[0]
+            documents_loader.check_files_exist()
+            if len(presentation.file_paths) == 1:
+                # Single documents are chunked while they are being parsed
                 chunker = ScoreBasedChunker()
                 try:
-                    chunks = await chunker.get_n_chunks(
-                        documents[0], presentation.n_slides
+                    chunks = await chunker.get_n_chunks_from_stream(
+                        documents_loader.stream_document(
+                            presentation.file_paths[0], temp_dir
+                        ),
+                        presentation.n_slides,
                     )
                     presentation_outlines = PresentationOutlineModel(
                         slides=[chunk.to_slide_outline() for chunk in chunks]
@@ -55,7 +58,11 @@ async def stream_outlines(
                         detail="Failed to generate presentation outlines. Please try again.",
                     )
             else:
-                additional_context = "\n\n".join(documents)
+                await documents_loader.load_documents(temp_dir)
+                packed_context = await CONTEXT_PACKER.pack_async(
+                    documents_loader.documents
+                )
+                additional_context = packed_context.text
 
         if not presentation_outlines:
             presentation_outlines_text = ""
@@ -1,14 +1,20 @@
 import asyncio
+import base64
+from datetime import datetime
 import json
 import os
 import random
-from typing import Annotated, List, Optional
-from fastapi import APIRouter, Body, Depends, HTTPException
+import time
+from typing import Annotated, List, Literal, Optional, Tuple
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
-from sqlalchemy import delete
+from sqlalchemy import and_, delete, exists, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
-from models.generate_presentation_request import GeneratePresentationRequest
+from models.generate_presentation_request import (
+    GeneratePresentationAsyncRequest,
+    GeneratePresentationRequest,
+)
 from models.presentation_and_path import PresentationPathAndEditPath
 from models.presentation_from_template import GetPresentationUsingTemplateRequest
 from models.presentation_outline_model import (
@@ -18,6 +24,7 @@ from models.presentation_outline_model import (
 from models.pptx_models import PptxPresentationModel
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_structure_model import PresentationStructureModel
+from models.presentation_summary import PresentationSummary
 from models.presentation_with_slides import (
     PresentationWithSlides,
 )
@@ -29,13 +36,26 @@ from services.image_generation_service import ImageGenerationService
 from utils.dict_utils import deep_update
 from utils.export_utils import export_presentation
 from utils.llm_calls.generate_presentation_outlines import generate_ppt_outline
+from models.sql.image_asset import ImageAsset
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
 from models.sql.slide import SlideModel
-from models.sse_response import SSECompleteResponse, SSEResponse
+from models.sse_response import SSECompleteResponse, SSEResponse, SSESlideResponse
 
+from services.context_packer import CONTEXT_PACKER
 from services.database import get_async_session
+from services.export_cache import EXPORT_CACHE
 from services.temp_file_service import TEMP_FILE_SERVICE
 from models.sql.presentation import PresentationModel
-from services.pptx_presentation_creator import PptxPresentationCreator
+from services.pptx_presentation_creator import (
+    PptxPresentationCreator,
+    get_pptx_image_dpi,
+)
+from services.presentation_generation_job_service import (
+    PRESENTATION_GENERATION_JOB_SERVICE,
+    GenerationProgressCallback,
+)
+from constants.images import MAX_PPTX_IMAGE_DPI
+from constants.presentation import MAX_PRESENTATIONS_PAGE_SIZE
 from utils.asset_directory_utils import get_exports_directory, get_images_directory
 from utils.llm_calls.generate_presentation_structure import (
     generate_presentation_structure,
@@ -43,6 +63,7 @@ from utils.llm_calls.generate_presentation_structure import (
 from utils.llm_calls.generate_slide_content import (
     get_slide_content_from_type_and_outline,
 )
+from utils.llm_provider import get_llm_concurrency
 from utils.process_slides import (
     process_slide_add_placeholder_assets,
     process_slide_and_fetch_assets,
@@ -80,32 +101,98 @@ async def delete_presentation(
         raise HTTPException(404, "Presentation not found")
 
     await sql_session.execute(delete(SlideModel).where(SlideModel.presentation == id))
+    await EXPORT_CACHE.invalidate(sql_session, id)
     await sql_session.delete(presentation)
     await sql_session.commit()
 
 
-@PRESENTATION_ROUTER.get("/all", response_model=List[PresentationWithSlides])
-async def get_all_presentations(sql_session: AsyncSession = Depends(get_async_session)):
-    presentations_with_slides = []
-    presentations = await sql_session.scalars(select(PresentationModel))
-
-    async def inner(presentation: PresentationModel, sql_session: AsyncSession):
-        first_slide = await sql_session.scalar(
-            select(SlideModel)
-            .where(SlideModel.presentation == presentation.id)
-            .where(SlideModel.index == 0)
+PRESENTATION_SUMMARY_COLUMNS = [
+    PresentationModel.id,
+    PresentationModel.content,
+    PresentationModel.n_slides,
+    PresentationModel.language,
+    PresentationModel.title,
+    PresentationModel.created_at,
+    PresentationModel.updated_at,
+    PresentationModel.instructions,
+    PresentationModel.tone,
+    PresentationModel.verbosity,
+]
+
+
+def encode_presentations_cursor(presentation: PresentationSummary) -> str:
+    return base64.urlsafe_b64encode(
+        f"{presentation.updated_at.isoformat()}|{presentation.id}".encode()
+    ).decode()
+
+
+def decode_presentations_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        updated_at, id = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(updated_at), uuid.UUID(id)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
+
+@PRESENTATION_ROUTER.get("/all", response_model=List[PresentationSummary])
+async def get_all_presentations(
+    response: Response,
+    limit: Annotated[
+        Optional[int], Query(ge=1, le=MAX_PRESENTATIONS_PAGE_SIZE)
+    ] = None,
+    after: Optional[str] = None,
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Lists presentations with their first slide, most recently updated first.
+    Without a limit every presentation is returned, otherwise the cursor of the
+    next page is sent in the X-Next-Cursor header and passed back as after.
+    """
+    # Presentations are paged first, by the (updated_at, id) index, then
+    # joined with their first slide, whatever the statistics of the database
+    page = (
+        select(*PRESENTATION_SUMMARY_COLUMNS)
+        .where(
+            exists().where(
+                SlideModel.presentation == PresentationModel.id,
+                SlideModel.index == 0,
+            )
         )
-        if not first_slide:
-            return None
-        return PresentationWithSlides(
-            **presentation.model_dump(),
-            slides=[first_slide],
+        .order_by(PresentationModel.updated_at.desc(), PresentationModel.id.desc())
+    )
+    if after:
+        updated_at, id = decode_presentations_cursor(after)
+        page = page.where(
+            or_(
+                PresentationModel.updated_at < updated_at,
+                and_(
+                    PresentationModel.updated_at == updated_at,
+                    PresentationModel.id < id,
+                ),
+            )
         )
+    if limit:
+        page = page.limit(limit + 1)
+    page = page.subquery()
+    statement = (
+        select(page, SlideModel)
+        .join(
+            SlideModel,
+            and_(SlideModel.presentation == page.c.id, SlideModel.index == 0),
+        )
+        .order_by(page.c.updated_at.desc(), page.c.id.desc())
+    )
 
-    tasks = [inner(p, sql_session) for p in presentations]
-    results = await asyncio.gather(*tasks)
-    presentations_with_slides = [r for r in results if r is not None]
-    return presentations_with_slides
+    presentations = [
+        PresentationSummary(**row._mapping, slides=[row.SlideModel])
+        for row in await sql_session.execute(statement)
+    ]
+    if limit and len(presentations) > limit:
+        presentations = presentations[:limit]
+        response.headers["X-Next-Cursor"] = encode_presentations_cursor(
+            presentations[-1]
+        )
+    return presentations
 
 
 @PRESENTATION_ROUTER.post("/create", response_model=PresentationModel)
@@ -190,8 +277,18 @@ async def prepare_presentation(
 
 @PRESENTATION_ROUTER.get("/stream", response_model=PresentationWithSlides)
 async def stream_presentation(
-    presentation_id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
+    presentation_id: uuid.UUID,
+    ordered: bool = True,
+    force_fresh_images: bool = False,
+    sql_session: AsyncSession = Depends(get_async_session),
 ):
+    """
+    Streams generated slides of a prepared presentation.
+    - Slide contents are generated concurrently, bounded by LLM_CONCURRENCY.
+    - If ordered, slides are emitted as chunks of the presentation json in slide order.
+    - Otherwise, each slide is emitted as soon as it is generated with its index.
+    - If force_fresh_images, images are generated again instead of reusing cached ones.
+    """
     presentation = await sql_session.get(PresentationModel, presentation_id)
     if not presentation:
         raise HTTPException(status_code=404, detail="Presentation not found")
@@ -206,32 +303,32 @@ async def stream_presentation(
             detail="Outlines can not be empty",
         )
 
-    image_generation_service = ImageGenerationService(get_images_directory())
+    image_generation_service = ImageGenerationService(
+        get_images_directory(), force_fresh_images
+    )
 
     async def inner():
         structure = presentation.get_structure()
         layout = presentation.get_layout()
         outline = presentation.get_presentation_outline()
 
+        llm_semaphore = asyncio.Semaphore(get_llm_concurrency())
+
         # These tasks will be gathered and awaited after all slides are generated
-        async_assets_generation_tasks = []
+        async_assets_generation_tasks: List[asyncio.Task] = []
 
-        slides: List[SlideModel] = []
-        yield SSEResponse(
-            event="response",
-            data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
-        ).to_string()
-        for i, slide_layout_index in enumerate(structure.slides):
+        async def generate_slide(i: int, slide_layout_index: int):
             slide_layout = layout.slides[slide_layout_index]
 
-            slide_content = await get_slide_content_from_type_and_outline(
-                slide_layout,
-                outline.slides[i],
-                presentation.language,
-                presentation.tone,
-                presentation.verbosity,
-                presentation.instructions,
-            )
+            async with llm_semaphore:
+                slide_content = await get_slide_content_from_type_and_outline(
+                    slide_layout,
+                    outline.slides[i],
+                    presentation.language,
+                    presentation.tone,
+                    presentation.verbosity,
+                    presentation.instructions,
+                )
 
             slide = SlideModel(
                 presentation=presentation_id,
@@ -241,27 +338,59 @@ async def stream_presentation(
                 speaker_note=slide_content.get("__speaker_note__", ""),
                 content=slide_content,
             )
-            slides.append(slide)
 
             # This will mutate slide and add placeholder assets
             process_slide_add_placeholder_assets(slide)
+            slide_json = slide.model_dump_json()
 
             # This will mutate slide
             async_assets_generation_tasks.append(
-                process_slide_and_fetch_assets(image_generation_service, slide)
+                asyncio.create_task(
+                    process_slide_and_fetch_assets(image_generation_service, slide)
+                )
             )
+            return slide, slide_json
 
-            yield SSEResponse(
-                event="response",
-                data=json.dumps({"type": "chunk", "chunk": slide.model_dump_json()}),
-            ).to_string()
+        slide_tasks = [
+            asyncio.create_task(generate_slide(i, slide_layout_index))
+            for i, slide_layout_index in enumerate(structure.slides)
+        ]
 
-        yield SSEResponse(
-            event="response",
-            data=json.dumps({"type": "chunk", "chunk": " ] }"}),
-        ).to_string()
+        try:
+            if ordered:
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps({"type": "chunk", "chunk": '{ "slides": [ '}),
+                ).to_string()
+                for slide_task in slide_tasks:
+                    _, slide_json = await slide_task
+                    yield SSEResponse(
+                        event="response",
+                        data=json.dumps({"type": "chunk", "chunk": slide_json}),
+                    ).to_string()
+                yield SSEResponse(
+                    event="response",
+                    data=json.dumps({"type": "chunk", "chunk": " ] }"}),
+                ).to_string()
+            else:
+                for slide_task in asyncio.as_completed(slide_tasks):
+                    slide, slide_json = await slide_task
+                    yield SSESlideResponse(
+                        index=slide.index, slide=slide_json
+                    ).to_string()
+
+            slides: List[SlideModel] = [
+                slide_task.result()[0] for slide_task in slide_tasks
+            ]
+
+            generated_assets_lists = await asyncio.gather(
+                *async_assets_generation_tasks
+            )
+        finally:
+            # Stop pending generations if the client disconnects or a slide fails
+            for task in slide_tasks + async_assets_generation_tasks:
+                task.cancel()
 
-        generated_assets_lists = await asyncio.gather(*async_assets_generation_tasks)
         generated_assets = []
         for assets_list in generated_assets_lists:
             generated_assets.extend(assets_list)
@@ -301,6 +430,7 @@ async def update_presentation(
     await sql_session.execute(
         delete(SlideModel).where(SlideModel.presentation == updated_presentation.id)
     )
+    await EXPORT_CACHE.invalidate(sql_session, updated_presentation.id)
 
     # Just to make sure id is UUID
     for slide in updated_slides:
@@ -316,13 +446,58 @@ async def update_presentation(
     )
 
 
+@PRESENTATION_ROUTER.post("/export", response_model=PresentationPathAndEditPath)
+async def export_presentation_by_id(
+    id: Annotated[uuid.UUID, Body()],
+    export_as: Annotated[Literal["pptx", "pdf"], Body()] = "pptx",
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Exports a saved presentation, e.g. to download it again later.
+    - The last export is returned while the presentation and its slides are unchanged.
+    """
+    presentation = await sql_session.get(PresentationModel, id)
+    if not presentation:
+        raise HTTPException(status_code=404, detail="Presentation not found")
+
+    presentation_and_path = await export_presentation(
+        id, presentation.title or str(uuid.uuid4()), export_as
+    )
+
+    return PresentationPathAndEditPath(
+        **presentation_and_path.model_dump(),
+        edit_path=f"/presentation?id={id}",
+    )
+
+
 @PRESENTATION_ROUTER.post("/export/pptx", response_model=str)
 async def create_pptx(
     pptx_model: Annotated[PptxPresentationModel, Body()],
+    image_dpi: Annotated[Optional[int], Query(gt=0, le=MAX_PPTX_IMAGE_DPI)] = None,
 ):
+    """
+    Creates a PPTX file from the pptx model and returns its path.
+    - If image_dpi is set, pictures are resampled to their box size at that
+    resolution, opaque ones are embedded as JPEG. Defaults to PPTX_IMAGE_DPI.
+    - The file of an identical earlier export is returned while it is unchanged.
+    """
+    if image_dpi is None:
+        image_dpi = get_pptx_image_dpi()
+    fingerprint = None
+    if EXPORT_CACHE.is_enabled():
+        fingerprint = EXPORT_CACHE.get_fingerprint(
+            {
+                "pptx_model": pptx_model.model_dump(mode="json"),
+                "options": {"image_dpi": image_dpi},
+            }
+        )
+        cached_path = await EXPORT_CACHE.get(fingerprint)
+        if cached_path:
+            return cached_path
+
     temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
 
-    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir, image_dpi)
     await pptx_creator.create_ppt()
 
     export_directory = get_exports_directory()
@@ -331,6 +506,8 @@ async def create_pptx(
     )
     pptx_creator.save(pptx_path)
 
+    if fingerprint:
+        await EXPORT_CACHE.set(fingerprint, pptx_path)
     return pptx_path
 
 
@@ -339,26 +516,77 @@ async def generate_presentation_api(
     request: GeneratePresentationRequest,
     sql_session: AsyncSession = Depends(get_async_session),
 ):
-    presentation_id = uuid.uuid4()
+    return await generate_presentation_handler(request, uuid.uuid4(), sql_session)
+
+
+@PRESENTATION_ROUTER.post(
+    "/generate/async", response_model=PresentationGenerationJobModel
+)
+async def generate_presentation_async_api(
+    request: GeneratePresentationAsyncRequest,
+    sql_session: AsyncSession = Depends(get_async_session),
+):
+    job = PresentationGenerationJobModel(
+        request=request.model_dump(mode="json", exclude={"webhook_url"}),
+        webhook_url=str(request.webhook_url) if request.webhook_url else None,
+    )
+    sql_session.add(job)
+    await sql_session.commit()
+    await sql_session.refresh(job)
+
+    PRESENTATION_GENERATION_JOB_SERVICE.submit(job.id, generate_presentation_handler)
+    return job
+
+
+@PRESENTATION_ROUTER.get(
+    "/generate/status", response_model=PresentationGenerationJobModel
+)
+async def get_presentation_generation_status(
+    id: uuid.UUID, sql_session: AsyncSession = Depends(get_async_session)
+):
+    job = await sql_session.get(PresentationGenerationJobModel, id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Generation job not found")
+    return job
+
+
+async def generate_presentation_handler(
+    request: GeneratePresentationRequest,
+    presentation_id: uuid.UUID,
+    sql_session: AsyncSession,
+    on_progress: Optional[GenerationProgressCallback] = None,
+) -> PresentationPathAndEditPath:
+
+    async def report_progress(stage: str, progress: int):
+        if on_progress:
+            await on_progress(stage, progress)
 
     # 3. Generate Outlines
+    await report_progress("Generating outlines", 5)
     presentation_outlines = None
     additional_context = ""
 
     # Process files
     if request.files:
         documents_loader = DocumentsLoader(file_paths=request.files)
-        await documents_loader.load_documents()
-        documents = documents_loader.documents
-        if documents and len(documents) == 1:
-            additional_context = documents[0]
+        documents_loader.check_files_exist()
+        temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
+        if len(request.files) == 1:
+            # Single documents are chunked while they are being parsed
             chunker = ScoreBasedChunker()
-            chunks = await chunker.get_n_chunks(documents[0], request.n_slides)
+            chunks = await chunker.get_n_chunks_from_stream(
+                documents_loader.stream_document(request.files[0], temp_dir),
+                request.n_slides,
+            )
             presentation_outlines = PresentationOutlineModel(
                 slides=[chunk.to_slide_outline() for chunk in chunks]
             )
-        elif documents:
-            additional_context = "\n\n".join(documents)
+        else:
+            await documents_loader.load_documents(temp_dir)
+            packed_context = await CONTEXT_PACKER.pack_async(
+                documents_loader.documents
+            )
+            additional_context = packed_context.text
 
     if not presentation_outlines:
         presentation_outlines_text = ""
@@ -395,6 +623,7 @@ async def generate_presentation_api(
     total_slide_layouts = len(layout_model.slides)
 
     # 5. Generate Structure
+    await report_progress("Generating structure", 20)
     if layout_model.ordered:
         presentation_structure = layout_model.to_presentation_structure()
     else:
@@ -429,61 +658,72 @@ async def generate_presentation_api(
         instructions=request.instructions,
     )
 
-    image_generation_service = ImageGenerationService(get_images_directory())
-    async_assets_generation_tasks = []
-
-    # 7. Generate slide content concurrently (batched), then build slides and fetch assets
-    slides: List[SlideModel] = []
+    image_generation_service = ImageGenerationService(
+        get_images_directory(), request.force_fresh_images
+    )
 
+    # 7. Generate slide contents through a bounded work queue
+    # A new LLM call starts as soon as any slot frees up and assets for a slide
+    # are fetched as soon as its content is ready
     slide_layout_indices = presentation_structure.slides
     slide_layouts = [layout_model.slides[idx] for idx in slide_layout_indices]
 
-    # Schedule slide content generation and asset fetching in batches of 10
-    batch_size = 10
-    for start in range(0, len(slide_layouts), batch_size):
-        end = min(start + batch_size, len(slide_layouts))
+    llm_concurrency = get_llm_concurrency()
+    llm_semaphore = asyncio.Semaphore(llm_concurrency)
+    slides: List[Optional[SlideModel]] = [None] * len(slide_layouts)
 
-        print(f"Generating slides from {start} to {end}")
+    print(
+        f"Generating {len(slide_layouts)} slides with {llm_concurrency} concurrent LLM calls"
+    )
 
-        # Generate contents for this batch concurrently
-        content_tasks = [
-            get_slide_content_from_type_and_outline(
-                slide_layouts[i],
-                outlines[i],
+    await report_progress("Generating slides", 25)
+    completed_slides = 0
+
+    async def generate_slide(index: int) -> List[ImageAsset]:
+        nonlocal completed_slides
+        async with llm_semaphore:
+            content_started_at = time.perf_counter()
+            slide_content = await get_slide_content_from_type_and_outline(
+                slide_layouts[index],
+                outlines[index],
                 request.language,
                 request.tone,
                 request.verbosity,
                 request.instructions,
             )
-            for i in range(start, end)
-        ]
-        batch_contents: List[dict] = await asyncio.gather(*content_tasks)
+            content_time = time.perf_counter() - content_started_at
+
+        slide = SlideModel(
+            presentation=presentation_id,
+            layout_group=layout_model.name,
+            layout=slide_layouts[index].id,
+            index=index,
+            speaker_note=slide_content.get("__speaker_note__"),
+            content=slide_content,
+        )
+        slides[index] = slide
 
-        # Build slides for this batch
-        batch_slides: List[SlideModel] = []
-        for offset, slide_content in enumerate(batch_contents):
-            i = start + offset
-            slide_layout = slide_layouts[i]
-            slide = SlideModel(
-                presentation=presentation_id,
-                layout_group=layout_model.name,
-                layout=slide_layout.id,
-                index=i,
-                speaker_note=slide_content.get("__speaker_note__"),
-                content=slide_content,
-            )
-            slides.append(slide)
-            batch_slides.append(slide)
+        assets_started_at = time.perf_counter()
+        assets = await process_slide_and_fetch_assets(image_generation_service, slide)
+        assets_time = time.perf_counter() - assets_started_at
 
-        # Start asset fetch tasks for just-generated slides so they run while next batch is processed
-        asset_tasks = [
-            process_slide_and_fetch_assets(image_generation_service, slide)
-            for slide in batch_slides
-        ]
-        async_assets_generation_tasks.extend(asset_tasks)
+        print(
+            f"Slide {index + 1}: content {content_time:.2f}s, assets {assets_time:.2f}s"
+        )
+        completed_slides += 1
+        await report_progress(
+            "Generating slides", 25 + (60 * completed_slides) // len(slide_layouts)
+        )
+        return assets
+
+    generation_started_at = time.perf_counter()
+    generated_assets_list = await asyncio.gather(
+        *[generate_slide(index) for index in range(len(slide_layouts))]
+    )
+    print(
+        f"Generated {len(slides)} slides in {time.perf_counter() - generation_started_at:.2f}s"
+    )
 
-    # Run all asset tasks concurrently while batches may still be generating content
-    generated_assets_list = await asyncio.gather(*async_assets_generation_tasks)
     generated_assets = []
     for assets_list in generated_assets_list:
         generated_assets.extend(assets_list)
@@ -495,6 +735,7 @@ async def generate_presentation_api(
     await sql_session.commit()
 
     # 9. Export
+    await report_progress("Exporting", 90)
     presentation_and_path = await export_presentation(
         presentation_id, presentation.title or str(uuid.uuid4()), request.export_as
     )
@@ -6,6 +6,7 @@ import uuid
 from models.sql.presentation import PresentationModel
 from models.sql.slide import SlideModel
 from services.database import get_async_session
+from services.export_cache import EXPORT_CACHE
 from services.image_generation_service import ImageGenerationService
 from utils.asset_directory_utils import get_images_directory
 from utils.llm_calls.edit_slide import get_edited_slide_content
@@ -57,6 +58,7 @@ async def edit_slide(
     slide.layout = slide_layout.id
     slide.speaker_note = edited_slide_content.get("__speaker_note__", "")
     sql_session.add_all(new_assets)
+    await EXPORT_CACHE.invalidate(sql_session, slide.presentation)
     await sql_session.commit()
 
     return slide
@@ -85,6 +87,7 @@ async def edit_slide_html(
 
     sql_session.add(slide)
     slide.html_content = edited_slide_html
+    await EXPORT_CACHE.invalidate(sql_session, slide.presentation)
     await sql_session.commit()
 
     return slide
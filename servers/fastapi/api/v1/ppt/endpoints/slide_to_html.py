@@ -11,7 +11,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, func
 from utils.asset_directory_utils import get_images_directory
 from services.database import get_async_session
+from services.layout_cache import LAYOUT_CACHE
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from utils.datetime_utils import get_current_utc_datetime
+from utils.db_utils import get_upsert_statement
 from .prompts import GENERATE_HTML_SYSTEM_PROMPT, HTML_TO_REACT_SYSTEM_PROMPT, HTML_EDIT_SYSTEM_PROMPT
 from models.sql.template import TemplateModel
 
@@ -22,6 +25,9 @@ HTML_TO_REACT_ROUTER = APIRouter(prefix="/html-to-react", tags=["html-to-react"]
 HTML_EDIT_ROUTER = APIRouter(prefix="/html-edit", tags=["html-edit"])
 LAYOUT_MANAGEMENT_ROUTER = APIRouter(prefix="/template-management", tags=["template-management"])
 
+# Columns of a saved layout replaced when it is saved again
+LAYOUT_CODE_UPDATE_COLUMNS = ("layout_name", "layout_code", "fonts", "updated_at")
+
 
 # Request/Response models for slide-to-html endpoint
 class SlideToHtmlRequest(BaseModel):
@@ -645,6 +651,48 @@ async def edit_html_with_images_endpoint(
         ) 
 
 
+async def upsert_layout_codes(session: AsyncSession, layouts: List[dict]):
+    """
+    Inserts layouts and updates the ones already saved for their presentation
+    and layout_id, in one statement where the database supports upserts.
+    """
+    statement = get_upsert_statement(
+        session.get_bind().dialect.name,
+        PresentationLayoutCodeModel.__table__,
+        layouts,
+        index_elements=("presentation", "layout_id"),
+        update_columns=LAYOUT_CODE_UPDATE_COLUMNS,
+    )
+    if statement is not None:
+        await session.execute(statement)
+        return
+
+    # Saved layouts are loaded with one query, then updated or added
+    result = await session.execute(
+        select(PresentationLayoutCodeModel).where(
+            PresentationLayoutCodeModel.presentation.in_(
+                {layout["presentation"] for layout in layouts}
+            ),
+            PresentationLayoutCodeModel.layout_id.in_(
+                {layout["layout_id"] for layout in layouts}
+            ),
+        )
+    )
+    existing_layouts = {
+        (existing_layout.presentation, existing_layout.layout_id): existing_layout
+        for existing_layout in result.scalars()
+    }
+    for layout in layouts:
+        existing_layout = existing_layouts.get(
+            (layout["presentation"], layout["layout_id"])
+        )
+        if existing_layout:
+            for column in LAYOUT_CODE_UPDATE_COLUMNS:
+                setattr(existing_layout, column, layout[column])
+        else:
+            session.add(PresentationLayoutCodeModel(**layout))
+
+
 # ENDPOINT 4: Save layouts for a presentation
 @LAYOUT_MANAGEMENT_ROUTER.post(
     "/save-templates", 
@@ -686,6 +734,8 @@ async def save_layouts(
             )
         
         saved_count = 0
+        layouts = {}
+        saved_at = get_current_utc_datetime()
         
         for i, layout_data in enumerate(request.layouts):
             # Validate individual layout data
@@ -713,34 +763,24 @@ async def save_layouts(
                     detail=f"Layout {i+1}: layout_code cannot be empty"
                 )
             
-            # Check if layout already exists for this presentation and layout_id
-            stmt = select(PresentationLayoutCodeModel).where(
-                PresentationLayoutCodeModel.presentation == layout_data.presentation,
-                PresentationLayoutCodeModel.layout_id == layout_data.layout_id
-            )
-            result = await session.execute(stmt)
-            existing_layout = result.scalar_one_or_none()
-            
-            if existing_layout:
-                # Update existing layout
-                existing_layout.layout_name = layout_data.layout_name
-                existing_layout.layout_code = layout_data.layout_code
-                existing_layout.fonts = layout_data.fonts
-                existing_layout.updated_at = datetime.now()
-            else:
-                # Create new layout
-                new_layout = PresentationLayoutCodeModel(
-                    presentation=layout_data.presentation,
-                    layout_id=layout_data.layout_id,
-                    layout_name=layout_data.layout_name,
-                    layout_code=layout_data.layout_code,
-                    fonts=layout_data.fonts
-                )
-                session.add(new_layout)
-            
+            # Saving a layout twice in one request keeps the last one
+            layouts[(layout_data.presentation, layout_data.layout_id)] = {
+                "presentation": layout_data.presentation,
+                "layout_id": layout_data.layout_id,
+                "layout_name": layout_data.layout_name,
+                "layout_code": layout_data.layout_code,
+                "fonts": layout_data.fonts,
+                "created_at": saved_at,
+                "updated_at": saved_at,
+            }
             saved_count += 1
         
+        await upsert_layout_codes(session, list(layouts.values()))
         await session.commit()
+
+        # Layouts of custom templates are served by the renderer as custom-<presentation>
+        for presentation in {layout_data.presentation for layout_data in request.layouts}:
+            await LAYOUT_CACHE.invalidate(f"custom-{presentation}")
         
         return SaveLayoutsResponse(
             success=True,
@@ -956,6 +996,7 @@ async def create_template(
                 )
             )
         await session.commit()
+        await LAYOUT_CACHE.invalidate(f"custom-{request.id}")
 
         # Read back
         template = await session.get(TemplateModel, request.id)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException
+
+from utils.get_env import get_can_change_keys_env
+from utils.user_config import USER_CONFIG_SNAPSHOT
+
+USER_CONFIG_ROUTER = APIRouter(prefix="/user-config", tags=["User Config"])
+
+
+@USER_CONFIG_ROUTER.post("/reload", response_model=dict)
+async def reload_user_config():
+    if get_can_change_keys_env() == "false":
+        raise HTTPException(
+            status_code=403, detail="You are not allowed to change user config"
+        )
+
+    USER_CONFIG_SNAPSHOT.reload()
+    return {"reloads": USER_CONFIG_SNAPSHOT.reloads}
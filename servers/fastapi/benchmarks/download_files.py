@@ -0,0 +1,163 @@
+"""
+Compares download_files with its previous implementation (a session per
+request, HEAD and GET for urls without extension, unbounded concurrency,
+blocking writes) on images served by a local server with simulated latency.
+
+A deck repeats some images, so the urls contain duplicates.
+
+Run from servers/fastapi with:
+
+    python -m benchmarks.download_files [images]
+"""
+
+import asyncio
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import sys
+import tempfile
+import time
+import uuid
+from typing import List, Optional
+
+import aiohttp
+from aiohttp import web
+
+from utils.download_helpers import download_files
+
+DEFAULT_IMAGES = 200
+UNIQUE_RATIO = 0.75
+IMAGE_SIZE = 256 * 1024
+LATENCY = 0.02
+
+
+async def download_file_before(
+    url: str, save_directory: str, headers: Optional[dict] = None
+) -> Optional[str]:
+    # Previous implementation, without the extension lookup (urls have one)
+    try:
+        os.makedirs(save_directory, exist_ok=True)
+        save_path = os.path.join(save_directory, os.path.basename(url))
+        async with aiohttp.ClientSession(trust_env=True) as session:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 200:
+                    with open(save_path, "wb") as file:
+                        async for chunk in response.content.iter_chunked(8192):
+                            file.write(chunk)
+                    return save_path
+                return None
+    except Exception as e:
+        print(f"Error downloading file from {url}: {e}")
+        return None
+
+
+async def download_files_before(
+    urls: List[str], save_directory: str
+) -> List[Optional[str]]:
+    return await asyncio.gather(
+        *[download_file_before(url, save_directory) for url in urls]
+    )
+
+
+def run_server(port: int):
+    body = random.Random(0).randbytes(IMAGE_SIZE)
+    stats = {"requests": 0, "connections": set()}
+
+    async def image(request: web.Request) -> web.Response:
+        stats["requests"] += 1
+        stats["connections"].add(request.transport.get_extra_info("peername"))
+        await asyncio.sleep(LATENCY)
+        return web.Response(body=body, content_type="image/jpeg")
+
+    async def get_stats(_: web.Request) -> web.Response:
+        response = web.json_response(
+            {
+                "requests": stats["requests"],
+                "connections": len(stats["connections"]),
+            }
+        )
+        stats["requests"] = 0
+        stats["connections"] = set()
+        return response
+
+    app = web.Application()
+    app.router.add_get("/images/{name}", image)
+    app.router.add_get("/stats", get_stats)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+
+def get_free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def get_server_stats(base_url: str) -> dict:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(f"{base_url}/stats") as response:
+            return await response.json()
+
+
+async def wait_for_server(base_url: str):
+    for _ in range(100):
+        try:
+            await get_server_stats(base_url)
+            return
+        except aiohttp.ClientError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Benchmark server did not start")
+
+
+async def run(images: int, base_url: str):
+    rng = random.Random(0)
+    unique = [
+        uuid.UUID(int=rng.getrandbits(128)) for _ in range(int(images * UNIQUE_RATIO))
+    ]
+    names = unique + [rng.choice(unique) for _ in range(images - len(unique))]
+    rng.shuffle(names)
+    urls = [f"{base_url}/images/{name}.jpg" for name in names]
+    await wait_for_server(base_url)
+    await get_server_stats(base_url)
+
+    print(
+        f"{images} images ({len(unique)} unique) of {IMAGE_SIZE // 1024}KB, "
+        f"{LATENCY * 1000:.0f}ms latency"
+    )
+    for name, download in [
+        ("before", download_files_before),
+        ("pooled", download_files),
+    ]:
+        save_directory = tempfile.mkdtemp()
+        try:
+            started_at = time.perf_counter()
+            paths = await download(urls, save_directory)
+            duration = time.perf_counter() - started_at
+        finally:
+            shutil.rmtree(save_directory)
+
+        assert all(paths)
+        stats = await get_server_stats(base_url)
+        megabytes = stats["requests"] * IMAGE_SIZE / 1024 / 1024
+        print(
+            f"{name:8} {duration * 1000:8.1f}ms  {len(urls) / duration:7.1f} images/s  "
+            f"{megabytes:6.1f}MB transferred  {stats['requests']:4} requests  "
+            f"{stats['connections']:4} connections"
+        )
+
+
+def main():
+    images = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_IMAGES
+    port = get_free_port()
+    server = multiprocessing.Process(target=run_server, args=(port,), daemon=True)
+    server.start()
+    try:
+        asyncio.run(run(images, f"http://127.0.0.1:{port}"))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compares the chroma and numpy icon indexes.
+
+Reports startup time, batched query latency and recall of the chroma HNSW
+index against the exact numpy search. Build the numpy embeddings first with
+python -m scripts.build_icon_index, then run from servers/fastapi with:
+
+    python -m benchmarks.icon_index
+"""
+
+import subprocess
+import sys
+import time
+
+from services.icon_index import ChromaIconIndex, NumpyIconIndex
+
+QUERIES = [
+    "chart",
+    "growth",
+    "team collaboration",
+    "security lock",
+    "cloud computing",
+    "money savings",
+    "rocket launch",
+    "artificial intelligence",
+    "calendar schedule",
+    "email communication",
+    "global network",
+    "healthcare",
+    "education",
+    "shopping cart",
+    "settings",
+    "analytics dashboard",
+]
+K = 5
+RUNS = 20
+
+
+def measure_startup(index_class_name: str) -> float:
+    # Fresh interpreter so imports and model loading are included
+    code = (
+        "import time; started_at = time.perf_counter();"
+        f"from services.icon_index import {index_class_name};"
+        f"index = {index_class_name}(); index.query(['chart'], 1);"
+        "print(time.perf_counter() - started_at)"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_latency(index, queries) -> float:
+    index.query(queries, K)
+    started_at = time.perf_counter()
+    for _ in range(RUNS):
+        index.query(queries, K)
+    return (time.perf_counter() - started_at) / RUNS * 1000
+
+
+def main():
+    chroma_index = ChromaIconIndex()
+    numpy_index = NumpyIconIndex()
+
+    exact_results = numpy_index.query(QUERIES, K)
+    chroma_results = chroma_index.query(QUERIES, K)
+    recall = sum(
+        len(set(exact) & set(approximate))
+        for exact, approximate in zip(exact_results, chroma_results)
+    ) / (len(QUERIES) * K)
+
+    print(f"Icons: {len(numpy_index.ids)}, queries: {len(QUERIES)}, k: {K}")
+    for name, index in (("chroma", chroma_index), ("numpy", numpy_index)):
+        print(
+            f"{name:7} startup {measure_startup(index.__class__.__name__):6.2f}s, "
+            f"batch query {measure_latency(index, QUERIES):7.2f}ms, "
+            f"single query {measure_latency(index, QUERIES[:1]):7.2f}ms"
+        )
+    print(f"chroma recall@{K} against exact search: {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Measures peak memory (RSS) of loading a large PDF at once and page by page.
+
+Each mode runs in its own process on a synthetic text PDF. Text parsing modes
+are skipped when docling is not installed.
+
+Run from servers/fastapi with:
+
+    python -m benchmarks.pdf_ingestion [pages]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+DEFAULT_PAGES = 300
+LINES_PER_PAGE = 40
+
+MODES = {
+    "images_at_once": """
+import pdfplumber
+with pdfplumber.open(file_path) as pdf:
+    for page in pdf.pages:
+        page.to_image(resolution=300).save(
+            os.path.join(temp_dir, f"page_{page.page_number}.png")
+        )
+""",
+    "images_streamed": """
+import asyncio
+from services.documents_loader import DocumentsLoader
+
+async def run():
+    documents_loader = DocumentsLoader(file_paths=[file_path])
+    async for section in documents_loader.stream_pdf(file_path, temp_dir, load_text=False):
+        await section.get_images(resolution=300)
+
+asyncio.run(run())
+""",
+    "images_150dpi": """
+import asyncio
+from services.documents_loader import DocumentsLoader
+
+async def run():
+    documents_loader = DocumentsLoader(file_paths=[file_path])
+    async for section in documents_loader.stream_pdf(file_path, temp_dir, load_text=False):
+        await section.get_images(resolution=150)
+
+asyncio.run(run())
+""",
+    "text_at_once": """
+from services.docling_service import get_docling_service
+get_docling_service().parse_to_markdown(file_path)
+""",
+    "text_streamed": """
+from constants.documents import PDF_PAGES_PER_SECTION
+from services.docling_service import get_docling_service
+from services.documents_loader import get_pdf_page_count
+
+page_count = get_pdf_page_count(file_path)
+for start in range(1, page_count + 1, PDF_PAGES_PER_SECTION):
+    end = min(start + PDF_PAGES_PER_SECTION - 1, page_count)
+    get_docling_service().parse_to_markdown(file_path, (start, end))
+""",
+}
+
+MODE_CODE = """
+import os, resource, sys, time
+# Imported by every mode, so peak memory is compared from the same baseline
+import services.documents_loader
+file_path, temp_dir = sys.argv[1], sys.argv[2]
+started_at = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started_at
+print(f"result={{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}} {{elapsed}}")
+"""
+
+
+def write_synthetic_pdf(file_path: str, pages: int):
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for page in range(1, pages + 1):
+        lines = [f"BT /F1 18 Tf 72 760 Td (Section {page}) Tj ET"]
+        for line in range(LINES_PER_PAGE):
+            y = 730 - line * 16
+            lines.append(
+                f"BT /F1 10 Tf 72 {y} Td "
+                f"(Line {line} of page {page}: quarterly results and outlook) Tj ET"
+            )
+        stream = "\n".join(lines).encode()
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    with open(file_path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for object_id, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n%s\nendobj\n" % (object_id, body))
+        xref_offset = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(
+            b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (len(objects) + 1, xref_offset)
+        )
+
+
+def run_mode(mode: str, file_path: str) -> tuple[float, float]:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                MODE_CODE.format(code=MODES[mode]),
+                file_path,
+                temp_dir,
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    line = next(
+        line for line in result.stdout.splitlines() if line.startswith("result=")
+    )
+    max_rss, elapsed = line.removeprefix("result=").split()
+    return int(max_rss) / 1024, float(elapsed)
+
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PAGES
+    try:
+        import docling
+
+        modes = list(MODES)
+    except ImportError:
+        print("docling is not installed, skipping text parsing modes")
+        modes = [mode for mode in MODES if mode.startswith("images")]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, "report.pdf")
+        started_at = time.perf_counter()
+        write_synthetic_pdf(file_path, pages)
+        print(
+            f"Synthetic PDF: {pages} pages, {os.path.getsize(file_path) / 1024:.0f}KB "
+            f"({time.perf_counter() - started_at:.2f}s)"
+        )
+
+        for mode in modes:
+            max_rss, elapsed = run_mode(mode, file_path)
+            print(f"{mode:<16} peak RSS {max_rss:8.1f}MB  {elapsed:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Measures PPTX export latency and file size of a deck with large photos, with
+picture transforms applied on the event loop while adding slides (previous
+behaviour), in the image processing pool, from the processed image cache and
+with pictures resampled to their box size at IMAGE_DPIS.
+
+Run from servers/fastapi with:
+
+    python -m benchmarks.pptx_export [images]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from PIL import Image, ImageFilter
+
+from models.pptx_models import (
+    PptxBoxShapeEnum,
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services.image_processing_pool import ImageProcessingPool
+from services import pptx_presentation_creator
+from services.pptx_presentation_creator import PptxPresentationCreator
+
+DEFAULT_IMAGES = 50
+IMAGES_PER_SLIDE = 2
+PHOTO_SIZE = (2400, 1600)
+IMAGE_DPIS = [72, 150]
+
+
+class InlinePptxPresentationCreator(PptxPresentationCreator):
+
+    async def process_pictures(self):
+        # Pictures are transformed by add_picture, one by one
+        pass
+
+
+def generate_photos(directory: str, count: int):
+    rng = random.Random(0)
+    paths = []
+    for i in range(count):
+        # Gradient with blurred noise compresses like a photo, unlike a flat color
+        color = Image.new("RGB", PHOTO_SIZE, tuple(rng.randrange(256) for _ in "rgb"))
+        gradient = Image.linear_gradient("L").resize(PHOTO_SIZE).convert("RGB")
+        noise = Image.effect_noise(PHOTO_SIZE, 64).convert("RGB")
+        image = Image.blend(
+            Image.blend(gradient, color, 0.5),
+            noise.filter(ImageFilter.GaussianBlur(2)),
+            0.4,
+        )
+        path = os.path.join(directory, f"photo_{i}.jpg")
+        image.save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def create_pptx_model(photos) -> PptxPresentationModel:
+    picture_variants = [
+        dict(
+            border_radius=[16, 16, 16, 16],
+            object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.COVER),
+        ),
+        dict(clip=True),
+        dict(
+            object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.CONTAIN, focus=[50, 0])
+        ),
+        dict(shape=PptxBoxShapeEnum.CIRCLE, opacity=0.8),
+        dict(clip=False),
+    ]
+    slides = []
+    for i in range(0, len(photos), IMAGES_PER_SLIDE):
+        shapes = []
+        for j, photo in enumerate(photos[i : i + IMAGES_PER_SLIDE]):
+            shapes.append(
+                PptxPictureBoxModel(
+                    position=PptxPositionModel(
+                        left=40 + j * 620, top=120, width=580, height=440
+                    ),
+                    picture=PptxPictureModel(is_network=False, path=photo),
+                    **picture_variants[(i + j) % len(picture_variants)],
+                )
+            )
+        slides.append(PptxSlideModel(shapes=shapes))
+    return PptxPresentationModel(slides=slides)
+
+
+async def measure_loop_lag(ticks: list):
+    # Other requests are stalled as long as the event loop is blocked
+    while True:
+        ticks.append(time.perf_counter())
+        await asyncio.sleep(0.01)
+
+
+async def create_ppt(creator: PptxPresentationCreator, lags: list):
+    ticks = []
+    lag_task = asyncio.create_task(measure_loop_lag(ticks))
+    await asyncio.sleep(0)
+    try:
+        await creator.create_ppt()
+    finally:
+        lag_task.cancel()
+    ticks.append(time.perf_counter())
+    lags.extend(b - a - 0.01 for a, b in zip(ticks, ticks[1:]))
+
+
+def export(creator_class, photos, temp_dir, image_dpi: int = 0) -> str:
+    lags = []
+    pptx_path = os.path.join(temp_dir, "deck.pptx")
+    started_at = time.perf_counter()
+    creator = creator_class(create_pptx_model(photos), temp_dir, image_dpi)
+    asyncio.run(create_ppt(creator, lags))
+    creator.save(pptx_path)
+    duration = time.perf_counter() - started_at
+    return (
+        f"{duration:6.2f}s, event loop blocked for up to {max(lags) * 1000:8.1f}ms, "
+        f"{os.path.getsize(pptx_path) / 1024 / 1024:6.1f}MB"
+    )
+
+
+def main():
+    images = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_IMAGES
+    with tempfile.TemporaryDirectory() as temp_dir:
+        photos = generate_photos(temp_dir, images)
+        pool = ImageProcessingPool(cache_dir=os.path.join(temp_dir, "cache"))
+        pptx_presentation_creator.IMAGE_PROCESSING_POOL = pool
+
+        started_at = time.perf_counter()
+        pool.warm_up()
+        warm_up = time.perf_counter() - started_at
+
+        print(
+            f"{images} photos of {PHOTO_SIZE[0]}x{PHOTO_SIZE[1]}, "
+            f"{pool.get_max_workers()} workers (started in {warm_up:.2f}s)"
+        )
+        print(
+            f"inline:       {export(InlinePptxPresentationCreator, photos, temp_dir)}"
+        )
+        print(f"process pool: {export(PptxPresentationCreator, photos, temp_dir)}")
+        print(f"cached:       {export(PptxPresentationCreator, photos, temp_dir)}")
+        for image_dpi in IMAGE_DPIS:
+            print(
+                f"{f'{image_dpi} DPI:':14}"
+                f"{export(PptxPresentationCreator, photos, temp_dir, image_dpi)}"
+            )
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
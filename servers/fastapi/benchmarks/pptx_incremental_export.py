@@ -0,0 +1,161 @@
+"""
+Measures exporting a deck again after one of its slides was edited, with every
+slide built again (previous behaviour, with and without the processed image
+cache) and with unchanged slides restored from the PPTX slide cache.
+
+Pictures are network images served by a local server with simulated latency.
+
+Run from servers/fastapi with:
+
+    python -m benchmarks.pptx_incremental_export [slides]
+"""
+
+import asyncio
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import aiohttp
+from aiohttp import web
+
+from benchmarks.download_files import get_free_port
+from benchmarks.pptx_export import generate_photos
+from models.pptx_models import (
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxParagraphModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+    PptxTextBoxModel,
+)
+from services import pptx_presentation_creator
+from services.image_processing_pool import ImageProcessingPool
+from services.pptx_presentation_creator import PptxPresentationCreator
+from services.pptx_slide_cache import PptxSlideCache
+
+DEFAULT_SLIDES = 60
+LATENCY = 0.05
+
+
+def run_server(port: int, photos_dir: str):
+    stats = {"requests": 0}
+
+    async def photo(request: web.Request) -> web.FileResponse:
+        stats["requests"] += 1
+        await asyncio.sleep(LATENCY)
+        return web.FileResponse(os.path.join(photos_dir, request.match_info["name"]))
+
+    async def get_stats(_: web.Request) -> web.Response:
+        response = web.json_response(stats.copy())
+        stats["requests"] = 0
+        return response
+
+    app = web.Application()
+    app.router.add_get("/photos/{name}", photo)
+    app.router.add_get("/stats", get_stats)
+    web.run_app(app, host="127.0.0.1", port=port, print=None, access_log=None)
+
+
+async def get_server_requests(base_url: str) -> int:
+    for _ in range(100):
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"{base_url}/stats") as response:
+                    return (await response.json())["requests"]
+        except aiohttp.ClientError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError("Benchmark server did not start")
+
+
+def create_pptx_model(photo_urls, edited_slide: int = -1) -> PptxPresentationModel:
+    slides = []
+    for index, photo_url in enumerate(photo_urls):
+        title = f"Slide {index}" + (" (edited)" if index == edited_slide else "")
+        slides.append(
+            PptxSlideModel(
+                note=f"Speaker notes of {title}",
+                shapes=[
+                    PptxTextBoxModel(
+                        position=PptxPositionModel(
+                            left=40, top=40, width=1200, height=80
+                        ),
+                        paragraphs=[PptxParagraphModel(text=f"<b>{title}</b>")],
+                    ),
+                    PptxPictureBoxModel(
+                        position=PptxPositionModel(
+                            left=40, top=160, width=580, height=440
+                        ),
+                        picture=PptxPictureModel(is_network=True, path=photo_url),
+                        border_radius=[16, 16, 16, 16],
+                        object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.COVER),
+                    ),
+                ],
+            )
+        )
+    return PptxPresentationModel(slides=slides)
+
+
+def export(pptx_model: PptxPresentationModel, temp_dir: str) -> float:
+    started_at = time.perf_counter()
+    creator = PptxPresentationCreator(pptx_model, temp_dir)
+    asyncio.run(creator.create_ppt())
+    creator.save(os.path.join(temp_dir, "deck.pptx"))
+    return time.perf_counter() - started_at
+
+
+def main():
+    slides = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SLIDES
+    with tempfile.TemporaryDirectory() as temp_dir:
+        photos_dir = os.path.join(temp_dir, "photos")
+        os.makedirs(photos_dir)
+        photos = generate_photos(photos_dir, slides)
+
+        port = get_free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = multiprocessing.Process(
+            target=run_server, args=(port, photos_dir), daemon=True
+        )
+        server.start()
+
+        pool = ImageProcessingPool(cache_dir=os.path.join(temp_dir, "images"))
+        pool.warm_up()
+        pptx_presentation_creator.IMAGE_PROCESSING_POOL = pool
+        photo_urls = [f"{base_url}/photos/{os.path.basename(p)}" for p in photos]
+
+        print(f"{slides} slides with a network photo each, 1 slide edited")
+        try:
+            asyncio.run(get_server_requests(base_url))
+            pptx_presentation_creator.PPTX_SLIDE_CACHE = PptxSlideCache(max_size=0)
+            # Models are created for each export, exports resolve their pictures
+            for name, edited_slide in [
+                ("full export:", -1),
+                ("full export, cached images:", slides // 2),
+            ]:
+                duration = export(create_pptx_model(photo_urls, edited_slide), temp_dir)
+                requests = asyncio.run(get_server_requests(base_url))
+                print(f"{name:32}{duration:6.2f}s, {requests:3} downloads")
+
+            pptx_presentation_creator.PPTX_SLIDE_CACHE = PptxSlideCache(
+                cache_dir=os.path.join(temp_dir, "slides")
+            )
+            export(create_pptx_model(photo_urls), temp_dir)
+            asyncio.run(get_server_requests(base_url))
+            duration = export(create_pptx_model(photo_urls, slides // 2), temp_dir)
+            requests = asyncio.run(get_server_requests(base_url))
+            print(
+                f"{'incremental, 1 slide changed:':32}{duration:6.2f}s, "
+                f"{requests:3} downloads"
+            )
+        finally:
+            pool.shutdown()
+            server.terminate()
+            server.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Compares listing presentations for the dashboard one first slide query at a
+time (previous behaviour, every presentation loaded with its outlines, layout
+and structure) with the joined query of /presentation/all, returning every
+presentation and a page of them. Runs on a local SQLite database and on a
+stand-in for PostgreSQL and MySQL servers: SQLite with a simulated network
+round trip per statement.
+
+Run from servers/fastapi with:
+
+    python -m benchmarks.presentation_list [presentations]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from api.v1.ppt.endpoints.presentation import get_all_presentations
+from models.presentation_with_slides import PresentationWithSlides
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+
+DEFAULT_PRESENTATIONS = 10_000
+SLIDES = 8
+PAGE_SIZE = 50
+REPEATS = 3
+ROUND_TRIP = 0.002
+
+
+async def list_presentations_before(sql_session: AsyncSession):
+    presentations = await sql_session.scalars(select(PresentationModel))
+
+    async def inner(presentation: PresentationModel, sql_session: AsyncSession):
+        first_slide = await sql_session.scalar(
+            select(SlideModel)
+            .where(SlideModel.presentation == presentation.id)
+            .where(SlideModel.index == 0)
+        )
+        if not first_slide:
+            return None
+        return PresentationWithSlides(
+            **presentation.model_dump(),
+            slides=[first_slide],
+        )
+
+    tasks = [inner(p, sql_session) for p in presentations]
+    results = await asyncio.gather(*tasks)
+    return [r for r in results if r is not None]
+
+
+async def list_presentations_after(sql_session: AsyncSession):
+    return await get_all_presentations(Response(), None, None, sql_session)
+
+
+async def list_page_after(sql_session: AsyncSession):
+    return await get_all_presentations(Response(), PAGE_SIZE, None, sql_session)
+
+
+async def create_presentations(db_path: str, presentations: int):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: SQLModel.metadata.create_all(
+                sync_conn, tables=[PresentationModel.__table__, SlideModel.__table__]
+            )
+        )
+    updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    async with async_sessionmaker(engine)() as session:
+        for i in range(presentations):
+            presentation_id = uuid.uuid4()
+            session.add(
+                PresentationModel(
+                    id=presentation_id,
+                    content=f"A presentation about topic {i}",
+                    n_slides=SLIDES,
+                    language="English",
+                    title=f"Topic {i}",
+                    updated_at=updated_at + timedelta(seconds=i),
+                    outlines={
+                        "slides": [
+                            {"content": f"## Slide {j}\n" + "Outline text. " * 60}
+                            for j in range(SLIDES)
+                        ]
+                    },
+                    layout={
+                        "name": "general",
+                        "ordered": False,
+                        "slides": [
+                            {
+                                "id": f"general:layout-{j}",
+                                "name": f"Layout {j}",
+                                "description": "Layout description. " * 10,
+                                "json_schema": {
+                                    "type": "object",
+                                    "properties": {
+                                        f"field_{k}": {"type": "string"}
+                                        for k in range(20)
+                                    },
+                                },
+                            }
+                            for j in range(12)
+                        ],
+                    },
+                    structure={"slides": list(range(SLIDES))},
+                )
+            )
+            session.add_all(
+                SlideModel(
+                    presentation=presentation_id,
+                    layout_group="general",
+                    layout=f"general:layout-{j}",
+                    index=j,
+                    content={"title": f"Slide {j}", "body": "Slide text. " * 20},
+                )
+                for j in range(SLIDES)
+            )
+            if i % 1000 == 999:
+                await session.commit()
+        await session.commit()
+    await engine.dispose()
+
+
+async def run_backend(name: str, round_trip: float, db_path: str):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    statements = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+        if round_trip:
+            time.sleep(round_trip)
+
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    for list_name, list_presentations in [
+        ("before", list_presentations_before),
+        ("joined", list_presentations_after),
+        (f"page of {PAGE_SIZE}", list_page_after),
+    ]:
+        statements.clear()
+        durations = []
+        for _ in range(REPEATS):
+            started_at = time.perf_counter()
+            async with session_maker() as session:
+                listed = await list_presentations(session)
+            durations.append(time.perf_counter() - started_at)
+        response_size = sum(
+            len(presentation.model_dump_json()) for presentation in listed
+        )
+        print(
+            f"{name:28} {list_name:11} best {min(durations) * 1000:8.1f}ms  "
+            f"{len(statements) / REPEATS:7.0f} statements  "
+            f"{len(listed):6} presentations  {response_size / 1e6:6.1f}MB"
+        )
+    await engine.dispose()
+
+
+def main():
+    presentations = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRESENTATIONS
+    print(f"{presentations} presentations of {SLIDES} slides")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "app.db")
+        asyncio.run(create_presentations(db_path, presentations))
+        for name, round_trip in [
+            ("sqlite", 0),
+            (f"stand-in, {ROUND_TRIP * 1000:.0f}ms round trips", ROUND_TRIP),
+        ]:
+            asyncio.run(run_backend(name, round_trip, db_path))
+
+
+if __name__ == "__main__":
+    main()
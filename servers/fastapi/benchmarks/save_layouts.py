@@ -0,0 +1,128 @@
+"""
+Compares saving the layouts of a template one by one (previous behaviour, a
+select per layout then an insert or update) with the bulk upsert of
+save_layouts, on a local SQLite database and on a stand-in for PostgreSQL and
+MySQL servers: SQLite with a simulated network round trip per statement. The
+stand-in runs the SQLite upsert, PostgreSQL and MySQL get the same single
+INSERT ... ON CONFLICT / ON DUPLICATE KEY UPDATE statement.
+
+Run from servers/fastapi with:
+
+    python -m benchmarks.save_layouts [layouts]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import uuid
+from typing import List
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from api.v1.ppt.endpoints.slide_to_html import (
+    LayoutData,
+    SaveLayoutsRequest,
+    save_layouts,
+)
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from utils.datetime_utils import get_current_utc_datetime
+
+DEFAULT_LAYOUTS = 50
+SAVES = 20
+ROUND_TRIP = 0.002
+LAYOUT_CODE = "export default function Layout() { return <div/>; }\n" * 40
+
+
+async def save_layouts_before(layouts: List[LayoutData], session: AsyncSession):
+    for layout_data in layouts:
+        existing_layout = (
+            await session.execute(
+                select(PresentationLayoutCodeModel).where(
+                    PresentationLayoutCodeModel.presentation
+                    == layout_data.presentation,
+                    PresentationLayoutCodeModel.layout_id == layout_data.layout_id,
+                )
+            )
+        ).scalar_one_or_none()
+        if existing_layout:
+            existing_layout.layout_name = layout_data.layout_name
+            existing_layout.layout_code = layout_data.layout_code
+            existing_layout.fonts = layout_data.fonts
+            existing_layout.updated_at = get_current_utc_datetime()
+        else:
+            session.add(PresentationLayoutCodeModel(**layout_data.model_dump()))
+    await session.commit()
+
+
+async def save_layouts_after(layouts: List[LayoutData], session: AsyncSession):
+    await save_layouts(SaveLayoutsRequest(layouts=layouts), session)
+
+
+async def run_backend(name: str, round_trip: float, layouts: int, temp_dir: str):
+    for save_name, save in [
+        ("before", save_layouts_before),
+        ("upsert", save_layouts_after),
+    ]:
+        db_path = os.path.join(temp_dir, f"{name}-{save_name}.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn, tables=[PresentationLayoutCodeModel.__table__]
+                )
+            )
+        statements = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+            if round_trip:
+                time.sleep(round_trip)
+
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        durations = []
+        for save_index in range(SAVES):
+            # Each template is saved, then saved again with edited layouts
+            presentation = uuid.uuid4()
+            for version in range(2):
+                template = [
+                    LayoutData(
+                        presentation=presentation,
+                        layout_id=f"layout-{i}",
+                        layout_name=f"Layout {i}",
+                        layout_code=f"// v{version}\n{LAYOUT_CODE}",
+                        fonts=["https://fonts.googleapis.com/css2?family=Inter"],
+                    )
+                    for i in range(layouts)
+                ]
+                started_at = time.perf_counter()
+                async with session_maker() as session:
+                    await save(template, session)
+                durations.append(time.perf_counter() - started_at)
+        await engine.dispose()
+
+        durations.sort()
+        print(
+            f"{name:28} {save_name:7} median {durations[len(durations) // 2] * 1000:7.1f}ms  "
+            f"p95 {durations[int(len(durations) * 0.95)] * 1000:7.1f}ms  "
+            f"{len(statements) / len(durations):5.1f} statements per save"
+        )
+
+
+def main():
+    layouts = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LAYOUTS
+    print(f"{SAVES} templates of {layouts} layouts, each saved twice")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, round_trip in [
+            ("sqlite", 0),
+            (f"stand-in, {ROUND_TRIP * 1000:.0f}ms round trips", ROUND_TRIP),
+        ]:
+            asyncio.run(run_backend(name, round_trip, layouts, temp_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Compares ScoreBasedChunker with its previous line based implementation on
+large markdown documents, and checks both return identical chunks.
+
+Run from servers/fastapi with:
+
+    python -m benchmarks.score_based_chunker [megabytes]
+"""
+
+import random
+import sys
+import time
+from typing import List
+
+from models.document_chunk import DocumentChunk
+from services.score_based_chunker import HeadingIndex, ScoreBasedChunker
+
+DEFAULT_MEGABYTES = 10
+TOP_K = 10
+
+
+def get_chunks_from_headings_before(
+    chunker: ScoreBasedChunker,
+    text: str,
+    headings: List[str],
+    heading_scores: List[float],
+    top_k: int = 10,
+) -> List[DocumentChunk]:
+    # Previous implementation, maps headings to lines in O(lines * headings)
+    if not heading_scores:
+        heading_scores = chunker.score_headings(headings)
+
+    selected_indices = chunker.select_heading_indices(heading_scores, top_k)
+    if not selected_indices:
+        return []
+
+    lines = text.split("\n")
+    heading_positions = {}
+
+    for i, line in enumerate(lines):
+        line_stripped = line.strip()
+        if line_stripped.startswith("#"):
+            for heading_idx, heading in enumerate(headings):
+                if heading == line_stripped and heading_idx not in heading_positions:
+                    heading_positions[heading_idx] = i
+                    break
+
+    chunks = []
+    for i, heading_idx in enumerate(selected_indices):
+        if heading_idx not in heading_positions:
+            continue
+
+        heading_line_idx = heading_positions[heading_idx]
+        content_end = len(lines)
+        if i + 1 < len(selected_indices):
+            next_heading_idx = selected_indices[i + 1]
+            if next_heading_idx in heading_positions:
+                content_end = heading_positions[next_heading_idx]
+
+        content = "\n".join(lines[heading_line_idx + 1 : content_end]).strip()
+        chunks.append(
+            DocumentChunk(
+                heading=headings[heading_idx],
+                content=content,
+                heading_index=heading_idx,
+                score=heading_scores[heading_idx],
+            )
+        )
+    return chunks
+
+
+def extract_headings_before(text: str) -> List[str]:
+    headings = []
+    for line in text.split("\n"):
+        line = line.strip()
+        if line.startswith("#"):
+            headings.append(line)
+    return headings
+
+
+def generate_markdown(size: int, seed: int = 0) -> str:
+    """
+    Generates docling like markdown, with a heading every few paragraphs.
+    """
+    rng = random.Random(seed)
+    words = "revenue growth market customers product quarter results team".split()
+    parts = []
+    length = 0
+    section = 0
+    while length < size:
+        section += 1
+        level = rng.choice([1, 2, 2, 3, 3, 3, 4, 5])
+        part = f"{'#' * level} Section {section} {rng.choice(words)}"
+        if rng.random() < 0.1:
+            # Docling repeats running headers on every page
+            part = "## Annual report"
+        paragraphs = [
+            " ".join(rng.choice(words) for _ in range(rng.randint(20, 80)))
+            for _ in range(rng.randint(1, 4))
+        ]
+        part = "\n\n".join([part, *paragraphs])
+        parts.append(part)
+        length += len(part) + 2
+    return "\n\n".join(parts)
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MEGABYTES
+    text = generate_markdown(int(megabytes * 1024 * 1024))
+    chunker = ScoreBasedChunker()
+
+    started_at = time.perf_counter()
+    heading_index = HeadingIndex(text)
+    headings = heading_index.headings
+    heading_scores = chunker.score_headings(headings)
+    chunks = chunker.get_chunks_from_headings(
+        text, headings, heading_scores, TOP_K, heading_index
+    )
+    after = time.perf_counter() - started_at
+
+    print(
+        f"Markdown: {len(text) / 1024 / 1024:.1f}MB, {len(headings)} headings, "
+        f"top {TOP_K} chunks"
+    )
+    print(f"single pass index: {after * 1000:10.1f}ms")
+
+    started_at = time.perf_counter()
+    headings_before = extract_headings_before(text)
+    chunks_before = get_chunks_from_headings_before(
+        chunker, text, headings_before, chunker.score_headings(headings_before), TOP_K
+    )
+    before = time.perf_counter() - started_at
+    print(f"line by line:      {before * 1000:10.1f}ms ({before / after:.1f}x)")
+
+    assert headings == headings_before
+    assert chunks == chunks_before
+    print("Chunks are identical")
+
+
+if __name__ == "__main__":
+    main()
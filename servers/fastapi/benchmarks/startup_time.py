@@ -0,0 +1,61 @@
+"""
+Measures FastAPI app import time and time to first request.
+
+Run from servers/fastapi with:
+
+    python -m benchmarks.startup_time
+"""
+
+import subprocess
+import sys
+
+TOP_MODULES = 15
+
+FIRST_REQUEST_CODE = """
+import time
+started_at = time.perf_counter()
+from fastapi.testclient import TestClient
+import api.main
+with TestClient(api.main.app) as client:
+    client.get("/api/v1/ppt/health")
+    print(f"first_request={time.perf_counter() - started_at}")
+"""
+
+
+def get_import_times(module: str) -> list[tuple[int, str]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        import_times.append((int(cumulative), name.strip()))
+    return import_times
+
+
+def main():
+    import_times = get_import_times("api.main")
+    total = next(time for time, name in import_times if name == "api.main")
+    print(f"Import time of api.main: {total / 1_000_000:.2f}s")
+    print("Slowest imports (cumulative):")
+    for cumulative, name in sorted(import_times, reverse=True)[1 : TOP_MODULES + 1]:
+        print(f"  {cumulative / 1_000_000:6.2f}s  {name}")
+
+    output = subprocess.check_output(
+        [sys.executable, "-c", FIRST_REQUEST_CODE], text=True
+    )
+    first_request = next(
+        float(line.removeprefix("first_request="))
+        for line in output.splitlines()
+        if line.startswith("first_request=")
+    )
+    print(f"Time to first request: {first_request:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Measures the overhead UserConfigEnvUpdateMiddleware adds to every request.
+
+Compares the previous middleware, which re-read the user config file on every
+request, with the snapshot based one. Run from servers/fastapi with:
+
+    python -m benchmarks.user_config_middleware
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
+
+from api.middlewares import UserConfigEnvUpdateMiddleware
+from utils.user_config import update_env_with_user_config
+
+REQUESTS = 5000
+
+
+class PerRequestUserConfigMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        update_env_with_user_config()
+        return await call_next(request)
+
+
+async def app(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+async def measure(asgi_app) -> float:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "raw_path": b"/",
+        "query_string": b"",
+        "headers": [],
+        "server": ("testserver", 80),
+        "client": ("testclient", 50000),
+        "scheme": "http",
+        "http_version": "1.1",
+        "root_path": "",
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(_):
+        pass
+
+    started_at = time.perf_counter()
+    for _ in range(REQUESTS):
+        await asgi_app(dict(scope), receive, send)
+    return (time.perf_counter() - started_at) / REQUESTS * 1_000_000
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        user_config_path = os.path.join(temp_dir, "userConfig.json")
+        with open(user_config_path, "w") as f:
+            json.dump({"LLM": "openai", "OPENAI_API_KEY": "sk-test"}, f)
+        os.environ["USER_CONFIG_PATH"] = user_config_path
+
+        baseline = await measure(app)
+        per_request = await measure(PerRequestUserConfigMiddleware(app))
+        snapshot = await measure(UserConfigEnvUpdateMiddleware(app))
+
+    print(f"Requests: {REQUESTS}")
+    print(f"No middleware:          {baseline:8.2f} us/request")
+    print(
+        f"Per request file read:  {per_request:8.2f} us/request "
+        f"(+{per_request - baseline:.2f} us)"
+    )
+    print(
+        f"Config snapshot:        {snapshot:8.2f} us/request "
+        f"(+{snapshot - baseline:.2f} us)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -18,3 +18,16 @@ WEBP_MIME_TYPES = ["image/webp"]
 UPLOAD_ACCEPTED_FILE_TYPES = (
     PDF_MIME_TYPES + TEXT_MIME_TYPES + POWERPOINT_TYPES + WORD_TYPES
 )
+
+
+# Worker processes used to parse uploaded documents
+DEFAULT_DOCUMENT_PARSING_WORKERS = 2
+
+# Resolution (DPI) page images of PDFs are rendered at
+DEFAULT_PDF_PAGE_IMAGE_RESOLUTION = 300
+
+# Pages of a PDF parsed together and yielded as one section while streaming
+PDF_PAGES_PER_SECTION = 10
+
+# Parsed documents and page images kept by the parse cache, 0 disables it
+DEFAULT_DOCUMENT_PARSE_CACHE_MAX_SIZE = 1024 * 1024 * 1024
@@ -0,0 +1,8 @@
+# Number of (query, limit) icon searches kept in memory
+ICON_SEARCH_CACHE_SIZE = 2048
+
+ICONS_PATH = "assets/icons.json"
+
+# Precomputed embeddings used by the numpy icon index
+ICON_EMBEDDINGS_PATH = "assets/icon_embeddings.npy"
+ICON_EMBEDDING_IDS_PATH = "assets/icon_embedding_ids.json"
@@ -0,0 +1,50 @@
+import os
+
+# Size of images requested from each image provider
+IMAGE_PROVIDER_SIZES = {
+    "dall-e-3": "1024x1024",
+    "gemini_flash": "default",
+    "pexels": "large",
+    "pixabay": "large",
+}
+
+# Image asset cache
+DEFAULT_IMAGE_ASSET_CACHE_TTL = 30 * 24 * 60 * 60
+DEFAULT_IMAGE_ASSET_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
+# Stock image providers
+PEXELS_SEARCH_URL = "https://api.pexels.com/v1/search"
+PIXABAY_SEARCH_URL = "https://pixabay.com/api/"
+
+# Requests to each stock image provider, shared by all presentations of a worker,
+# and by all workers when REDIS_URL is set
+STOCK_IMAGE_PROVIDER_LIMITS = {
+    "pexels": {"max_concurrency": 4, "requests_per_second": 1.0, "burst": 20},
+    "pixabay": {"max_concurrency": 4, "requests_per_second": 100 / 60, "burst": 20},
+}
+STOCK_IMAGE_HTTP_TIMEOUT = 30
+STOCK_IMAGE_MAX_RETRIES = 4
+STOCK_IMAGE_RETRY_BASE_DELAY = 0.5
+# Longer waits requested by rate limit headers fail the request instead
+STOCK_IMAGE_MAX_RETRY_DELAY = 60
+
+# Image downloads, e.g. network images of PPTX exports
+DOWNLOAD_MAX_CONCURRENCY = 16
+DOWNLOAD_TIMEOUT = 60
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Worker processes applying picture transforms (fit, clip, rounded corners...) of PPTX exports
+DEFAULT_IMAGE_PROCESSING_WORKERS = min(4, os.cpu_count() or 1)
+
+# Transformed pictures are cached by source image contents and transform
+DEFAULT_PROCESSED_IMAGE_CACHE_MAX_SIZE = 512 * 1024 * 1024
+# Entries used this recently are never evicted, an export might still add them
+PROCESSED_IMAGE_CACHE_MIN_AGE = 10 * 60
+
+# Quality of opaque pictures saved as JPEG when PPTX exports are resampled to a DPI
+PPTX_IMAGE_JPEG_QUALITY = 85
+# Highest DPI PPTX pictures can be resampled to
+MAX_PPTX_IMAGE_DPI = 600
+
+# Built PPTX slides (shapes and embedded images) kept by slide contents, 0 disables it
+DEFAULT_PPTX_SLIDE_CACHE_MAX_SIZE = 256 * 1024 * 1024
@@ -4,3 +4,39 @@ OPENAI_URL = "https://api.openai.com/v1"
 DEFAULT_OPENAI_MODEL = "gpt-4.1"
 DEFAULT_GOOGLE_MODEL = "models/gemini-2.5-flash"
 DEFAULT_ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
+
+# Maximum number of concurrent LLM calls while generating slide contents
+DEFAULT_LLM_CONCURRENCY = {
+    "openai": 10,
+    "google": 10,
+    "anthropic": 5,
+    "ollama": 1,
+    "custom": 4,
+}
+
+# Maximum tokens of uploaded documents passed as context to outline generation
+DEFAULT_OUTLINE_CONTEXT_TOKEN_BUDGET = {
+    "openai": 50000,
+    "google": 100000,
+    "anthropic": 50000,
+    "ollama": 4000,
+    "custom": 8000,
+}
+
+# Rough number of characters per token, used to estimate prompt sizes
+CHARS_PER_TOKEN = 4
+
+# Connection pool of shared LLM provider clients
+LLM_HTTP_MAX_CONNECTIONS = 100
+LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+LLM_HTTP_KEEPALIVE_EXPIRY = 60
+LLM_HTTP_TIMEOUT = 600
+
+# LLM response cache
+DEFAULT_LLM_RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60
+DEFAULT_LLM_RESPONSE_CACHE_MAX_SIZE = 100 * 1024 * 1024
+
+# Prompt sections that change on every call and are ignored in cache keys
+LLM_CACHE_VOLATILE_PATTERNS = [
+    r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?",
+]
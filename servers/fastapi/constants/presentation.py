@@ -0,0 +1,20 @@
+DEFAULT_MAX_CONCURRENT_GENERATIONS = 2
+
+# Seconds a worker's claim on a generation job lives without being refreshed
+GENERATION_JOB_CLAIM_TTL = 60
+
+# Internal API of the Next.js app rendering layouts, PPTX models and PDF exports
+RENDERER_URL = "http://localhost"
+RENDERER_MAX_CONNECTIONS = 16
+# Seconds idle keep-alive connections to the renderer are kept open
+RENDERER_KEEPALIVE_TIMEOUT = 60
+
+# Seconds layouts fetched from the renderer are reused for, by layout group
+DEFAULT_LAYOUT_CACHE_TTL = 10 * 60
+
+# Largest page of presentations returned by /presentation/all
+MAX_PRESENTATIONS_PAGE_SIZE = 200
+
+# Part of the fingerprint of cached exports, bump it when built-in layouts or the
+# way presentations are exported change so older exports are not reused
+EXPORT_LAYOUT_VERSION = 1
@@ -1,5 +1,5 @@
 from typing import List, Literal, Optional
-from pydantic import BaseModel, Field
+from pydantic import AnyHttpUrl, BaseModel, Field
 
 
 class GeneratePresentationRequest(BaseModel):
@@ -27,3 +27,14 @@ class GeneratePresentationRequest(BaseModel):
     export_as: Literal["pptx", "pdf"] = Field(
         default="pptx", description="Export format"
     )
+    force_fresh_images: bool = Field(
+        default=False,
+        description="Whether to generate new images instead of reusing cached ones",
+    )
+
+
+class GeneratePresentationAsyncRequest(GeneratePresentationRequest):
+    webhook_url: Optional[AnyHttpUrl] = Field(
+        default=None,
+        description="Http or https url the job is posted to when it finishes",
+    )
@@ -0,0 +1,7 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+
+class IconSearchRequest(BaseModel):
+    queries: List[str] = Field(..., description="Queries to search icons for")
+    limit: int = Field(default=20, description="Number of icons per query")
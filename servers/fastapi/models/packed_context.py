@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class PackedContext(BaseModel):
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class PptxImageReport(BaseModel):
+    images: int
+    embedded_images: int
+    source_bytes: int
+    embedded_bytes: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.source_bytes - self.embedded_bytes
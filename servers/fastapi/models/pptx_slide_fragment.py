@@ -0,0 +1,10 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class PptxSlideFragment(BaseModel):
+    # Serialized p:cSld element of the slide, its shapes and background
+    xml: bytes
+    # Embedded images by the relationship id shapes reference them with
+    images: Dict[str, bytes]
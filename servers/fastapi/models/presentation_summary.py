@@ -0,0 +1,26 @@
+from typing import List, Optional
+from datetime import datetime
+import uuid
+
+from pydantic import BaseModel
+
+from models.sql.slide import SlideModel
+
+
+class PresentationSummary(BaseModel):
+    """
+    Presentation listed on the dashboard, without the outlines, layout and
+    structure JSON of PresentationWithSlides, slides only holds the first slide.
+    """
+
+    id: uuid.UUID
+    content: str
+    n_slides: int
+    language: str
+    title: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    instructions: Optional[str] = None
+    tone: Optional[str] = None
+    verbosity: Optional[str] = None
+    slides: List[SlideModel]
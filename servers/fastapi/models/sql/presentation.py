@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 import uuid
-from sqlalchemy import JSON, Column, DateTime, String
+from sqlalchemy import JSON, Column, DateTime, Index, String
 from sqlmodel import Field, SQLModel
 
 from models.presentation_layout import PresentationLayoutModel
@@ -12,6 +12,10 @@ from utils.datetime_utils import get_current_utc_datetime
 
 class PresentationModel(SQLModel, table=True):
     __tablename__ = "presentations"
+    __table_args__ = (
+        # Keyset pagination of /presentation/all, most recently updated first
+        Index("ix_presentations_updated_at_id", "updated_at", "id"),
+    )
 
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
     content: str
@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from sqlalchemy import BigInteger, Column, DateTime
+from sqlmodel import Field, SQLModel
+
+from utils.datetime_utils import get_current_utc_datetime
+
+
+class PresentationExportModel(SQLModel, table=True):
+    __tablename__ = "presentation_exports"
+
+    id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
+    # None for exports of pptx models, their fingerprint covers all contents
+    presentation: Optional[uuid.UUID] = Field(default=None, index=True)
+    fingerprint: str = Field(index=True)
+    path: str
+    size: int = Field(sa_column=Column(BigInteger, nullable=False))
+    # st_mtime_ns of the file, compared exactly so it is stored as an integer
+    modified_at_ns: int = Field(sa_column=Column(BigInteger, nullable=False))
+    created_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, default=get_current_utc_datetime
+        ),
+    )
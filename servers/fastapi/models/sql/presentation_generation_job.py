@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import Optional
+import uuid
+
+from sqlalchemy import JSON, Column, DateTime, String
+from sqlmodel import Field, SQLModel
+
+from utils.datetime_utils import get_current_utc_datetime
+
+
+class PresentationGenerationJobModel(SQLModel, table=True):
+    __tablename__ = "presentation_generation_jobs"
+
+    id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
+    presentation: uuid.UUID = Field(default_factory=uuid.uuid4, index=True)
+    status: str = Field(default="pending", index=True)
+    stage: Optional[str] = None
+    progress: int = Field(default=0)
+    request: dict = Field(sa_column=Column(JSON))
+    result: Optional[dict] = Field(sa_column=Column(JSON), default=None)
+    error: Optional[str] = Field(sa_column=Column(String), default=None)
+    webhook_url: Optional[str] = Field(sa_column=Column(String), default=None)
+    created_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), nullable=False, default=get_current_utc_datetime
+        ),
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True),
+            nullable=False,
+            default=get_current_utc_datetime,
+            onupdate=get_current_utc_datetime,
+        ),
+    )
+
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed")
@@ -1,11 +1,15 @@
 from typing import Optional
 import uuid
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from sqlmodel import Field, Column, JSON, SQLModel
 
 
 class SlideModel(SQLModel, table=True):
     __tablename__ = "slides"
+    __table_args__ = (
+        # First slides of presentations, listed with them on the dashboard
+        Index("ix_slides_presentation_index", "presentation", "index"),
+    )
 
     id: uuid.UUID = Field(primary_key=True, default_factory=uuid.uuid4)
     presentation: uuid.UUID = Field(
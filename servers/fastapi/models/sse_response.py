@@ -38,3 +38,14 @@ class SSECompleteResponse(BaseModel):
             event="response",
             data=json.dumps({"type": "complete", self.key: self.value}),
         ).to_string()
+
+
+class SSESlideResponse(BaseModel):
+    index: int
+    slide: str
+
+    def to_string(self):
+        return SSEResponse(
+            event="response",
+            data=json.dumps({"type": "slide", "index": self.index, "slide": self.slide}),
+        ).to_string()
@@ -0,0 +1,47 @@
+"""
+Builds the precomputed embeddings used by the numpy icon index.
+
+Run from servers/fastapi whenever assets/icons.json changes:
+
+    python -m scripts.build_icon_index
+"""
+
+import json
+import time
+
+import numpy as np
+
+from constants.icons import ICON_EMBEDDING_IDS_PATH, ICON_EMBEDDINGS_PATH
+from services.icon_index import get_icon_documents, get_icon_embedding_function
+
+BATCH_SIZE = 256
+
+
+def main():
+    started_at = time.perf_counter()
+    ids, documents = get_icon_documents()
+    embedding_function = get_icon_embedding_function()
+
+    batches = []
+    for start in range(0, len(documents), BATCH_SIZE):
+        batches.append(
+            np.asarray(
+                embedding_function(documents[start : start + BATCH_SIZE]),
+                dtype=np.float32,
+            )
+        )
+    embeddings = np.concatenate(batches)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    np.save(ICON_EMBEDDINGS_PATH, embeddings)
+    with open(ICON_EMBEDDING_IDS_PATH, "w") as f:
+        json.dump(ids, f)
+
+    print(
+        f"Saved {embeddings.shape[0]} icon embeddings ({embeddings.shape[1]} dims, "
+        f"{embeddings.nbytes / 1024 / 1024:.1f}MB) in {time.perf_counter() - started_at:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
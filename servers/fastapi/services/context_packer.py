@@ -0,0 +1,167 @@
+import asyncio
+import math
+import re
+from typing import List, Optional, Tuple
+
+from constants.llm import CHARS_PER_TOKEN
+from models.packed_context import PackedContext
+from services.score_based_chunker import HeadingIndex, ScoreBasedChunker
+from utils.llm_provider import get_outline_context_token_budget
+
+# Sections are not truncated to fewer tokens than this
+MIN_SECTION_TOKENS = 50
+
+WHITESPACE_COMPRESSIONS = [
+    # Docling pads table cells and separators to align columns
+    (re.compile(r"[ \t]{2,}"), " "),
+    (re.compile(r"-{4,}"), "---"),
+    (re.compile(r"[ \t]+\n"), "\n"),
+    (re.compile(r"\n{3,}"), "\n\n"),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class ContextPacker:
+    """
+    Fits uploaded documents into the token budget of outline generation.
+    - Documents within the budget are passed unchanged.
+    - Otherwise each document gets a fair share of the budget and keeps its
+    highest scoring sections (ScoreBasedChunker heading scores), in document order.
+    """
+
+    def __init__(self):
+        self.chunker = ScoreBasedChunker()
+
+        self.requests = 0
+        self.packed_requests = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+
+    def compress(self, text: str) -> str:
+        for pattern, replacement in WHITESPACE_COMPRESSIONS:
+            text = pattern.sub(replacement, text)
+        return text.strip()
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+
+        # Cut at the last paragraph, sentence or word end if it keeps most of the text
+        text = text[:max_chars]
+        for separator in ("\n\n", "\n", ". ", " "):
+            end = text.rfind(separator)
+            if end > max_chars // 2:
+                return text[: end + len(separator)].strip()
+        return text.strip()
+
+    def get_sections(self, document: str) -> List[Tuple[str, float]]:
+        heading_index = HeadingIndex(document)
+        heading_scores = self.chunker.score_headings(heading_index.headings)
+
+        sections = []
+        starts = heading_index.starts
+        preamble = document[: starts[0] if starts else len(document)]
+        if preamble.strip():
+            # Text before the first heading is usually the title or an abstract
+            sections.append((preamble, max(heading_scores, default=0.0) + 1.0))
+
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else len(document)
+            sections.append((document[start:end], heading_scores[i]))
+        return sections
+
+    def pack_document(self, sections: List[Tuple[str, float]], budget: int) -> str:
+        order = sorted(range(len(sections)), key=lambda i: (-sections[i][1], i))
+
+        selected = {}
+        remaining = budget
+        for i in order:
+            section = sections[i][0]
+            # One more token covers the blank line sections are joined with
+            tokens = estimate_tokens(section) + 1
+            if tokens > remaining:
+                if remaining - 1 < MIN_SECTION_TOKENS:
+                    continue
+                section = self.truncate(section, remaining - 1)
+                tokens = estimate_tokens(section) + 1
+            selected[i] = section
+            remaining -= tokens
+
+        return "\n\n".join(selected[i] for i in sorted(selected))
+
+    def pack(self, documents: List[str], budget: Optional[int] = None) -> PackedContext:
+        if budget is None:
+            budget = get_outline_context_token_budget()
+
+        text = "\n\n".join(documents)
+        tokens_before = estimate_tokens(text)
+
+        self.requests += 1
+        self.tokens_before += tokens_before
+        if not budget or tokens_before <= budget:
+            self.tokens_after += tokens_before
+            return PackedContext(
+                text=text, tokens_before=tokens_before, tokens_after=tokens_before
+            )
+
+        sections = [
+            [
+                (self.compress(section), score)
+                for section, score in self.get_sections(document)
+            ]
+            for document in documents
+        ]
+        document_tokens = [
+            sum(estimate_tokens(section) + 1 for section, _ in document_sections)
+            for document_sections in sections
+        ]
+
+        # Smaller documents are kept whole, their unused share goes to larger ones
+        budgets = [0] * len(documents)
+        remaining = budget - len(documents)
+        by_size = sorted(range(len(documents)), key=lambda i: document_tokens[i])
+        for position, i in enumerate(by_size):
+            share = remaining // (len(documents) - position)
+            budgets[i] = min(document_tokens[i], share)
+            remaining -= budgets[i]
+
+        packed_documents = [
+            self.pack_document(document_sections, document_budget)
+            for document_sections, document_budget in zip(sections, budgets)
+        ]
+        text = "\n\n".join(document for document in packed_documents if document)
+        tokens_after = estimate_tokens(text)
+
+        self.packed_requests += 1
+        self.tokens_after += tokens_after
+        return PackedContext(
+            text=text, tokens_before=tokens_before, tokens_after=tokens_after
+        )
+
+    async def pack_async(
+        self, documents: List[str], budget: Optional[int] = None
+    ) -> PackedContext:
+        packed_context = await asyncio.to_thread(self.pack, documents, budget)
+        if packed_context.tokens_saved:
+            print(
+                f"Packed outline context from {packed_context.tokens_before} to "
+                f"{packed_context.tokens_after} tokens "
+                f"({packed_context.tokens_saved} saved)"
+            )
+        return packed_context
+
+    def get_stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "packed_requests": self.packed_requests,
+            "tokens_before": self.tokens_before,
+            "tokens_after": self.tokens_after,
+            "tokens_saved": self.tokens_before - self.tokens_after,
+        }
+
+
+CONTEXT_PACKER = ContextPacker()
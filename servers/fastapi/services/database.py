@@ -6,12 +6,15 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     AsyncSession,
 )
+from sqlalchemy import delete, func, inspect, select
+from sqlalchemy.engine import Connection
 from sqlmodel import SQLModel
 
 from models.sql.image_asset import ImageAsset
 from models.sql.key_value import KeyValueSqlModel
-from models.sql.ollama_pull_status import OllamaPullStatus
 from models.sql.presentation import PresentationModel
+from models.sql.presentation_export import PresentationExportModel
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
 from models.sql.slide import SlideModel
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
 from models.sql.template import TemplateModel
@@ -29,21 +32,6 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-# Container DB (Lives inside the container)
-container_db_url = "sqlite+aiosqlite:////app/container.db"
-container_db_engine: AsyncEngine = create_async_engine(
-    container_db_url, connect_args={"check_same_thread": False}
-)
-container_db_async_session_maker = async_sessionmaker(
-    container_db_engine, expire_on_commit=False
-)
-
-
-async def get_container_db_async_session() -> AsyncGenerator[AsyncSession, None]:
-    async with container_db_async_session_maker() as session:
-        yield session
-
-
 # Create Database and Tables
 async def create_db_and_tables():
     async with sql_engine.begin() as conn:
@@ -52,6 +40,8 @@ async def create_db_and_tables():
                 sync_conn,
                 tables=[
                     PresentationModel.__table__,
+                    PresentationExportModel.__table__,
+                    PresentationGenerationJobModel.__table__,
                     SlideModel.__table__,
                     KeyValueSqlModel.__table__,
                     ImageAsset.__table__,
@@ -60,11 +50,42 @@ async def create_db_and_tables():
                 ],
             )
         )
+        await conn.run_sync(create_layout_code_unique_index)
+        await conn.run_sync(create_presentation_list_indexes)
 
-    async with container_db_engine.begin() as conn:
-        await conn.run_sync(
-            lambda sync_conn: SQLModel.metadata.create_all(
-                sync_conn,
-                tables=[OllamaPullStatus.__table__],
-            )
-        )
+
+def create_layout_code_unique_index(sync_conn: Connection):
+    """
+    Adds the unique (presentation, layout_id) index to layout code tables created
+    before it existed, create_all does not add indexes to existing tables.
+    Duplicates are deleted first, the last saved layout is kept.
+    """
+    table = PresentationLayoutCodeModel.__table__
+    unique_index = next(index for index in table.indexes if index.unique)
+    index_names = {
+        index["name"] for index in inspect(sync_conn).get_indexes(table.name)
+    }
+    if unique_index.name in index_names:
+        return
+
+    latest_ids = (
+        select(func.max(table.c.id))
+        .group_by(table.c.presentation, table.c.layout_id)
+        .subquery()
+    )
+    sync_conn.execute(delete(table).where(table.c.id.not_in(select(latest_ids.c[0]))))
+    unique_index.create(sync_conn)
+
+
+def create_presentation_list_indexes(sync_conn: Connection):
+    """
+    Adds the indexes presentations are listed by, with their first slide, to
+    tables created before they existed.
+    """
+    for table in [PresentationModel.__table__, SlideModel.__table__]:
+        index_names = {
+            index["name"] for index in inspect(sync_conn).get_indexes(table.name)
+        }
+        for index in table.indexes:
+            if index.name not in index_names:
+                index.create(sync_conn)
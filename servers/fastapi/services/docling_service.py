@@ -1,15 +1,19 @@
-from docling.document_converter import (
-    DocumentConverter,
-    PdfFormatOption,
-    PowerpointFormatOption,
-    WordFormatOption,
-)
-from docling.datamodel.pipeline_options import PdfPipelineOptions
-from docling.datamodel.base_models import InputFormat
+import threading
+from typing import Optional, Tuple
 
 
 class DoclingService:
     def __init__(self):
+        # docling is slow to import, so it is only imported when the service is created
+        from docling.document_converter import (
+            DocumentConverter,
+            PdfFormatOption,
+            PowerpointFormatOption,
+            WordFormatOption,
+        )
+        from docling.datamodel.pipeline_options import PdfPipelineOptions
+        from docling.datamodel.base_models import InputFormat
+
         self.pipeline_options = PdfPipelineOptions()
         self.pipeline_options.do_ocr = False
 
@@ -28,6 +32,33 @@ class DoclingService:
             },
         )
 
-    def parse_to_markdown(self, file_path: str) -> str:
-        result = self.converter.convert(file_path)
+    def warm_up(self):
+        from docling.datamodel.base_models import InputFormat
+
+        for input_format in (InputFormat.PDF, InputFormat.DOCX, InputFormat.PPTX):
+            self.converter.initialize_pipeline(input_format)
+
+    def parse_to_markdown(
+        self, file_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> str:
+        if page_range:
+            result = self.converter.convert(file_path, page_range=page_range)
+        else:
+            result = self.converter.convert(file_path)
         return result.document.export_to_markdown()
+
+
+_DOCLING_SERVICE: Optional[DoclingService] = None
+_DOCLING_SERVICE_LOCK = threading.Lock()
+
+
+def get_docling_service() -> DoclingService:
+    """
+    Returns the docling service shared by all document loaders, creating it on first use.
+    """
+    global _DOCLING_SERVICE
+    if _DOCLING_SERVICE is None:
+        with _DOCLING_SERVICE_LOCK:
+            if _DOCLING_SERVICE is None:
+                _DOCLING_SERVICE = DoclingService()
+    return _DOCLING_SERVICE
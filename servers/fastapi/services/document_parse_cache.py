@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+from typing import List, Optional, Tuple
+import uuid
+
+from constants.documents import DEFAULT_DOCUMENT_PARSE_CACHE_MAX_SIZE
+from utils.asset_directory_utils import get_document_parse_cache_directory
+from utils.get_env import get_document_parse_cache_max_size_env
+
+
+class DocumentParseCache:
+    """
+    Persistent cache of parsed documents keyed by file contents.
+    - Keys are the SHA-256 of the file bytes plus the parser options.
+    - Each entry stores the markdown and rendered page images in its own directory.
+    - Least recently used entries are evicted once the cache is over its size budget.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: Optional[int] = None):
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def cache_dir(self) -> str:
+        if self._cache_dir:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            return self._cache_dir
+        return get_document_parse_cache_directory()
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return int(
+            get_document_parse_cache_max_size_env()
+            or DEFAULT_DOCUMENT_PARSE_CACHE_MAX_SIZE
+        )
+
+    def is_enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get_key(self, file_path: str, **options) -> str:
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                file_hash.update(chunk)
+
+        canonical = json.dumps(
+            {"file": file_hash.hexdigest(), "options": options},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get_sync(self, key: str, images_dir: str) -> Optional[Tuple[str, List[str]]]:
+        entry_dir = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry_dir, "document.md"), "r") as f:
+                document = f.read()
+            with open(os.path.join(entry_dir, "images.json"), "r") as f:
+                image_names = json.load(f)
+
+            # Images are copied out so evicting the entry never breaks a request
+            image_paths = []
+            for image_name in image_names:
+                image_path = os.path.join(images_dir, image_name)
+                shutil.copyfile(
+                    os.path.join(entry_dir, "images", image_name), image_path
+                )
+                image_paths.append(image_path)
+
+            os.utime(entry_dir)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return document, image_paths
+
+    def set_sync(self, key: str, document: str, image_paths: List[str]):
+        cache_dir = self.cache_dir
+        entry_dir = os.path.join(cache_dir, key)
+        if os.path.exists(entry_dir):
+            return
+
+        # Entry is written to a temporary directory and renamed, so other
+        # workers never read a partially written entry
+        temp_entry_dir = os.path.join(cache_dir, f".{key}.{uuid.uuid4()}")
+        os.makedirs(os.path.join(temp_entry_dir, "images"))
+        try:
+            with open(os.path.join(temp_entry_dir, "document.md"), "w") as f:
+                f.write(document)
+            image_names = []
+            for image_path in image_paths:
+                image_name = os.path.basename(image_path)
+                shutil.copyfile(
+                    image_path, os.path.join(temp_entry_dir, "images", image_name)
+                )
+                image_names.append(image_name)
+            with open(os.path.join(temp_entry_dir, "images.json"), "w") as f:
+                json.dump(image_names, f)
+
+            os.rename(temp_entry_dir, entry_dir)
+            self.stores += 1
+        except OSError:
+            # Entry was stored by another worker in the meantime
+            shutil.rmtree(temp_entry_dir, ignore_errors=True)
+            return
+
+        self._evict()
+
+    def _get_entry_size(self, entry_dir: str) -> int:
+        size = 0
+        for root, _, files in os.walk(entry_dir):
+            for name in files:
+                size += os.path.getsize(os.path.join(root, name))
+        return size
+
+    def _evict(self):
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            try:
+                size = self._get_entry_size(entry.path)
+                entries.append((entry.stat().st_mtime, size, entry.path))
+            except FileNotFoundError:
+                continue
+            total_size += size
+
+        for _, size, entry_dir in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+            self.evictions += 1
+
+    def clear_sync(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    async def get_key_async(self, file_path: str, **options) -> str:
+        return await asyncio.to_thread(self.get_key, file_path, **options)
+
+    async def get(self, key: str, images_dir: str) -> Optional[Tuple[str, List[str]]]:
+        try:
+            return await asyncio.to_thread(self.get_sync, key, images_dir)
+        except Exception as e:
+            print(f"Error reading document parse cache: {e}")
+            return None
+
+    async def set(self, key: str, document: str, image_paths: List[str]):
+        try:
+            await asyncio.to_thread(self.set_sync, key, document, image_paths)
+        except Exception as e:
+            print(f"Error writing document parse cache: {e}")
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.is_enabled(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+DOCUMENT_PARSE_CACHE = DocumentParseCache()
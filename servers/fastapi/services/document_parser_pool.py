@@ -0,0 +1,107 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+from typing import Callable, Optional, Tuple
+
+from constants.documents import DEFAULT_DOCUMENT_PARSING_WORKERS
+from services.docling_service import get_docling_service
+from utils.get_env import get_document_parsing_workers_env
+
+
+def _initialize_worker():
+    get_docling_service().warm_up()
+
+
+def _warm_up_worker() -> int:
+    return os.getpid()
+
+
+def _parse_to_markdown(
+    file_path: str, page_range: Optional[Tuple[int, int]] = None
+) -> str:
+    return get_docling_service().parse_to_markdown(file_path, page_range)
+
+
+class DocumentParserPool:
+    """
+    Parses documents with docling in a pool of worker processes.
+    - Each worker process keeps one warmed docling converter for all requests.
+    - Parsing never blocks the event loop, at most DOCUMENT_PARSING_WORKERS
+    documents are parsed at once.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def get_max_workers(self) -> int:
+        try:
+            return max(
+                1,
+                int(
+                    get_document_parsing_workers_env()
+                    or DEFAULT_DOCUMENT_PARSING_WORKERS
+                ),
+            )
+        except ValueError:
+            return DEFAULT_DOCUMENT_PARSING_WORKERS
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Workers are spawned, forking a process with running threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.get_max_workers(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_initialize_worker,
+                )
+            return self._executor
+
+    async def _run(self, fn: Callable, *args):
+        executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise
+
+    def _reset(self, executor: ProcessPoolExecutor):
+        # A worker died (e.g. out of memory), start a new pool for next requests
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def parse_to_markdown(
+        self, file_path: str, page_range: Optional[Tuple[int, int]] = None
+    ) -> str:
+        """
+        Parses a document to markdown.
+        - page_range limits parsing of PDFs to the given pages, both ends inclusive.
+        """
+        return await self._run(_parse_to_markdown, file_path, page_range)
+
+    def warm_up(self):
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_warm_up_worker) for _ in range(self.get_max_workers())
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise
+
+    def shutdown(self):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+DOCUMENT_PARSER_POOL = DocumentParserPool()
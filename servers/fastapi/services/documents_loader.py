@@ -1,16 +1,73 @@
 import mimetypes
+from collections import deque
 from fastapi import HTTPException
 import os, asyncio
-from typing import List, Tuple
+from typing import AsyncIterator, Deque, List, Optional, Tuple
 import pdfplumber
 
 from constants.documents import (
+    DEFAULT_PDF_PAGE_IMAGE_RESOLUTION,
     PDF_MIME_TYPES,
+    PDF_PAGES_PER_SECTION,
     POWERPOINT_TYPES,
     TEXT_MIME_TYPES,
     WORD_TYPES,
 )
-from services.docling_service import DoclingService
+from services.document_parse_cache import DOCUMENT_PARSE_CACHE
+from services.document_parser_pool import DOCUMENT_PARSER_POOL
+from utils.get_env import get_pdf_page_image_resolution_env
+
+
+def get_pdf_page_image_resolution() -> int:
+    try:
+        return int(
+            get_pdf_page_image_resolution_env() or DEFAULT_PDF_PAGE_IMAGE_RESOLUTION
+        )
+    except ValueError:
+        return DEFAULT_PDF_PAGE_IMAGE_RESOLUTION
+
+
+def get_pdf_page_count(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def render_pdf_pages(
+    file_path: str, page_numbers: List[int], images_dir: str, resolution: int
+) -> List[str]:
+    image_paths = []
+    with pdfplumber.open(file_path, pages=page_numbers) as pdf:
+        for page in pdf.pages:
+            image_path = os.path.join(images_dir, f"page_{page.page_number}.png")
+            page.to_image(resolution=resolution).save(image_path)
+            # Drops objects parsed for the page, so memory does not grow with page count
+            page.close()
+            image_paths.append(image_path)
+    return image_paths
+
+
+class PdfSection:
+    """
+    Consecutive pages of a PDF yielded by DocumentsLoader.stream_pdf.
+    - Page images are only rendered when get_images is awaited.
+    """
+
+    def __init__(
+        self, file_path: str, page_numbers: List[int], markdown: str, images_dir: str
+    ):
+        self.file_path = file_path
+        self.page_numbers = page_numbers
+        self.markdown = markdown
+        self.images_dir = images_dir
+
+    async def get_images(self, resolution: Optional[int] = None) -> List[str]:
+        return await asyncio.to_thread(
+            render_pdf_pages,
+            self.file_path,
+            self.page_numbers,
+            self.images_dir,
+            resolution or get_pdf_page_image_resolution(),
+        )
 
 
 class DocumentsLoader:
@@ -18,8 +75,6 @@ class DocumentsLoader:
     def __init__(self, file_paths: List[str]):
         self._file_paths = file_paths
 
-        self.docling_service = DoclingService()
-
         self._documents: List[str] = []
         self._images: List[List[str]] = []
 
@@ -31,41 +86,161 @@ class DocumentsLoader:
     def images(self):
         return self._images
 
+    def check_files_exist(self):
+        for file_path in self._file_paths:
+            if not os.path.exists(file_path):
+                raise HTTPException(
+                    status_code=404, detail=f"File {file_path} not found"
+                )
+
     async def load_documents(
         self,
         temp_dir: str,
         load_text: bool = True,
         load_images: bool = False,
     ):
-        documents: List[str] = []
-        images: List[str] = []
+        self.check_files_exist()
 
-        for file_path in self._file_paths:
-            if not os.path.exists(file_path):
-                raise HTTPException(
-                    status_code=404, detail=f"File {file_path} not found"
-                )
+        # Files are parsed concurrently, limited by the document parser pool size
+        results = await asyncio.gather(
+            *[
+                self.load_document(file_path, temp_dir, load_text, load_images)
+                for file_path in self._file_paths
+            ]
+        )
 
-            document = ""
-            imgs = []
+        self._documents = [document for document, _ in results]
+        self._images = [imgs for _, imgs in results]
 
-            mime_type = mimetypes.guess_type(file_path)[0]
-            if mime_type in PDF_MIME_TYPES:
-                document, imgs = await self.load_pdf(
-                    file_path, load_text, load_images, temp_dir
-                )
-            elif mime_type in TEXT_MIME_TYPES:
-                document = await self.load_text(file_path)
-            elif mime_type in POWERPOINT_TYPES:
-                document = self.load_powerpoint(file_path)
-            elif mime_type in WORD_TYPES:
-                document = self.load_msword(file_path)
+    async def get_cache_key(
+        self,
+        file_path: str,
+        mime_type: Optional[str],
+        load_text: bool,
+        load_images: bool,
+    ) -> Optional[str]:
+        # Parsed documents are cached by file contents, plain text is read directly
+        parsed_mime_types = PDF_MIME_TYPES + POWERPOINT_TYPES + WORD_TYPES
+        if mime_type not in parsed_mime_types or not DOCUMENT_PARSE_CACHE.is_enabled():
+            return None
 
-            documents.append(document)
-            images.append(imgs)
+        return await DOCUMENT_PARSE_CACHE.get_key_async(
+            file_path,
+            parser="docling",
+            do_ocr=False,
+            load_text=load_text,
+            load_images=load_images and mime_type in PDF_MIME_TYPES,
+            image_resolution=get_pdf_page_image_resolution(),
+        )
+
+    async def load_document(
+        self,
+        file_path: str,
+        temp_dir: str,
+        load_text: bool = True,
+        load_images: bool = False,
+    ) -> Tuple[str, List[str]]:
+        document = ""
+        imgs = []
+
+        mime_type = mimetypes.guess_type(file_path)[0]
+
+        cache_key = await self.get_cache_key(
+            file_path, mime_type, load_text, load_images
+        )
+        if cache_key:
+            cached = await DOCUMENT_PARSE_CACHE.get(cache_key, temp_dir)
+            if cached:
+                return cached
+
+        if mime_type in PDF_MIME_TYPES:
+            document, imgs = await self.load_pdf(
+                file_path, load_text, load_images, temp_dir
+            )
+        elif mime_type in TEXT_MIME_TYPES:
+            document = await self.load_text(file_path)
+        elif mime_type in POWERPOINT_TYPES:
+            document = await self.load_powerpoint(file_path)
+        elif mime_type in WORD_TYPES:
+            document = await self.load_msword(file_path)
+
+        if cache_key:
+            await DOCUMENT_PARSE_CACHE.set(cache_key, document, imgs)
+
+        return document, imgs
+
+    async def stream_document(
+        self, file_path: str, temp_dir: str
+    ) -> AsyncIterator[str]:
+        """
+        Yields the markdown of a document section by section.
+        - PDFs are yielded every PDF_PAGES_PER_SECTION pages as soon as they are parsed.
+        - Other documents and cached PDFs are yielded as a single section.
+        """
+        if not os.path.exists(file_path):
+            raise HTTPException(status_code=404, detail=f"File {file_path} not found")
+
+        mime_type = mimetypes.guess_type(file_path)[0]
+        if mime_type not in PDF_MIME_TYPES:
+            document, _ = await self.load_document(file_path, temp_dir)
+            yield document
+            return
 
-        self._documents = documents
-        self._images = images
+        cache_key = await self.get_cache_key(file_path, mime_type, True, False)
+        if cache_key:
+            cached = await DOCUMENT_PARSE_CACHE.get(cache_key, temp_dir)
+            if cached:
+                yield cached[0]
+                return
+
+        sections = []
+        async for section in self.stream_pdf(file_path, temp_dir):
+            sections.append(section.markdown)
+            yield section.markdown
+
+        if cache_key:
+            await DOCUMENT_PARSE_CACHE.set(cache_key, "\n\n".join(sections), [])
+
+    async def stream_pdf(
+        self,
+        file_path: str,
+        temp_dir: str,
+        load_text: bool = True,
+        pages_per_section: int = PDF_PAGES_PER_SECTION,
+    ) -> AsyncIterator[PdfSection]:
+        """
+        Yields sections of a PDF in page order.
+        - Upcoming sections are parsed while the current one is consumed,
+        at most one section per document parser worker.
+        - Page images of a section are rendered on demand with PdfSection.get_images.
+        """
+        page_count = await asyncio.to_thread(get_pdf_page_count, file_path)
+        page_ranges = [
+            (start, min(start + pages_per_section - 1, page_count))
+            for start in range(1, page_count + 1, pages_per_section)
+        ]
+
+        async def parse_section(page_range: Tuple[int, int]) -> str:
+            if not load_text:
+                return ""
+            return await DOCUMENT_PARSER_POOL.parse_to_markdown(file_path, page_range)
+
+        max_pending = DOCUMENT_PARSER_POOL.get_max_workers()
+        pending: Deque[asyncio.Task] = deque()
+        try:
+            for index, (start, end) in enumerate(page_ranges):
+                for page_range in page_ranges[
+                    index + len(pending) : index + max_pending
+                ]:
+                    pending.append(asyncio.create_task(parse_section(page_range)))
+
+                markdown = await pending.popleft()
+                yield PdfSection(
+                    file_path, list(range(start, end + 1)), markdown, temp_dir
+                )
+        finally:
+            for task in pending:
+                task.cancel()
 
     async def load_pdf(
         self,
@@ -74,34 +249,39 @@ class DocumentsLoader:
         load_images: bool,
         temp_dir: str,
     ) -> Tuple[str, List[str]]:
+        sections = []
         image_paths = []
-        document: str = ""
-
-        if load_text:
-            document = self.docling_service.parse_to_markdown(file_path)
+        async for section in self.stream_pdf(file_path, temp_dir, load_text):
+            if load_text:
+                sections.append(section.markdown)
+            if load_images:
+                image_paths.extend(await section.get_images())
 
-        if load_images:
-            image_paths = await self.get_page_images_from_pdf_async(file_path, temp_dir)
-
-        return document, image_paths
+        return "\n\n".join(sections), image_paths
 
     async def load_text(self, file_path: str) -> str:
         with open(file_path, "r") as file:
             return await asyncio.to_thread(file.read)
 
-    def load_msword(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_msword(self, file_path: str) -> str:
+        return await DOCUMENT_PARSER_POOL.parse_to_markdown(file_path)
 
-    def load_powerpoint(self, file_path: str) -> str:
-        return self.docling_service.parse_to_markdown(file_path)
+    async def load_powerpoint(self, file_path: str) -> str:
+        return await DOCUMENT_PARSER_POOL.parse_to_markdown(file_path)
 
-    def get_page_images_from_pdf(self, file_path: str, temp_dir: str):
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                img = page.to_image(resolution=300)
-                img.save(os.path.join(temp_dir, f"page_{page.page_number}.png"))
+    def get_page_images_from_pdf(
+        self, file_path: str, temp_dir: str, resolution: Optional[int] = None
+    ) -> List[str]:
+        return render_pdf_pages(
+            file_path,
+            list(range(1, get_pdf_page_count(file_path) + 1)),
+            temp_dir,
+            resolution or get_pdf_page_image_resolution(),
+        )
 
-    async def get_page_images_from_pdf_async(self, file_path: str, temp_dir: str):
+    async def get_page_images_from_pdf_async(
+        self, file_path: str, temp_dir: str, resolution: Optional[int] = None
+    ):
         return await asyncio.to_thread(
-            self.get_page_images_from_pdf, file_path, temp_dir
+            self.get_page_images_from_pdf, file_path, temp_dir, resolution
         )
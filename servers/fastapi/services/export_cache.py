@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+from typing import Optional
+import uuid
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from constants.presentation import EXPORT_LAYOUT_VERSION
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_export import PresentationExportModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from models.sql.template import TemplateModel
+from services import database
+from utils.get_env import get_export_cache_env
+from utils.parsers import parse_bool_or_none
+
+
+class ExportCache:
+    """
+    Reuses exported files while the exported contents are unchanged.
+    - Presentation exports are fingerprinted by the presentation, its slides, the
+    layouts they are rendered with and the export options. Rows are deleted when
+    the presentation is updated or a slide is edited.
+    - Custom templates are covered by their saved layouts and template row, built-in
+    layouts by EXPORT_LAYOUT_VERSION.
+    - Exports of pptx models are fingerprinted by the model.
+    - Exported files can be overwritten by exports with the same title, a cached
+    path is only returned if the file size and modification time are unchanged.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalidations = 0
+
+    def is_enabled(self) -> bool:
+        enabled = parse_bool_or_none(get_export_cache_env())
+        return True if enabled is None else enabled
+
+    def get_fingerprint(self, contents: dict) -> str:
+        canonical = json.dumps(
+            contents, sort_keys=True, separators=(",", ":"), default=str
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    async def get_presentation_fingerprint(
+        self, presentation_id: uuid.UUID, **options
+    ) -> Optional[str]:
+        async with database.async_session_maker() as sql_session:
+            presentation = await sql_session.get(PresentationModel, presentation_id)
+            if not presentation:
+                return None
+            slides = await sql_session.scalars(
+                select(SlideModel)
+                .where(SlideModel.presentation == presentation_id)
+                .order_by(SlideModel.index)
+            )
+            slides = list(slides)
+            layout_groups = {slide.layout_group for slide in slides}
+            if presentation.layout and presentation.layout.get("name"):
+                layout_groups.add(presentation.layout["name"])
+            return self.get_fingerprint(
+                {
+                    "presentation": presentation.model_dump(
+                        mode="json", include={"title", "layout", "updated_at"}
+                    ),
+                    "slides": [
+                        slide.model_dump(
+                            mode="json",
+                            include={
+                                "index",
+                                "layout",
+                                "content",
+                                "html_content",
+                                "speaker_note",
+                                "properties",
+                            },
+                        )
+                        for slide in slides
+                    ],
+                    "layouts": {
+                        "version": EXPORT_LAYOUT_VERSION,
+                        "custom": await self._get_custom_layout_versions(
+                            sql_session, layout_groups
+                        ),
+                    },
+                    "options": options,
+                }
+            )
+
+    async def _get_custom_layout_versions(
+        self, sql_session: AsyncSession, layout_groups: set[str]
+    ) -> dict:
+        # Layouts of custom templates are served by the renderer as custom-<presentation>
+        template_ids = []
+        for layout_group in layout_groups:
+            if not layout_group.startswith("custom-"):
+                continue
+            try:
+                template_ids.append(uuid.UUID(layout_group.removeprefix("custom-")))
+            except ValueError:
+                continue
+        if not template_ids:
+            return {}
+
+        layout_codes = await sql_session.execute(
+            select(
+                PresentationLayoutCodeModel.presentation,
+                func.count(PresentationLayoutCodeModel.id),
+                func.max(PresentationLayoutCodeModel.updated_at),
+            )
+            .where(PresentationLayoutCodeModel.presentation.in_(template_ids))
+            .group_by(PresentationLayoutCodeModel.presentation)
+        )
+        templates = await sql_session.scalars(
+            select(TemplateModel).where(TemplateModel.id.in_(template_ids))
+        )
+        versions = {
+            str(presentation): {"layouts": count, "updated_at": updated_at}
+            for presentation, count, updated_at in layout_codes
+        }
+        for template in templates:
+            versions.setdefault(str(template.id), {})["template"] = template.model_dump(
+                mode="json", include={"name", "description"}
+            )
+        return versions
+
+    async def get(
+        self, fingerprint: str, presentation_id: Optional[uuid.UUID] = None
+    ) -> Optional[str]:
+        if not self.is_enabled():
+            return None
+
+        async with database.async_session_maker() as sql_session:
+            export = await sql_session.scalar(
+                select(PresentationExportModel)
+                .where(
+                    PresentationExportModel.presentation == presentation_id,
+                    PresentationExportModel.fingerprint == fingerprint,
+                )
+                .order_by(PresentationExportModel.created_at.desc())
+                .limit(1)
+            )
+
+        if export:
+            try:
+                stat = os.stat(export.path)
+                if (stat.st_size, stat.st_mtime_ns) == (
+                    export.size,
+                    export.modified_at_ns,
+                ):
+                    self.hits += 1
+                    return export.path
+            except OSError:
+                pass
+        self.misses += 1
+        return None
+
+    async def set(
+        self,
+        fingerprint: str,
+        path: str,
+        presentation_id: Optional[uuid.UUID] = None,
+    ):
+        if not self.is_enabled():
+            return
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Only local files can be checked before they are reused
+            return
+
+        async with database.async_session_maker() as sql_session:
+            await sql_session.execute(
+                delete(PresentationExportModel).where(
+                    PresentationExportModel.presentation == presentation_id,
+                    PresentationExportModel.fingerprint == fingerprint,
+                )
+            )
+            sql_session.add(
+                PresentationExportModel(
+                    presentation=presentation_id,
+                    fingerprint=fingerprint,
+                    path=path,
+                    size=stat.st_size,
+                    modified_at_ns=stat.st_mtime_ns,
+                )
+            )
+            await sql_session.commit()
+        self.stores += 1
+
+    async def invalidate(self, sql_session: AsyncSession, presentation_id: uuid.UUID):
+        """
+        Deletes cached exports of the presentation, committed with the session.
+        """
+        await sql_session.execute(
+            delete(PresentationExportModel).where(
+                PresentationExportModel.presentation == presentation_id
+            )
+        )
+        self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.is_enabled(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "invalidations": self.invalidations,
+        }
+
+
+EXPORT_CACHE = ExportCache()
@@ -1,56 +1,107 @@
 import asyncio
-import json
-import chromadb
-from chromadb.config import Settings
-from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+from collections import OrderedDict
+import os
+import threading
+from typing import List
+
+from constants.icons import (
+    ICON_EMBEDDING_IDS_PATH,
+    ICON_EMBEDDINGS_PATH,
+    ICON_SEARCH_CACHE_SIZE,
+)
+from utils.get_env import get_icon_index_env
 
 
 class IconFinderService:
     def __init__(self):
-        self.collection_name = "icons"
-        self.client = chromadb.PersistentClient(
-            path="chroma", settings=Settings(anonymized_telemetry=False)
-        )
-        print("Initializing icons collection...")
-        self._initialize_icons_collection()
-        print("Icons collection initialized.")
-
-    def _initialize_icons_collection(self):
-        self.embedding_function = ONNXMiniLM_L6_V2()
-        self.embedding_function.DOWNLOAD_PATH = "chroma/models"
-        self.embedding_function._download_model_if_not_exists()
-        try:
-            self.collection = self.client.get_collection(
-                self.collection_name, embedding_function=self.embedding_function
+        self._search_cache: OrderedDict[tuple, List[str]] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._index = None
+        self._index_lock = threading.Lock()
+
+    @property
+    def index(self):
+        # Index is created on first use or by the startup warm up, not on import
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    print("Initializing icons index...")
+                    self._index = self._create_index()
+                    print(f"Icons index initialized: {self._index.__class__.__name__}")
+        return self._index
+
+    def warm_up(self):
+        self.index.query(["warm up"], 1)
+
+    def _query_index(self, queries: List[str], k: int) -> List[List[str]]:
+        return self.index.query(queries, k)
+
+    def _create_index(self):
+        # Imported here as chromadb and the embedding model are slow to load
+        from services.icon_index import ChromaIconIndex, NumpyIconIndex
+
+        if get_icon_index_env() == "numpy":
+            if os.path.exists(ICON_EMBEDDINGS_PATH) and os.path.exists(
+                ICON_EMBEDDING_IDS_PATH
+            ):
+                return NumpyIconIndex()
+            print(
+                f"{ICON_EMBEDDINGS_PATH} not found, falling back to the chroma icon index"
             )
-        except Exception:
-            with open("assets/icons.json", "r") as f:
-                icons = json.load(f)
-
-            documents = []
-            ids = []
-
-            for i, each in enumerate(icons["icons"]):
-                if each["name"].split("-")[-1] == "bold":
-                    doc_text = f"{each['name']} {each['tags']}"
-                    documents.append(doc_text)
-                    ids.append(each["name"])
-
-            if documents:
-                self.collection = self.client.create_collection(
-                    name=self.collection_name,
-                    embedding_function=self.embedding_function,
-                    metadata={"hnsw:space": "cosine"},
-                )
-                self.collection.add(documents=documents, ids=ids)
-
-    async def search_icons(self, query: str, k: int = 1):
-        result = await asyncio.to_thread(
-            self.collection.query,
-            query_texts=[query],
-            n_results=k,
-        )
-        return [f"/static/icons/bold/{each}.png" for each in result["ids"][0]]
+        return ChromaIconIndex()
+
+    async def search_icons(self, query: str, k: int = 1) -> List[str]:
+        return (await self.search_icons_batch([query], k))[0]
+
+    async def search_icons_batch(
+        self, queries: List[str], k: int = 1
+    ) -> List[List[str]]:
+        """
+        Searches icons for all queries with a single embedding pass.
+        - Results are cached per (query, k), only uncached queries are embedded.
+        """
+        results = {}
+        missing_queries = []
+        for query in queries:
+            cache_key = (query, k)
+            if cache_key in results:
+                continue
+            if cache_key in self._search_cache:
+                self._search_cache.move_to_end(cache_key)
+                results[cache_key] = self._search_cache[cache_key]
+                self.cache_hits += 1
+            else:
+                results[cache_key] = None
+                missing_queries.append(query)
+                self.cache_misses += 1
+
+        if missing_queries:
+            # Index is accessed in the thread as it may still need to be created
+            query_result = await asyncio.to_thread(
+                self._query_index, missing_queries, k
+            )
+            for query, ids in zip(missing_queries, query_result):
+                icons = [f"/static/icons/bold/{each}.png" for each in ids]
+                results[(query, k)] = icons
+                self._cache_search(query, k, icons)
+
+        return [results[(query, k)] for query in queries]
+
+    def _cache_search(self, query: str, k: int, icons: List[str]):
+        self._search_cache[(query, k)] = icons
+        self._search_cache.move_to_end((query, k))
+        while len(self._search_cache) > ICON_SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+
+    def get_stats(self) -> dict:
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "cache_size": len(self._search_cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+        }
 
 
 ICON_FINDER_SERVICE = IconFinderService()
@@ -0,0 +1,113 @@
+import json
+from typing import List, Tuple
+
+import numpy as np
+
+from constants.icons import (
+    ICON_EMBEDDING_IDS_PATH,
+    ICON_EMBEDDINGS_PATH,
+    ICONS_PATH,
+)
+
+
+def get_icon_documents() -> Tuple[List[str], List[str]]:
+    """
+    Returns ids and searchable documents of the bold icon variants.
+    """
+    with open(ICONS_PATH, "r") as f:
+        icons = json.load(f)
+
+    ids = []
+    documents = []
+    for each in icons["icons"]:
+        if each["name"].split("-")[-1] == "bold":
+            ids.append(each["name"])
+            documents.append(f"{each['name']} {each['tags']}")
+
+    return ids, documents
+
+
+def get_icon_embedding_function():
+    # Imported here so the numpy index does not load chromadb until it embeds
+    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+    embedding_function = ONNXMiniLM_L6_V2()
+    embedding_function.DOWNLOAD_PATH = "chroma/models"
+    embedding_function._download_model_if_not_exists()
+    return embedding_function
+
+
+class ChromaIconIndex:
+    """
+    Icon index stored in a persistent Chroma collection with an HNSW index.
+    """
+
+    def __init__(self):
+        import chromadb
+        from chromadb.config import Settings
+
+        self.collection_name = "icons"
+        self.client = chromadb.PersistentClient(
+            path="chroma", settings=Settings(anonymized_telemetry=False)
+        )
+        self.embedding_function = get_icon_embedding_function()
+        try:
+            self.collection = self.client.get_collection(
+                self.collection_name, embedding_function=self.embedding_function
+            )
+        except Exception:
+            ids, documents = get_icon_documents()
+            if documents:
+                self.collection = self.client.create_collection(
+                    name=self.collection_name,
+                    embedding_function=self.embedding_function,
+                    metadata={"hnsw:space": "cosine"},
+                )
+                self.collection.add(documents=documents, ids=ids)
+
+    def query(self, queries: List[str], k: int) -> List[List[str]]:
+        result = self.collection.query(query_texts=queries, n_results=k)
+        return result["ids"]
+
+
+class NumpyIconIndex:
+    """
+    Icon index loaded from precomputed, normalized embeddings.
+    - Embeddings are memory mapped and searched exactly with a single matrix multiply.
+    - The embedding model is only loaded when the first query is embedded.
+    - Build the embeddings with: python -m scripts.build_icon_index
+    """
+
+    def __init__(
+        self,
+        embeddings_path: str = ICON_EMBEDDINGS_PATH,
+        ids_path: str = ICON_EMBEDDING_IDS_PATH,
+    ):
+        self.embeddings = np.load(embeddings_path, mmap_mode="r")
+        with open(ids_path, "r") as f:
+            self.ids = json.load(f)
+        self._embedding_function = None
+
+    @property
+    def embedding_function(self):
+        if self._embedding_function is None:
+            self._embedding_function = get_icon_embedding_function()
+        return self._embedding_function
+
+    def embed(self, queries: List[str]) -> np.ndarray:
+        embeddings = np.asarray(self.embedding_function(queries), dtype=np.float32)
+        return embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+
+    def query(self, queries: List[str], k: int) -> List[List[str]]:
+        k = min(k, len(self.ids))
+        if k <= 0:
+            return [[] for _ in queries]
+
+        scores = self.embed(queries) @ self.embeddings.T
+
+        # Partially sorts each row so only the top k scores are ordered
+        top_k = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_k_scores = np.take_along_axis(scores, top_k, axis=1)
+        top_k = np.take_along_axis(top_k, np.argsort(-top_k_scores, axis=1), axis=1)
+
+        return [[self.ids[index] for index in row] for row in top_k]
@@ -0,0 +1,304 @@
+import asyncio
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+from constants.images import (
+    DEFAULT_IMAGE_ASSET_CACHE_MAX_SIZE,
+    DEFAULT_IMAGE_ASSET_CACHE_TTL,
+)
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_image_asset_cache_env,
+    get_image_asset_cache_max_size_env,
+    get_image_asset_cache_ttl_env,
+)
+from utils.parsers import parse_bool_or_none
+
+
+class ImageAssetCache:
+    """
+    Opt-in cache of generated images and stock image urls.
+    - Images are keyed by normalized prompt, theme prompt, provider and size.
+    - Entries point to stock urls or to files already saved in the images directory,
+    identical prompts in different decks share one file.
+    - Expired and least recently used entries are evicted once generated files
+    are over the disk budget, files are deleted when no slide uses them anymore.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ):
+        self._db_path = db_path
+        self._ttl = ttl
+        self._max_size = max_size
+        self._initialized_db_path = None
+        self._pending: Dict[str, asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.deduplicated = 0
+
+    def is_enabled(self) -> bool:
+        return parse_bool_or_none(get_image_asset_cache_env()) or False
+
+    @property
+    def db_path(self) -> str:
+        if self._db_path:
+            return self._db_path
+        return os.path.join(
+            get_app_data_directory_env() or "/tmp/presenton", "image_asset_cache.db"
+        )
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is not None:
+            return self._ttl
+        return int(get_image_asset_cache_ttl_env() or DEFAULT_IMAGE_ASSET_CACHE_TTL)
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return int(
+            get_image_asset_cache_max_size_env() or DEFAULT_IMAGE_ASSET_CACHE_MAX_SIZE
+        )
+
+    # ? Keys
+    def normalize_prompt(self, prompt: Optional[str]) -> str:
+        return re.sub(r"\s+", " ", prompt or "").strip().strip(".").lower()
+
+    def get_key(
+        self,
+        prompt: str,
+        theme_prompt: Optional[str],
+        provider: str,
+        size: str,
+    ) -> str:
+        canonical = json.dumps(
+            [
+                self.normalize_prompt(prompt),
+                self.normalize_prompt(theme_prompt),
+                provider,
+                size,
+            ],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # ? Storage
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db_path = self.db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        connection = sqlite3.connect(db_path, timeout=30)
+        if self._initialized_db_path != db_path:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS image_assets (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed_at REAL NOT NULL
+                )
+                """)
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_image_assets_last_accessed_at "
+                "ON image_assets (last_accessed_at)"
+            )
+            connection.commit()
+            self._initialized_db_path = db_path
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get_sync(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value, created_at FROM image_assets WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] <= self.ttl:
+                value = row[0]
+                # Files might have been deleted with the images directory
+                if value.startswith("http") or os.path.exists(value):
+                    connection.execute(
+                        "UPDATE image_assets SET last_accessed_at = ? WHERE key = ?",
+                        (now, key),
+                    )
+                    self.hits += 1
+                    return value
+
+            if row:
+                connection.execute("DELETE FROM image_assets WHERE key = ?", (key,))
+                self.evictions += 1
+        self.misses += 1
+        return None
+
+    def set_sync(self, key: str, value: str) -> List[str]:
+        """
+        Stores an image url or path and returns paths of evicted files.
+        """
+        size = 0 if value.startswith("http") else os.path.getsize(value)
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO image_assets "
+                "(key, value, size, created_at, last_accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self.stores += 1
+            return self._evict(connection, now, key)
+
+    def _evict(
+        self, connection: sqlite3.Connection, now: float, stored_key: str
+    ) -> List[str]:
+        rows: List[Tuple[str, str, int]] = connection.execute(
+            "SELECT key, value, size FROM image_assets WHERE created_at < ?",
+            (now - self.ttl,),
+        ).fetchall()
+
+        total_size = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM image_assets WHERE created_at >= ?",
+            (now - self.ttl,),
+        ).fetchone()[0]
+        if total_size > self.max_size:
+            for row in connection.execute(
+                "SELECT key, value, size FROM image_assets "
+                "WHERE created_at >= ? AND size > 0 AND key != ? "
+                "ORDER BY last_accessed_at ASC",
+                (now - self.ttl, stored_key),
+            ):
+                if total_size <= self.max_size:
+                    break
+                rows.append(row)
+                total_size -= row[2]
+
+        connection.executemany(
+            "DELETE FROM image_assets WHERE key = ?", [(key,) for key, _, _ in rows]
+        )
+        self.evictions += len(rows)
+        return [value for _, value, size in rows if size > 0]
+
+    def clear_sync(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM image_assets")
+
+    async def get(self, key: str) -> Optional[str]:
+        try:
+            return await asyncio.to_thread(self.get_sync, key)
+        except Exception as e:
+            print(f"Error reading image asset cache: {e}")
+            return None
+
+    async def set(self, key: str, value: str):
+        try:
+            evicted_paths = await asyncio.to_thread(self.set_sync, key, value)
+            await self.delete_unused_files(evicted_paths)
+        except Exception as e:
+            print(f"Error writing image asset cache: {e}")
+
+    async def get_or_create(
+        self,
+        key: str,
+        create: Callable[[], Awaitable[Optional[str]]],
+        force_fresh: bool = False,
+    ) -> Optional[str]:
+        """
+        Returns the cached image for the key, or creates and caches it.
+        - Concurrent requests for the same key wait for a single creation.
+        - force_fresh skips the lookup, the new image replaces the cached one.
+        """
+        if not force_fresh:
+            cached = await self.get(key)
+            if cached:
+                return cached
+
+            pending = self._pending.get(key)
+            if pending:
+                self.deduplicated += 1
+                return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        if not force_fresh:
+            self._pending[key] = future
+        try:
+            value = await create()
+            if value:
+                await self.set(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Marks the exception as retrieved when nobody waits for it
+            future.exception()
+            raise
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    # ? Files
+    async def delete_unused_files(self, paths: List[str]):
+        """
+        Deletes evicted files and their generated image assets,
+        files still used by a slide are kept.
+        """
+        if not paths:
+            return
+
+        from sqlalchemy import String, cast, delete, select
+
+        from models.sql.image_asset import ImageAsset
+        from models.sql.slide import SlideModel
+        from services import database
+
+        async with database.async_session_maker() as sql_session:
+            for path in paths:
+                slide_id = await sql_session.scalar(
+                    select(SlideModel.id)
+                    .where(cast(SlideModel.content, String).contains(path))
+                    .limit(1)
+                )
+                if slide_id:
+                    continue
+
+                await sql_session.execute(
+                    delete(ImageAsset).where(
+                        ImageAsset.path == path, ImageAsset.is_uploaded == False
+                    )
+                )
+                try:
+                    await asyncio.to_thread(os.remove, path)
+                except FileNotFoundError:
+                    pass
+            await sql_session.commit()
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.is_enabled(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "deduplicated": self.deduplicated,
+        }
+
+
+IMAGE_ASSET_CACHE = ImageAssetCache()
@@ -1,15 +1,22 @@
 import asyncio
 import os
-import aiohttp
 from google import genai
 from google.genai.types import GenerateContentConfig
 from openai import AsyncOpenAI
+from constants.images import (
+    IMAGE_PROVIDER_SIZES,
+    PEXELS_SEARCH_URL,
+    PIXABAY_SEARCH_URL,
+)
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
+from services.image_asset_cache import IMAGE_ASSET_CACHE
+from services.stock_image_client import STOCK_IMAGE_CLIENTS
 from utils.download_helpers import download_file
 from utils.get_env import get_pexels_api_key_env
 from utils.get_env import get_pixabay_api_key_env
 from utils.image_provider import (
+    get_selected_image_provider,
     is_pixels_selected,
     is_pixabay_selected,
     is_gemini_flash_selected,
@@ -20,8 +27,9 @@ import uuid
 
 class ImageGenerationService:
 
-    def __init__(self, output_directory: str):
+    def __init__(self, output_directory: str, force_fresh: bool = False):
         self.output_directory = output_directory
+        self.force_fresh = force_fresh
         self.image_gen_func = self.get_image_gen_func()
 
     def get_image_gen_func(self):
@@ -38,6 +46,16 @@ class ImageGenerationService:
     def is_stock_provider_selected(self):
         return is_pixels_selected() or is_pixabay_selected()
 
+    def get_cache_key(self, prompt: ImagePrompt) -> str:
+        provider = get_selected_image_provider().value
+        return IMAGE_ASSET_CACHE.get_key(
+            prompt.prompt,
+            # Stock providers are searched without the theme
+            None if self.is_stock_provider_selected() else prompt.theme_prompt,
+            provider,
+            IMAGE_PROVIDER_SIZES.get(provider, "default"),
+        )
+
     async def generate_image(self, prompt: ImagePrompt) -> str | ImageAsset:
         """
         Generates an image based on the provided prompt.
@@ -45,6 +63,8 @@ class ImageGenerationService:
         - If the stock provider is selected, it uses the prompt directly,
         otherwise it uses the full image prompt with theme.
         - Output Directory is used for saving the generated image not the stock provider.
+        - If the image asset cache is enabled, images generated before for the same
+        prompt are returned as a path unless force_fresh is set.
         """
         if not self.image_gen_func:
             print("No image generation function found. Using placeholder image.")
@@ -56,30 +76,44 @@ class ImageGenerationService:
         print(f"Request - Generating Image for {image_prompt}")
 
         try:
-            if self.is_stock_provider_selected():
-                image_path = await self.image_gen_func(image_prompt)
-            else:
-                image_path = await self.image_gen_func(
-                    image_prompt, self.output_directory
+            created = False
+
+            async def create_image() -> str:
+                nonlocal created
+                created = True
+                return await self.get_image_path(image_prompt)
+
+            if IMAGE_ASSET_CACHE.is_enabled():
+                image_path = await IMAGE_ASSET_CACHE.get_or_create(
+                    self.get_cache_key(prompt), create_image, self.force_fresh
                 )
-            if image_path:
-                if image_path.startswith("http"):
-                    return image_path
-                elif os.path.exists(image_path):
-                    return ImageAsset(
-                        path=image_path,
-                        is_uploaded=False,
-                        extras={
-                            "prompt": prompt.prompt,
-                            "theme_prompt": prompt.theme_prompt,
-                        },
-                    )
-            raise Exception(f"Image not found at {image_path}")
+            else:
+                image_path = await create_image()
+
+            if image_path.startswith("http") or not created:
+                return image_path
+            return ImageAsset(
+                path=image_path,
+                is_uploaded=False,
+                extras={
+                    "prompt": prompt.prompt,
+                    "theme_prompt": prompt.theme_prompt,
+                },
+            )
 
         except Exception as e:
             print(f"Error generating image: {e}")
             return "/static/images/placeholder.jpg"
 
+    async def get_image_path(self, image_prompt: str) -> str:
+        if self.is_stock_provider_selected():
+            image_path = await self.image_gen_func(image_prompt)
+        else:
+            image_path = await self.image_gen_func(image_prompt, self.output_directory)
+        if image_path and (image_path.startswith("http") or os.path.exists(image_path)):
+            return image_path
+        raise Exception(f"Image not found at {image_path}")
+
     async def generate_image_openai(self, prompt: str, output_directory: str) -> str:
         client = AsyncOpenAI()
         result = await client.images.generate(
@@ -87,7 +121,7 @@ class ImageGenerationService:
             prompt=prompt,
             n=1,
             quality="standard",
-            size="1024x1024",
+            size=IMAGE_PROVIDER_SIZES["dall-e-3"],
         )
         image_url = result.data[0].url
         return await download_file(image_url, output_directory)
@@ -112,20 +146,23 @@ class ImageGenerationService:
         return image_path
 
     async def get_image_from_pexels(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://api.pexels.com/v1/search?query={prompt}&per_page=1",
-                headers={"Authorization": f"{get_pexels_api_key_env()}"},
-            )
-            data = await response.json()
-            image_url = data["photos"][0]["src"]["large"]
-            return image_url
+        data = await STOCK_IMAGE_CLIENTS["pexels"].get_json(
+            PEXELS_SEARCH_URL,
+            params={"query": prompt, "per_page": 1},
+            headers={"Authorization": f"{get_pexels_api_key_env()}"},
+        )
+        image_url = data["photos"][0]["src"]["large"]
+        return image_url
 
     async def get_image_from_pixabay(self, prompt: str) -> str:
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            response = await session.get(
-                f"https://pixabay.com/api/?key={get_pixabay_api_key_env()}&q={prompt}&image_type=photo&per_page=3"
-            )
-            data = await response.json()
-            image_url = data["hits"][0]["largeImageURL"]
-            return image_url
+        data = await STOCK_IMAGE_CLIENTS["pixabay"].get_json(
+            PIXABAY_SEARCH_URL,
+            params={
+                "key": get_pixabay_api_key_env(),
+                "q": prompt,
+                "image_type": "photo",
+                "per_page": 3,
+            },
+        )
+        image_url = data["hits"][0]["largeImageURL"]
+        return image_url
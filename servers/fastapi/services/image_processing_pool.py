@@ -0,0 +1,252 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from constants.images import (
+    DEFAULT_IMAGE_PROCESSING_WORKERS,
+    DEFAULT_PROCESSED_IMAGE_CACHE_MAX_SIZE,
+    PROCESSED_IMAGE_CACHE_MIN_AGE,
+)
+from utils.asset_directory_utils import get_processed_image_cache_directory
+from utils.get_env import (
+    get_image_processing_workers_env,
+    get_processed_image_cache_max_size_env,
+)
+from utils.image_utils import transform_picture_file
+
+CACHED_EXTENSIONS = (".png", ".jpg")
+
+
+def _warm_up_worker() -> int:
+    return os.getpid()
+
+
+def _get_file_hash(file_path: str) -> str:
+    file_hash = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+class ImageProcessingPool:
+    """
+    Applies picture transforms of PPTX exports in a pool of worker processes.
+    - All pictures of a deck are transformed in parallel before slides are assembled.
+    - Results are cached as PNG or JPEG files keyed by the source image contents
+    and transform params, least recently used ones are evicted over the size budget.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: Optional[int] = None):
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.evictions = 0
+
+    def get_max_workers(self) -> int:
+        try:
+            return max(
+                1,
+                int(
+                    get_image_processing_workers_env()
+                    or DEFAULT_IMAGE_PROCESSING_WORKERS
+                ),
+            )
+        except ValueError:
+            return DEFAULT_IMAGE_PROCESSING_WORKERS
+
+    @property
+    def cache_dir(self) -> str:
+        if self._cache_dir:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            return self._cache_dir
+        return get_processed_image_cache_directory()
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return int(
+            get_processed_image_cache_max_size_env()
+            or DEFAULT_PROCESSED_IMAGE_CACHE_MAX_SIZE
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Workers are spawned, forking a process with running threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.get_max_workers(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor):
+        # A worker died (e.g. out of memory), start a new pool for next requests
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_key(self, source_hash: str, params: dict) -> str:
+        canonical = json.dumps(
+            {"source": source_hash, "params": params},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _get_cached_paths(
+        self, pictures: List[Tuple[str, dict]]
+    ) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Returns the cache path without extension of each picture and the path
+        it is cached at, the cache path is None if the source can not be read.
+        """
+        cache_dir = self.cache_dir
+        source_hashes: Dict[str, Optional[str]] = {}
+        cached_paths = []
+        for source_path, params in pictures:
+            if source_path not in source_hashes:
+                try:
+                    source_hashes[source_path] = _get_file_hash(source_path)
+                except OSError:
+                    source_hashes[source_path] = None
+
+            source_hash = source_hashes[source_path]
+            if source_hash is None:
+                cached_paths.append((None, None))
+                continue
+
+            path = os.path.join(cache_dir, self.get_key(source_hash, params))
+            cached_path = None
+            for extension in CACHED_EXTENSIONS:
+                try:
+                    os.utime(f"{path}{extension}")
+                    cached_path = f"{path}{extension}"
+                    break
+                except FileNotFoundError:
+                    continue
+            cached_paths.append((path, cached_path))
+        return cached_paths
+
+    async def _transform(
+        self, source_path: str, output_path: str, params: dict
+    ) -> Optional[str]:
+        executor = self._get_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, transform_picture_file, source_path, output_path, params
+            )
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise
+
+    async def process_pictures(
+        self, pictures: List[Tuple[str, dict]]
+    ) -> List[Optional[str]]:
+        """
+        Transforms pictures given as (source path, transform params) and returns
+        paths of the transformed files, None for pictures that failed.
+        - Identical pictures are transformed once.
+        """
+        cached_paths = await asyncio.to_thread(self._get_cached_paths, pictures)
+
+        transforms = {}
+        for (source_path, params), (path, cached_path) in zip(pictures, cached_paths):
+            if cached_path:
+                self.hits += 1
+            elif path and path not in transforms:
+                self.misses += 1
+                transforms[path] = self._transform(source_path, path, params)
+
+        results = await asyncio.gather(*transforms.values(), return_exceptions=True)
+        transformed_paths = {}
+        for path, result in zip(transforms, results):
+            if isinstance(result, Exception):
+                print(f"Error processing image: {result}")
+                result = None
+            transformed_paths[path] = result
+
+        processed_paths = []
+        for path, cached_path in cached_paths:
+            processed_path = cached_path or transformed_paths.get(path)
+            if not processed_path:
+                self.failures += 1
+            processed_paths.append(processed_path)
+
+        if transforms:
+            try:
+                await asyncio.to_thread(self._evict)
+            except Exception as e:
+                print(f"Error evicting processed images: {e}")
+        return processed_paths
+
+    def _evict(self):
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith(CACHED_EXTENSIONS):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total_size += stat.st_size
+
+        min_mtime = time.time() - PROCESSED_IMAGE_CACHE_MIN_AGE
+        for mtime, size, path in sorted(entries):
+            if total_size <= self.max_size or mtime > min_mtime:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+            self.evictions += 1
+
+    def warm_up(self):
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_warm_up_worker) for _ in range(self.get_max_workers())
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise
+
+    def shutdown(self):
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "workers": self.get_max_workers(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "failures": self.failures,
+            "evictions": self.evictions,
+        }
+
+
+IMAGE_PROCESSING_POOL = ImageProcessingPool()
@@ -0,0 +1,103 @@
+import time
+from typing import Dict, Optional, Tuple
+
+from constants.presentation import DEFAULT_LAYOUT_CACHE_TTL
+from models.presentation_layout import PresentationLayoutModel
+from services.state_store import STATE_STORE, StateStore
+from utils.get_env import get_layout_cache_ttl_env
+
+LayoutVersion = Tuple[int, int]
+
+
+class LayoutCache:
+    """
+    In-process cache of layouts fetched from the renderer, by layout group name.
+    - Entries expire after LAYOUT_CACHE_TTL seconds, 0 disables the cache.
+    - Custom templates are invalidated when their layouts are saved. Invalidations
+    bump a version in the state store, so they reach every worker sharing it.
+    - Copies are returned, callers can modify them.
+    """
+
+    def __init__(
+        self, ttl: Optional[float] = None, state_store: StateStore = STATE_STORE
+    ):
+        self._ttl = ttl
+        self._state_store = state_store
+        self._entries: Dict[
+            str, Tuple[float, LayoutVersion, PresentationLayoutModel]
+        ] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def ttl(self) -> float:
+        if self._ttl is not None:
+            return self._ttl
+        try:
+            return float(get_layout_cache_ttl_env() or DEFAULT_LAYOUT_CACHE_TTL)
+        except ValueError:
+            return DEFAULT_LAYOUT_CACHE_TTL
+
+    def _get_version_key(self, name: Optional[str]) -> str:
+        if name is None:
+            return "layout_cache_version"
+        return f"layout_cache_version:{name}"
+
+    async def get_version(self, name: str) -> LayoutVersion:
+        """
+        Returns the version of the layout group, read before it is fetched and
+        passed to get and set.
+        """
+        if self.ttl <= 0:
+            return (0, 0)
+        all_version = await self._state_store.get(self._get_version_key(None))
+        version = await self._state_store.get(self._get_version_key(name))
+        return (all_version or 0, version or 0)
+
+    def get(
+        self, name: str, version: LayoutVersion
+    ) -> Optional[PresentationLayoutModel]:
+        entry = self._entries.get(name)
+        if entry and entry[0] > time.monotonic() and entry[1] == version:
+            self.hits += 1
+            return entry[2].model_copy(deep=True)
+        self._entries.pop(name, None)
+        self.misses += 1
+        return None
+
+    def set(self, name: str, layout: PresentationLayoutModel, version: LayoutVersion):
+        ttl = self.ttl
+        if ttl > 0:
+            self._entries[name] = (
+                time.monotonic() + ttl,
+                version,
+                layout.model_copy(deep=True),
+            )
+
+    async def invalidate(self, name: Optional[str] = None):
+        """
+        Drops the layout group, or every layout if no name is given, in every
+        worker sharing the state store.
+        """
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+        await self._state_store.increment(self._get_version_key(name))
+        self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "ttl": self.ttl,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+LAYOUT_CACHE = LayoutCache()
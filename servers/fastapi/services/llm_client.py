@@ -1,8 +1,9 @@
 import asyncio
 import json
-from typing import AsyncGenerator, List, Optional
+from typing import Any, AsyncGenerator, Callable, List, Optional
 from fastapi import HTTPException
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from openai.types.chat.chat_completion_chunk import (
     ChatCompletionChunk as OpenAIChatCompletionChunk,
 )
@@ -10,6 +11,7 @@ from google import genai
 from google.genai.types import Content as GoogleContent, Part as GoogleContentPart
 from google.genai.types import (
     GenerateContentConfig,
+    HttpOptions as GoogleHttpOptions,
     GoogleSearch,
     ToolConfig as GoogleToolConfig,
     FunctionCallingConfig as GoogleFunctionCallingConfig,
@@ -17,8 +19,15 @@ from google.genai.types import (
 )
 from google.genai.types import Tool as GoogleTool
 from anthropic import AsyncAnthropic
+from anthropic import DefaultAsyncHttpxClient as AnthropicDefaultAsyncHttpxClient
 from anthropic.types import Message as AnthropicMessage
 from anthropic import MessageStreamEvent as AnthropicMessageStreamEvent
+from constants.llm import (
+    LLM_HTTP_KEEPALIVE_EXPIRY,
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_HTTP_TIMEOUT,
+)
 from enums.llm_provider import LLMProvider
 from models.llm_message import (
     AnthropicAssistantMessage,
@@ -38,6 +47,7 @@ from models.llm_tool_call import (
     OpenAIToolCallFunction,
 )
 from models.llm_tools import LLMDynamicTool, LLMTool
+from services.llm_response_cache import LLM_RESPONSE_CACHE
 from services.llm_tool_calls_handler import LLMToolCallsHandler
 from utils.async_iterator import iterator_to_async
 from utils.dummy_functions import do_nothing_async
@@ -61,6 +71,97 @@ from utils.schema_utils import (
 )
 
 
+class LLMClientRegistry:
+    """
+    Process wide registry of LLM provider clients.
+    - Clients are keyed by provider, base url and api key and keep their
+    keep-alive connection pool between calls.
+    - Async clients are bound to the event loop they were created on,
+    so a client is recreated when used from a different event loop.
+    - Counts requests and newly opened connections to measure connection reuse.
+    """
+
+    def __init__(self):
+        self._clients: dict[tuple, tuple[Any, Optional[asyncio.AbstractEventLoop]]] = {}
+        self.clients_created = 0
+        self.clients_reused = 0
+        self.requests_sent = 0
+        self.connections_opened = 0
+
+    def get_client(self, key: tuple, create_client: Callable[[], Any]):
+        loop = self._get_running_loop()
+        entry = self._clients.get(key)
+        if entry and entry[1] is loop:
+            self.clients_reused += 1
+            return entry[0]
+
+        client = create_client()
+        self._clients[key] = (client, loop)
+        self.clients_created += 1
+        return client
+
+    def invalidate(self):
+        # Clients are not closed here as they might still be used by in-flight calls
+        self._clients.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "clients": len(self._clients),
+            "clients_created": self.clients_created,
+            "clients_reused": self.clients_reused,
+            "requests_sent": self.requests_sent,
+            "connections_opened": self.connections_opened,
+            "connections_reused": max(0, self.requests_sent - self.connections_opened),
+        }
+
+    def get_http_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_HTTP_KEEPALIVE_EXPIRY,
+        )
+
+    def get_async_http_client_args(self) -> dict:
+        return {
+            "limits": self.get_http_limits(),
+            "timeout": LLM_HTTP_TIMEOUT,
+            "event_hooks": {"request": [self._on_async_request]},
+        }
+
+    def get_sync_http_client_args(self) -> dict:
+        return {
+            "limits": self.get_http_limits(),
+            "event_hooks": {"request": [self._on_sync_request]},
+        }
+
+    def _get_running_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _on_connection_event(self, event_name: str):
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+
+    async def _on_async_request(self, request: httpx.Request):
+        self.requests_sent += 1
+
+        async def trace(event_name: str, _: dict):
+            self._on_connection_event(event_name)
+
+        request.extensions["trace"] = trace
+
+    def _on_sync_request(self, request: httpx.Request):
+        self.requests_sent += 1
+        request.extensions["trace"] = lambda event_name, _: self._on_connection_event(
+            event_name
+        )
+
+
+LLM_CLIENT_REGISTRY = LLMClientRegistry()
+
+
 class LLMClient:
     def __init__(self):
         self.llm_provider = get_llm_provider()
@@ -86,6 +187,32 @@ class LLMClient:
     def disable_thinking(self) -> bool:
         return parse_bool_or_none(get_disable_thinking_env()) or False
 
+    # ? Response cache
+    def _get_response_cache_key(
+        self,
+        call_type: str,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]],
+        max_tokens: Optional[int],
+    ) -> Optional[str]:
+        # Tool results (e.g. web search) are not stable, so these calls are never cached
+        if tools or not LLM_RESPONSE_CACHE.is_enabled():
+            return None
+        return LLM_RESPONSE_CACHE.get_key(
+            call_type,
+            self.llm_provider.value,
+            model,
+            messages,
+            response_format,
+            strict=strict,
+            max_tokens=max_tokens,
+            tool_calls=self.use_tool_calls_for_structured_output(),
+            disable_thinking=self.disable_thinking(),
+        )
+
     # ? Clients
     def _get_client(self):
         match self.llm_provider:
@@ -106,33 +233,52 @@ class LLMClient:
                 )
 
     def _get_openai_client(self):
-        if not get_openai_api_key_env():
+        api_key = get_openai_api_key_env()
+        if not api_key:
             raise HTTPException(
                 status_code=400,
                 detail="OpenAI API Key is not set",
             )
-        return AsyncOpenAI()
+        return self._get_openai_compatible_client(None, api_key)
 
     def _get_google_client(self):
-        if not get_google_api_key_env():
+        api_key = get_google_api_key_env()
+        if not api_key:
             raise HTTPException(
                 status_code=400,
                 detail="Google API Key is not set",
             )
-        return genai.Client()
+        return LLM_CLIENT_REGISTRY.get_client(
+            (self.llm_provider.value, None, api_key),
+            lambda: genai.Client(
+                api_key=api_key,
+                http_options=GoogleHttpOptions(
+                    client_args=LLM_CLIENT_REGISTRY.get_sync_http_client_args()
+                ),
+            ),
+        )
 
     def _get_anthropic_client(self):
-        if not get_anthropic_api_key_env():
+        api_key = get_anthropic_api_key_env()
+        if not api_key:
             raise HTTPException(
                 status_code=400,
                 detail="Anthropic API Key is not set",
             )
-        return AsyncAnthropic()
+        return LLM_CLIENT_REGISTRY.get_client(
+            (self.llm_provider.value, None, api_key),
+            lambda: AsyncAnthropic(
+                api_key=api_key,
+                http_client=AnthropicDefaultAsyncHttpxClient(
+                    **LLM_CLIENT_REGISTRY.get_async_http_client_args()
+                ),
+            ),
+        )
 
     def _get_ollama_client(self):
-        return AsyncOpenAI(
-            base_url=(get_ollama_url_env() or "http://localhost:11434") + "/v1",
-            api_key="ollama",
+        return self._get_openai_compatible_client(
+            (get_ollama_url_env() or "http://localhost:11434") + "/v1",
+            "ollama",
         )
 
     def _get_custom_client(self):
@@ -141,9 +287,21 @@ class LLMClient:
                 status_code=400,
                 detail="Custom LLM URL is not set",
             )
-        return AsyncOpenAI(
-            base_url=get_custom_llm_url_env(),
-            api_key=get_custom_llm_api_key_env() or "null",
+        return self._get_openai_compatible_client(
+            get_custom_llm_url_env(),
+            get_custom_llm_api_key_env() or "null",
+        )
+
+    def _get_openai_compatible_client(self, base_url: Optional[str], api_key: str):
+        return LLM_CLIENT_REGISTRY.get_client(
+            (self.llm_provider.value, base_url, api_key),
+            lambda: AsyncOpenAI(
+                base_url=base_url,
+                api_key=api_key,
+                http_client=DefaultAsyncHttpxClient(
+                    **LLM_CLIENT_REGISTRY.get_async_http_client_args()
+                ),
+            ),
         )
 
     # ? Prompts
@@ -774,6 +932,20 @@ class LLMClient:
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
         max_tokens: Optional[int] = None,
     ) -> dict:
+        cache_key = self._get_response_cache_key(
+            "generate_structured",
+            model,
+            messages,
+            response_format,
+            strict,
+            tools,
+            max_tokens,
+        )
+        if cache_key:
+            cached_content = await LLM_RESPONSE_CACHE.get(cache_key)
+            if cached_content is not None:
+                return cached_content
+
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
         content = None
@@ -824,6 +996,9 @@ class LLMClient:
                 status_code=400,
                 detail="LLM did not return any content",
             )
+
+        if cache_key:
+            await LLM_RESPONSE_CACHE.set(cache_key, content)
         return content
 
     # ? Stream Unstructured Content
@@ -1517,6 +1692,56 @@ class LLMClient:
         strict: bool = False,
         tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
         max_tokens: Optional[int] = None,
+    ):
+        cache_key = self._get_response_cache_key(
+            "stream_structured",
+            model,
+            messages,
+            response_format,
+            strict,
+            tools,
+            max_tokens,
+        )
+        if cache_key:
+            return self._stream_structured_with_cache(
+                cache_key,
+                model=model,
+                messages=messages,
+                response_format=response_format,
+                strict=strict,
+                max_tokens=max_tokens,
+            )
+        return self._stream_structured(
+            model=model,
+            messages=messages,
+            response_format=response_format,
+            strict=strict,
+            tools=tools,
+            max_tokens=max_tokens,
+        )
+
+    async def _stream_structured_with_cache(self, cache_key: str, **kwargs):
+        cached_content = await LLM_RESPONSE_CACHE.get(cache_key)
+        if cached_content is not None:
+            yield cached_content
+            return
+
+        content = ""
+        async for chunk in self._stream_structured(**kwargs):
+            content += chunk
+            yield chunk
+
+        if content:
+            await LLM_RESPONSE_CACHE.set(cache_key, content)
+
+    def _stream_structured(
+        self,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        strict: bool = False,
+        tools: Optional[List[type[LLMTool] | LLMDynamicTool]] = None,
+        max_tokens: Optional[int] = None,
     ):
         parsed_tools = self.tool_calls_handler.parse_tools(tools)
 
@@ -0,0 +1,242 @@
+import asyncio
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Any, Iterator, List, Optional
+
+from constants.llm import (
+    DEFAULT_LLM_RESPONSE_CACHE_MAX_SIZE,
+    DEFAULT_LLM_RESPONSE_CACHE_TTL,
+    LLM_CACHE_VOLATILE_PATTERNS,
+)
+from models.llm_message import LLMMessage
+from utils.get_env import (
+    get_app_data_directory_env,
+    get_llm_response_cache_env,
+    get_llm_response_cache_max_size_env,
+    get_llm_response_cache_ttl_env,
+)
+from utils.parsers import parse_bool_or_none
+
+
+class LLMResponseCache:
+    """
+    Opt-in, content addressed cache of structured LLM responses.
+    - Responses are keyed by a hash of call type, provider, model, normalized messages and schema.
+    - Entries are stored in SQLite under the app data directory.
+    - Expired entries are dropped and least recently used entries are evicted
+    once the cache is over its size budget.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl: Optional[int] = None,
+        max_size: Optional[int] = None,
+        volatile_patterns: Optional[List[str]] = None,
+    ):
+        self._db_path = db_path
+        self._ttl = ttl
+        self._max_size = max_size
+        self._volatile_patterns = [
+            re.compile(pattern)
+            for pattern in (volatile_patterns or LLM_CACHE_VOLATILE_PATTERNS)
+        ]
+        self._initialized_db_path = None
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def is_enabled(self) -> bool:
+        return parse_bool_or_none(get_llm_response_cache_env()) or False
+
+    @property
+    def db_path(self) -> str:
+        if self._db_path:
+            return self._db_path
+        return os.path.join(
+            get_app_data_directory_env() or "/tmp/presenton", "llm_response_cache.db"
+        )
+
+    @property
+    def ttl(self) -> int:
+        if self._ttl is not None:
+            return self._ttl
+        return int(get_llm_response_cache_ttl_env() or DEFAULT_LLM_RESPONSE_CACHE_TTL)
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return int(
+            get_llm_response_cache_max_size_env() or DEFAULT_LLM_RESPONSE_CACHE_MAX_SIZE
+        )
+
+    # ? Keys
+    def normalize_text(self, text: str) -> str:
+        for pattern in self._volatile_patterns:
+            text = pattern.sub("<volatile>", text)
+        return text
+
+    def _normalize_value(self, value: Any) -> Any:
+        if isinstance(value, str):
+            return self.normalize_text(value)
+        if isinstance(value, dict):
+            return {key: self._normalize_value(each) for key, each in value.items()}
+        if isinstance(value, list):
+            return [self._normalize_value(each) for each in value]
+        return value
+
+    def get_key(
+        self,
+        call_type: str,
+        provider: str,
+        model: str,
+        messages: List[LLMMessage],
+        response_format: dict,
+        **options,
+    ) -> str:
+        payload = {
+            "call_type": call_type,
+            "provider": provider,
+            "model": model,
+            "messages": [
+                {
+                    "type": message.__class__.__name__,
+                    **self._normalize_value(message.model_dump(mode="json")),
+                }
+                for message in messages
+            ],
+            "response_format": response_format,
+            "options": options,
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    # ? Storage
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        db_path = self.db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        connection = sqlite3.connect(db_path, timeout=30)
+        if self._initialized_db_path != db_path:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed_at REAL NOT NULL
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_accessed_at "
+                "ON llm_responses (last_accessed_at)"
+            )
+            connection.commit()
+            self._initialized_db_path = db_path
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get_sync(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row and now - row[1] <= self.ttl:
+                connection.execute(
+                    "UPDATE llm_responses SET last_accessed_at = ? WHERE key = ?",
+                    (now, key),
+                )
+                self.hits += 1
+                return json.loads(row[0])
+
+            if row:
+                connection.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self.evictions += 1
+        self.misses += 1
+        return None
+
+    def set_sync(self, key: str, value: Any):
+        encoded_value = json.dumps(value)
+        size = len(encoded_value.encode("utf-8"))
+        if size > self.max_size:
+            return
+
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, value, size, created_at, last_accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, encoded_value, size, now, now),
+            )
+            self.stores += 1
+            self._evict(connection, now)
+
+    def _evict(self, connection: sqlite3.Connection, now: float):
+        expired = connection.execute(
+            "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl,)
+        )
+        self.evictions += expired.rowcount
+
+        total_size = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM llm_responses"
+        ).fetchone()[0]
+        if total_size <= self.max_size:
+            return
+
+        rows = connection.execute(
+            "SELECT key, size FROM llm_responses ORDER BY last_accessed_at ASC"
+        ).fetchall()
+        keys_to_evict = []
+        for key, size in rows:
+            if total_size <= self.max_size:
+                break
+            keys_to_evict.append((key,))
+            total_size -= size
+
+        connection.executemany("DELETE FROM llm_responses WHERE key = ?", keys_to_evict)
+        self.evictions += len(keys_to_evict)
+
+    def clear_sync(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM llm_responses")
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            return await asyncio.to_thread(self.get_sync, key)
+        except Exception as e:
+            print(f"Error reading LLM response cache: {e}")
+            return None
+
+    async def set(self, key: str, value: Any):
+        try:
+            await asyncio.to_thread(self.set_sync, key, value)
+        except Exception as e:
+            print(f"Error writing LLM response cache: {e}")
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.is_enabled(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+LLM_RESPONSE_CACHE = LLMResponseCache()
@@ -1,25 +1,27 @@
+import io
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from lxml import etree
 from services.html_to_text_runs_service import (
     parse_html_text_to_text_runs as parse_inline_html_to_runs,
 )
 
 from pptx import Presentation
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn
 from pptx.shapes.autoshape import Shape
 from pptx.slide import Slide
 from pptx.text.text import _Paragraph, TextFrame, Font, _Run
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 from lxml.etree import fromstring, tostring
-from PIL import Image
 from pptx.oxml.xmlchemy import OxmlElement
 
 from pptx.util import Pt
 from pptx.dml.color import RGBColor
 
+from constants.images import MAX_PPTX_IMAGE_DPI
 from models.pptx_models import (
     PptxAutoShapeBoxModel,
-    PptxBoxShapeEnum,
     PptxConnectorModel,
     PptxFillModel,
     PptxFontModel,
@@ -34,28 +36,55 @@ from models.pptx_models import (
     PptxTextBoxModel,
     PptxTextRunModel,
 )
+from models.pptx_image_report import PptxImageReport
+from models.pptx_slide_fragment import PptxSlideFragment
+from services.image_processing_pool import IMAGE_PROCESSING_POOL
+from services.pptx_slide_cache import PPTX_SLIDE_CACHE
 from utils.download_helpers import download_files
-from utils.image_utils import (
-    clip_image,
-    create_circle_image,
-    fit_image,
-    invert_image,
-    round_image_corners,
-    set_image_opacity,
-)
+from utils.get_env import get_pptx_image_dpi_env
+from utils.image_utils import get_picture_transform_params, transform_picture_file
 import uuid
 
 BLANK_SLIDE_LAYOUT = 6
 
+# Relationships of a slide restored from its fragment, besides its images
+SLIDE_FRAGMENT_RELATIONSHIPS = (RT.SLIDE_LAYOUT, RT.NOTES_SLIDE)
+
+
+def get_pptx_image_dpi() -> Optional[int]:
+    try:
+        image_dpi = int(get_pptx_image_dpi_env() or 0)
+    except ValueError:
+        return None
+    if 0 < image_dpi <= MAX_PPTX_IMAGE_DPI:
+        return image_dpi
+    return None
+
 
 class PptxPresentationCreator:
 
-    def __init__(self, ppt_model: PptxPresentationModel, temp_dir: str):
+    def __init__(
+        self,
+        ppt_model: PptxPresentationModel,
+        temp_dir: str,
+        image_dpi: Optional[int] = None,
+    ):
         self._temp_dir = temp_dir
+        # Pictures are resampled to their box size at this resolution, if set
+        self._image_dpi = image_dpi if image_dpi is not None else get_pptx_image_dpi()
+        self.image_report: Optional[PptxImageReport] = None
 
         self._ppt_model = ppt_model
         self._slide_models = ppt_model.slides
 
+        # Transformed pictures of the deck, by id of their picture model
+        self._processed_image_paths: Dict[int, Optional[str]] = {}
+
+        # Slides restored from the slide cache and keys of the slides to build,
+        # by index of their slide model
+        self._slide_fragments: Dict[int, PptxSlideFragment] = {}
+        self._slide_keys: Dict[int, str] = {}
+
         self._ppt = Presentation()
         self._ppt.slide_width = Pt(1280)
         self._ppt.slide_height = Pt(720)
@@ -86,7 +115,7 @@ class PptxPresentationCreator:
                         image_urls.append(image_path)
                         models_with_network_asset.append(each_shape)
 
-        for each_slide in self._slide_models:
+        for each_slide in self.get_slide_models_to_build():
             for each_shape in each_slide.shapes:
                 if isinstance(each_shape, PptxPictureBoxModel):
                     image_path = each_shape.picture.path
@@ -111,15 +140,121 @@ class PptxPresentationCreator:
                     each_shape.picture.path = each_image_path
                     each_shape.picture.is_network = False
 
+    def get_picture_models(
+        self, slide_models: Optional[List[PptxSlideModel]] = None
+    ) -> List[PptxPictureBoxModel]:
+        shapes = list(self._ppt_model.shapes or [])
+        for slide_model in self._slide_models if slide_models is None else slide_models:
+            shapes.extend(slide_model.shapes)
+        return [shape for shape in shapes if isinstance(shape, PptxPictureBoxModel)]
+
+    def get_slide_models_to_build(self) -> List[PptxSlideModel]:
+        return [
+            slide_model
+            for index, slide_model in enumerate(self._slide_models)
+            if index not in self._slide_fragments
+        ]
+
+    async def load_slide_fragments(self):
+        """
+        Looks up built slides in the slide cache, their pictures are neither
+        downloaded nor transformed again.
+        """
+        if not PPTX_SLIDE_CACHE.is_enabled():
+            return
+
+        keys, fragments = await PPTX_SLIDE_CACHE.get_fragments(
+            self._slide_models, image_dpi=self._image_dpi
+        )
+        for index, (key, fragment) in enumerate(zip(keys, fragments)):
+            if fragment:
+                self._slide_fragments[index] = fragment
+            else:
+                self._slide_keys[index] = key
+
+    async def process_pictures(self):
+        pictures = []
+        picture_models = []
+        for picture_model in self.get_picture_models(self.get_slide_models_to_build()):
+            params = get_picture_transform_params(picture_model, self._image_dpi)
+            if params:
+                pictures.append((picture_model.picture.path, params))
+                picture_models.append(picture_model)
+
+        if pictures:
+            processed_image_paths = await IMAGE_PROCESSING_POOL.process_pictures(
+                pictures
+            )
+            for picture_model, processed_image_path in zip(
+                picture_models, processed_image_paths
+            ):
+                self._processed_image_paths[id(picture_model)] = processed_image_path
+
     async def create_ppt(self):
+        await self.load_slide_fragments()
         await self.fetch_network_assets()
+        await self.process_pictures()
+
+        new_fragments: List[Tuple[str, PptxSlideFragment]] = []
+        for index, slide_model in enumerate(self._slide_models):
+            if index in self._slide_fragments:
+                self.add_slide_from_fragment(slide_model, self._slide_fragments[index])
+                continue
 
-        for slide_model in self._slide_models:
             # Adding global shapes to slide
             if self._ppt_model.shapes:
                 slide_model.shapes.append(self._ppt_model.shapes)
 
-            self.add_and_populate_slide(slide_model)
+            slide = self.add_and_populate_slide(slide_model)
+            if index in self._slide_keys:
+                fragment = self.get_slide_fragment(slide_model, slide)
+                if fragment:
+                    new_fragments.append((self._slide_keys[index], fragment))
+
+        if new_fragments:
+            await PPTX_SLIDE_CACHE.set_fragments(new_fragments)
+
+        self.image_report = self.get_image_report()
+        if self.image_report.images:
+            print(
+                f"Embedded {self.image_report.embedded_images} images of "
+                f"{self.image_report.images} pictures in "
+                f"{self.image_report.embedded_bytes} bytes, "
+                f"{self.image_report.bytes_saved} bytes saved"
+            )
+
+    def get_image_report(self) -> PptxImageReport:
+        """
+        Compares sizes of the source images of pictures with images embedded in
+        the PPTX, identical images are embedded once. Slides restored from the
+        slide cache are left out.
+        """
+        source_paths = set()
+        for picture_model in self.get_picture_models(self.get_slide_models_to_build()):
+            if not picture_model.picture.path.startswith("http"):
+                source_paths.add(picture_model.picture.path)
+        source_bytes = 0
+        for source_path in source_paths:
+            try:
+                source_bytes += os.path.getsize(source_path)
+            except OSError:
+                continue
+
+        # Image parts are shared by slides, keyed by their partname
+        image_parts = {}
+        for index, slide in enumerate(self._ppt.slides):
+            if index in self._slide_fragments:
+                continue
+            for relationship in slide.part.rels.values():
+                if relationship.reltype == RT.IMAGE:
+                    part = relationship.target_part
+                    image_parts[part.partname] = part
+        return PptxImageReport(
+            images=len(source_paths),
+            embedded_images=len(image_parts),
+            source_bytes=source_bytes,
+            embedded_bytes=sum(len(part.blob) for part in image_parts.values()),
+        )
 
     def set_presentation_theme(self):
         slide_master = self._ppt.slide_master
@@ -141,7 +276,59 @@ class PptxPresentationCreator:
 
         theme_part._blob = tostring(theme)
 
-    def add_and_populate_slide(self, slide_model: PptxSlideModel):
+    def get_slide_fragment(
+        self, slide_model: PptxSlideModel, slide: Slide
+    ) -> Optional[PptxSlideFragment]:
+        """
+        Returns the fragment of a built slide, None if it can not be restored
+        as built, e.g. if some of its pictures failed to load.
+        """
+        pictures = [
+            shape
+            for shape in slide_model.shapes
+            if isinstance(shape, PptxPictureBoxModel)
+        ]
+        if len(slide.shapes._spTree.xpath("p:pic")) != len(pictures):
+            return None
+
+        images = {}
+        for rId, relationship in slide.part.rels.items():
+            if relationship.reltype == RT.IMAGE:
+                images[rId] = relationship.target_part.blob
+            elif relationship.reltype not in SLIDE_FRAGMENT_RELATIONSHIPS:
+                return None
+        return PptxSlideFragment(xml=tostring(slide._element.cSld), images=images)
+
+    def add_slide_from_fragment(
+        self, slide_model: PptxSlideModel, fragment: PptxSlideFragment
+    ) -> Slide:
+        slide = self._ppt.slides.add_slide(self._ppt.slide_layouts[BLANK_SLIDE_LAYOUT])
+
+        if slide_model.note:
+            slide.notes_slide.notes_text_frame.text = slide_model.note
+
+        # Images get new relationship ids on this slide, identical images are
+        # still embedded once in the deck
+        image_rIds = {}
+        for rId, blob in fragment.images.items():
+            _, image_rIds[rId] = slide.part.get_or_add_image_part(io.BytesIO(blob))
+
+        c_sld = parse_xml(fragment.xml)
+        for element in c_sld.iter():
+            for attribute in (qn("r:embed"), qn("r:link")):
+                rId = element.get(attribute)
+                if rId in image_rIds:
+                    element.set(attribute, image_rIds[rId])
+        # Shapes are moved into the slide's own shape tree, slide.shapes wraps it
+        sp_tree = slide.shapes._spTree
+        for child in list(c_sld):
+            if child.tag == qn("p:spTree"):
+                sp_tree[:] = list(child)
+            else:
+                sp_tree.addprevious(child)
+        return slide
+
+    def add_and_populate_slide(self, slide_model: PptxSlideModel) -> Slide:
         slide = self._ppt.slides.add_slide(self._ppt.slide_layouts[BLANK_SLIDE_LAYOUT])
 
         if slide_model.background:
@@ -165,6 +352,8 @@ class PptxPresentationCreator:
             elif model_type is PptxConnectorModel:
                 self.add_connector(slide, shape_model)
 
+        return slide
+
     def add_connector(self, slide: Slide, connector_model: PptxConnectorModel):
         if connector_model.thickness == 0:
             return
@@ -177,47 +366,19 @@ class PptxPresentationCreator:
 
     def add_picture(self, slide: Slide, picture_model: PptxPictureBoxModel):
         image_path = picture_model.picture.path
-        if (
-            picture_model.clip
-            or picture_model.border_radius
-            or picture_model.invert
-            or picture_model.opacity
-            or picture_model.object_fit
-            or picture_model.shape
-        ):
-            try:
-                image = Image.open(image_path)
-            except:
-                print(f"Could not open image: {image_path}")
-                return
-
-            image = image.convert("RGBA")
-            # ? Applying border radius twice to support both clip and object fit
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.object_fit:
-                image = fit_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
-                    picture_model.object_fit,
-                )
-            elif picture_model.clip:
-                image = clip_image(
-                    image,
-                    picture_model.position.width,
-                    picture_model.position.height,
+        params = get_picture_transform_params(picture_model, self._image_dpi)
+        if params:
+            image_path = self._processed_image_paths.get(id(picture_model))
+            # Transformed here when the pool failed, e.g. a worker ran out of memory
+            if not image_path:
+                image_path = transform_picture_file(
+                    picture_model.picture.path,
+                    os.path.join(self._temp_dir, str(uuid.uuid4())),
+                    params,
                 )
-            if picture_model.border_radius:
-                image = round_image_corners(image, picture_model.border_radius)
-            if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                image = create_circle_image(image)
-            if picture_model.invert:
-                image = invert_image(image)
-            if picture_model.opacity:
-                image = set_image_opacity(image, picture_model.opacity)
-            image_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
-            image.save(image_path)
+            # Source image can not be opened
+            if not image_path:
+                return
 
         margined_position = self.get_margined_position(
             picture_model.position, picture_model.margin
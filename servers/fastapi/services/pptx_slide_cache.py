@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+from typing import List, Optional, Tuple
+import uuid
+
+from constants.images import DEFAULT_PPTX_SLIDE_CACHE_MAX_SIZE
+from models.pptx_models import PptxPictureBoxModel, PptxSlideModel
+from models.pptx_slide_fragment import PptxSlideFragment
+from utils.asset_directory_utils import get_pptx_slide_cache_directory
+from utils.get_env import get_pptx_slide_cache_max_size_env
+
+
+class PptxSlideCache:
+    """
+    Persistent cache of built PPTX slides keyed by slide contents.
+    - Keys are the SHA-256 of the slide model, the size and modification time of
+    its local pictures and the export options.
+    - Each entry stores the slide XML and its embedded images in its own directory,
+    so exporting a deck again only builds the slides that changed.
+    - Least recently used entries are evicted once the cache is over its size budget.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: Optional[int] = None):
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @property
+    def cache_dir(self) -> str:
+        if self._cache_dir:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            return self._cache_dir
+        return get_pptx_slide_cache_directory()
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is not None:
+            return self._max_size
+        return int(
+            get_pptx_slide_cache_max_size_env() or DEFAULT_PPTX_SLIDE_CACHE_MAX_SIZE
+        )
+
+    def is_enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get_key(self, slide_model: PptxSlideModel, **options) -> str:
+        pictures = []
+        for shape in slide_model.shapes:
+            if isinstance(shape, PptxPictureBoxModel):
+                try:
+                    stat = os.stat(shape.picture.path)
+                    pictures.append([stat.st_size, stat.st_mtime])
+                except (OSError, ValueError):
+                    # Network pictures are keyed by their url
+                    pictures.append(None)
+
+        canonical = json.dumps(
+            {
+                "slide": slide_model.model_dump(mode="json"),
+                "pictures": pictures,
+                "options": options,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get_sync(self, key: str) -> Optional[PptxSlideFragment]:
+        entry_dir = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry_dir, "slide.xml"), "rb") as f:
+                xml = f.read()
+            with open(os.path.join(entry_dir, "images.json"), "r") as f:
+                image_ids = json.load(f)
+
+            # Images are read in memory so evicting the entry never breaks an export
+            images = {}
+            for image_id in image_ids:
+                with open(os.path.join(entry_dir, "images", image_id), "rb") as f:
+                    images[image_id] = f.read()
+
+            os.utime(entry_dir)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return PptxSlideFragment(xml=xml, images=images)
+
+    def set_sync(self, key: str, fragment: PptxSlideFragment):
+        cache_dir = self.cache_dir
+        entry_dir = os.path.join(cache_dir, key)
+        if os.path.exists(entry_dir):
+            return
+
+        # Entry is written to a temporary directory and renamed, so other
+        # workers never read a partially written entry
+        temp_entry_dir = os.path.join(cache_dir, f".{key}.{uuid.uuid4()}")
+        os.makedirs(os.path.join(temp_entry_dir, "images"))
+        try:
+            with open(os.path.join(temp_entry_dir, "slide.xml"), "wb") as f:
+                f.write(fragment.xml)
+            for image_id, blob in fragment.images.items():
+                with open(os.path.join(temp_entry_dir, "images", image_id), "wb") as f:
+                    f.write(blob)
+            with open(os.path.join(temp_entry_dir, "images.json"), "w") as f:
+                json.dump(list(fragment.images), f)
+
+            os.rename(temp_entry_dir, entry_dir)
+            self.stores += 1
+        except OSError:
+            # Entry was stored by another worker in the meantime
+            shutil.rmtree(temp_entry_dir, ignore_errors=True)
+
+    def _get_entry_size(self, entry_dir: str) -> int:
+        size = 0
+        for root, _, files in os.walk(entry_dir):
+            for name in files:
+                size += os.path.getsize(os.path.join(root, name))
+        return size
+
+    def _evict(self):
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            try:
+                size = self._get_entry_size(entry.path)
+                entries.append((entry.stat().st_mtime, size, entry.path))
+            except FileNotFoundError:
+                continue
+            total_size += size
+
+        for _, size, entry_dir in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+            self.evictions += 1
+
+    def get_fragments_sync(
+        self, slide_models: List[PptxSlideModel], **options
+    ) -> Tuple[List[str], List[Optional[PptxSlideFragment]]]:
+        keys = [self.get_key(slide_model, **options) for slide_model in slide_models]
+        return keys, [self.get_sync(key) for key in keys]
+
+    def set_fragments_sync(self, fragments: List[Tuple[str, PptxSlideFragment]]):
+        for key, fragment in fragments:
+            self.set_sync(key, fragment)
+        self._evict()
+
+    async def get_fragments(
+        self, slide_models: List[PptxSlideModel], **options
+    ) -> Tuple[List[str], List[Optional[PptxSlideFragment]]]:
+        """
+        Returns the key of each slide model and its cached fragment, if any.
+        """
+        try:
+            return await asyncio.to_thread(
+                self.get_fragments_sync, slide_models, **options
+            )
+        except Exception as e:
+            print(f"Error reading PPTX slide cache: {e}")
+            return [], []
+
+    async def set_fragments(self, fragments: List[Tuple[str, PptxSlideFragment]]):
+        try:
+            await asyncio.to_thread(self.set_fragments_sync, fragments)
+        except Exception as e:
+            print(f"Error writing PPTX slide cache: {e}")
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.is_enabled(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+PPTX_SLIDE_CACHE = PptxSlideCache()
@@ -0,0 +1,224 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+import uuid
+
+import aiohttp
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from constants.presentation import (
+    DEFAULT_MAX_CONCURRENT_GENERATIONS,
+    GENERATION_JOB_CLAIM_TTL,
+)
+from models.generate_presentation_request import GeneratePresentationRequest
+from models.presentation_and_path import PresentationPathAndEditPath
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
+from models.sql.slide import SlideModel
+from services.database import async_session_maker
+from services.state_store import STATE_STORE
+from utils.get_env import get_max_concurrent_generations_env
+
+GenerationProgressCallback = Callable[[str, int], Awaitable[None]]
+GenerationHandler = Callable[
+    [
+        GeneratePresentationRequest,
+        uuid.UUID,
+        AsyncSession,
+        Optional[GenerationProgressCallback],
+    ],
+    Awaitable[PresentationPathAndEditPath],
+]
+
+
+class PresentationGenerationJobService:
+    """
+    Runs presentation generation jobs on an in-process worker pool.
+    - Jobs are persisted, so unfinished jobs are resumed when the server restarts.
+    - A job is claimed in the state store before it runs, so only one worker runs it.
+    Claims hold a token of the worker, a worker only refreshes or releases its own.
+    - Resumed jobs wait for the claim of a stopped worker to expire.
+    - At most MAX_CONCURRENT_GENERATIONS jobs are generated at once by each worker.
+    - Finished jobs are posted to their webhook url, if provided.
+    """
+
+    def __init__(self):
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: dict[uuid.UUID, asyncio.Task] = {}
+
+    def get_max_concurrent_generations(self) -> int:
+        try:
+            return max(
+                1,
+                int(
+                    get_max_concurrent_generations_env()
+                    or DEFAULT_MAX_CONCURRENT_GENERATIONS
+                ),
+            )
+        except ValueError:
+            return DEFAULT_MAX_CONCURRENT_GENERATIONS
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if not self._semaphore:
+            self._semaphore = asyncio.Semaphore(self.get_max_concurrent_generations())
+        return self._semaphore
+
+    def submit(
+        self,
+        job_id: uuid.UUID,
+        handler: GenerationHandler,
+        wait_for_claim: bool = False,
+    ):
+        if job_id in self._tasks:
+            return
+        task = asyncio.create_task(self._run_job(job_id, handler, wait_for_claim))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def resume(self, handler: GenerationHandler):
+        async with async_session_maker() as session:
+            job_ids = await session.scalars(
+                select(PresentationGenerationJobModel.id).where(
+                    PresentationGenerationJobModel.status.in_(["pending", "running"])
+                )
+            )
+            job_ids = list(job_ids)
+
+        if job_ids:
+            print(f"Resuming {len(job_ids)} presentation generation job(s)")
+        for job_id in job_ids:
+            # A worker that stopped while running the job keeps its claim until
+            # it expires, the job is run then unless another worker finishes it
+            self.submit(job_id, handler, wait_for_claim=True)
+
+    def _get_claim_key(self, job_id: uuid.UUID) -> str:
+        return f"presentation_generation_job:{job_id}"
+
+    async def _keep_claim(self, job_id: uuid.UUID, claim_token: str):
+        while True:
+            await asyncio.sleep(GENERATION_JOB_CLAIM_TTL / 3)
+            if not await STATE_STORE.expire_if_equals(
+                self._get_claim_key(job_id), claim_token, GENERATION_JOB_CLAIM_TTL
+            ):
+                print(
+                    f"Presentation generation job {job_id} was claimed by another worker"
+                )
+                return
+
+    async def _is_job_finished(self, job_id: uuid.UUID) -> bool:
+        async with async_session_maker() as session:
+            job = await session.get(PresentationGenerationJobModel, job_id)
+            return not job or job.is_finished()
+
+    async def _claim_job(self, job_id: uuid.UUID, wait: bool) -> Optional[str]:
+        """
+        Returns the token the job was claimed with, None if another worker has it.
+        """
+        claim_key = self._get_claim_key(job_id)
+        claim_token = str(uuid.uuid4())
+        while not await STATE_STORE.set_if_not_exists(
+            claim_key, claim_token, GENERATION_JOB_CLAIM_TTL
+        ):
+            # Another worker is already running or waiting to run this job
+            if not wait or await self._is_job_finished(job_id):
+                return None
+            await asyncio.sleep(GENERATION_JOB_CLAIM_TTL / 3)
+        return claim_token
+
+    async def _run_job(
+        self,
+        job_id: uuid.UUID,
+        handler: GenerationHandler,
+        wait_for_claim: bool = False,
+    ):
+        claim_token = await self._claim_job(job_id, wait_for_claim)
+        if not claim_token:
+            return
+
+        keep_claim_task = asyncio.create_task(self._keep_claim(job_id, claim_token))
+        try:
+            await self._run_claimed_job(job_id, handler)
+        finally:
+            keep_claim_task.cancel()
+            # The claim may have lapsed and been taken over by another worker
+            await STATE_STORE.delete_if_equals(self._get_claim_key(job_id), claim_token)
+
+    async def _run_claimed_job(self, job_id: uuid.UUID, handler: GenerationHandler):
+        async with self._get_semaphore():
+            async with async_session_maker() as job_session:
+                job = await job_session.get(PresentationGenerationJobModel, job_id)
+                if not job or job.is_finished():
+                    return
+
+                # Job was interrupted by a restart, remove its partial presentation
+                if job.status == "running":
+                    await self._delete_presentation(job_session, job.presentation)
+
+                job.status = "running"
+                job.stage = "Starting"
+                job.progress = 0
+                await job_session.commit()
+
+                progress_lock = asyncio.Lock()
+
+                async def on_progress(stage: str, progress: int):
+                    async with progress_lock:
+                        if job.stage == stage and job.progress == progress:
+                            return
+                        job.stage = stage
+                        job.progress = progress
+                        await job_session.commit()
+
+                try:
+                    async with async_session_maker() as sql_session:
+                        result = await handler(
+                            GeneratePresentationRequest(**job.request),
+                            job.presentation,
+                            sql_session,
+                            on_progress,
+                        )
+                    job.status = "completed"
+                    job.stage = "Completed"
+                    job.progress = 100
+                    job.result = result.model_dump(mode="json")
+                except Exception as e:
+                    print(f"Presentation generation job {job_id} failed: {e}")
+                    job.status = "failed"
+                    job.error = e.detail if isinstance(e, HTTPException) else str(e)
+
+                async with progress_lock:
+                    await job_session.commit()
+
+                if job.webhook_url:
+                    await self._notify_webhook(job)
+
+    async def _delete_presentation(
+        self, session: AsyncSession, presentation_id: uuid.UUID
+    ):
+        await session.execute(
+            delete(SlideModel).where(SlideModel.presentation == presentation_id)
+        )
+        await session.execute(
+            delete(PresentationModel).where(PresentationModel.id == presentation_id)
+        )
+        await session.commit()
+
+    async def _notify_webhook(self, job: PresentationGenerationJobModel):
+        try:
+            async with aiohttp.ClientSession(
+                trust_env=True, timeout=aiohttp.ClientTimeout(total=30)
+            ) as session:
+                async with session.post(
+                    job.webhook_url, json=job.model_dump(mode="json")
+                ) as response:
+                    if response.status >= 400:
+                        print(
+                            f"Webhook {job.webhook_url} responded with status {response.status}"
+                        )
+        except Exception as e:
+            print(f"Error notifying webhook {job.webhook_url}: {e}")
+
+
+PRESENTATION_GENERATION_JOB_SERVICE = PresentationGenerationJobService()
@@ -0,0 +1,74 @@
+import asyncio
+from typing import Optional
+
+import aiohttp
+
+from constants.presentation import (
+    RENDERER_KEEPALIVE_TIMEOUT,
+    RENDERER_MAX_CONNECTIONS,
+    RENDERER_URL,
+)
+
+
+class RendererClient:
+    """
+    Shared HTTP client of the internal API of the Next.js app.
+    - One keep-alive session per event loop, so exports and layout lookups
+    reuse connections instead of opening a session per call.
+    """
+
+    def __init__(
+        self,
+        base_url: str = RENDERER_URL,
+        max_connections: int = RENDERER_MAX_CONNECTIONS,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.sessions_created = 0
+        self.requests_sent = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # Session of another event loop is dropped, it can not be closed from here
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    keepalive_timeout=RENDERER_KEEPALIVE_TIMEOUT,
+                ),
+            )
+            self._loop = loop
+            self.sessions_created += 1
+        return self._session
+
+    def request(self, method: str, path: str, **kwargs):
+        """
+        Sends a request to path of the renderer, used as an async context manager
+        like aiohttp.ClientSession.request.
+        """
+        self.requests_sent += 1
+        return self._get_session().request(method, f"{self.base_url}{path}", **kwargs)
+
+    def get(self, path: str, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_stats(self) -> dict:
+        return {
+            "sessions_created": self.sessions_created,
+            "requests_sent": self.requests_sent,
+        }
+
+
+RENDERER_CLIENT = RendererClient()
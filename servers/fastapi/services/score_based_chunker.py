@@ -1,21 +1,47 @@
 import asyncio
-from typing import List
+from collections import deque
+import re
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 
 from models.document_chunk import DocumentChunk
 
+# Markdown lines starting with "#", ignoring leading whitespace
+HEADING_LINE_PATTERN = re.compile(r"^[^\S\n]*#.*$", re.MULTILINE)
+
+
+class HeadingIndex:
+    """
+    Headings of a markdown text found in a single scan.
+    - starts and ends are offsets of each heading line in the text, content of
+    a heading starts where its line ends.
+    """
+
+    def __init__(self, text: str = ""):
+        self.headings: List[str] = []
+        self.levels: List[int] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.add(text)
+
+    def add(self, text: str, offset: int = 0):
+        for match in HEADING_LINE_PATTERN.finditer(text):
+            heading = match.group().strip()
+            self.headings.append(heading)
+            self.levels.append(len(heading) - len(heading.lstrip("#")))
+            self.starts.append(offset + match.start())
+            self.ends.append(offset + match.end())
+
+    def extend(self, other: "HeadingIndex", offset: int):
+        self.headings.extend(other.headings)
+        self.levels.extend(other.levels)
+        self.starts.extend(start + offset for start in other.starts)
+        self.ends.extend(end + offset for end in other.ends)
+
 
 class ScoreBasedChunker:
 
     def extract_headings(self, text: str) -> List[str]:
-        lines = text.split("\n")
-        headings = []
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith("#"):
-                headings.append(line)
-        
-        return headings
+        return HeadingIndex(text).headings
 
     def score_headings(self, headings: List[str]) -> List[float]:
         heading_scores = []
@@ -24,9 +50,9 @@ class ScoreBasedChunker:
 
         for i, heading in enumerate(headings):
             score = 0.0
-            
+
             heading_level = len(heading) - len(heading.lstrip("#"))
-            
+
             if heading_level <= 3:
                 score += 10.0 - (heading_level - 1) * 2.0
             else:
@@ -52,11 +78,70 @@ class ScoreBasedChunker:
         headings: List[str],
         heading_scores: List[float],
         top_k: int = 10,
+        heading_index: Optional[HeadingIndex] = None,
     ) -> List[DocumentChunk]:
+        return list(
+            self.iter_chunks_from_headings(
+                text, headings, heading_scores, top_k, heading_index
+            )
+        )
+
+    def iter_chunks_from_headings(
+        self,
+        text: str,
+        headings: List[str],
+        heading_scores: List[float],
+        top_k: int = 10,
+        heading_index: Optional[HeadingIndex] = None,
+    ) -> Iterator[DocumentChunk]:
+        """
+        Yields the top_k chunks of the text in document order.
+        - Content of each chunk is sliced from the text only when it is yielded.
+        """
         if not heading_scores:
             heading_scores = self.score_headings(headings)
 
-        chunks = []
+        selected_indices = self.select_heading_indices(heading_scores, top_k)
+        if not selected_indices:
+            return
+
+        heading_index = heading_index or HeadingIndex(text)
+
+        # Each heading line of the text belongs to the first heading with the
+        # same text that has no line yet
+        unplaced_indices: Dict[str, deque] = {}
+        for heading_idx, heading in enumerate(headings):
+            unplaced_indices.setdefault(heading, deque()).append(heading_idx)
+
+        heading_positions = {}
+        for position, heading in enumerate(heading_index.headings):
+            indices = unplaced_indices.get(heading)
+            if indices:
+                heading_positions[indices.popleft()] = position
+
+        for i, heading_idx in enumerate(selected_indices):
+            if heading_idx not in heading_positions:
+                continue
+
+            content_start = heading_index.ends[heading_positions[heading_idx]]
+            content_end = len(text)
+            if i + 1 < len(selected_indices):
+                next_heading_idx = selected_indices[i + 1]
+                if next_heading_idx in heading_positions:
+                    content_end = heading_index.starts[
+                        heading_positions[next_heading_idx]
+                    ]
+
+            yield DocumentChunk(
+                heading=headings[heading_idx],
+                content=text[content_start:content_end].strip(),
+                heading_index=heading_idx,
+                score=heading_scores[heading_idx],
+            )
+
+    def select_heading_indices(
+        self, heading_scores: List[float], top_k: int
+    ) -> List[int]:
         heading_indices = []
 
         for i, score in enumerate(heading_scores):
@@ -64,7 +149,7 @@ class ScoreBasedChunker:
                 heading_indices.append((i, score))
 
         if len(heading_indices) == 0:
-            return chunks
+            return []
 
         heading_indices.sort(key=lambda x: (-x[1], x[0]))
 
@@ -111,52 +196,44 @@ class ScoreBasedChunker:
 
             selected_indices.sort()
 
-        lines = text.split("\n")
-        heading_positions = {}
-        
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            if line_stripped.startswith("#"):
-                for heading_idx, heading in enumerate(headings):
-                    if heading == line_stripped and heading_idx not in heading_positions:
-                        heading_positions[heading_idx] = i
-                        break
-        
-        for i, heading_idx in enumerate(selected_indices):
-            if heading_idx not in heading_positions:
-                continue
-                
-            heading = headings[heading_idx]
-            heading_line_idx = heading_positions[heading_idx]
-            
-            if i + 1 < len(selected_indices):
-                next_heading_idx = selected_indices[i + 1]
-                if next_heading_idx in heading_positions:
-                    next_heading_line_idx = heading_positions[next_heading_idx]
-                    content_end = next_heading_line_idx
-                else:
-                    content_end = len(lines)
-            else:
-                content_end = len(lines)
-
-            content_lines = lines[heading_line_idx + 1 : content_end]
-            content = "\n".join(content_lines).strip()
-
-            chunk = DocumentChunk(
-                heading=heading,
-                content=content,
-                heading_index=heading_idx,
-                score=heading_scores[heading_idx],
-            )
-            chunks.append(chunk)
-            
-        return chunks
+        return selected_indices
 
     async def get_n_chunks(self, text: str, n: int) -> List[DocumentChunk]:
-        headings = await asyncio.to_thread(self.extract_headings, text)
-        heading_scores = await asyncio.to_thread(self.score_headings, headings)
+        heading_index = await asyncio.to_thread(HeadingIndex, text)
+        return await self._get_n_chunks_from_index(text, heading_index, n)
+
+    async def get_n_chunks_from_stream(
+        self, sections: AsyncIterator[str], n: int
+    ) -> List[DocumentChunk]:
+        """
+        Same as get_n_chunks, for documents yielded section by section.
+        - Headings are indexed from each section while later sections are parsed.
+        """
+        texts = []
+        heading_index = HeadingIndex()
+        offset = 0
+        async for section in sections:
+            texts.append(section)
+            section_index = await asyncio.to_thread(HeadingIndex, section)
+            heading_index.extend(section_index, offset)
+            # Sections are joined with a blank line
+            offset += len(section) + 2
+
+        return await self._get_n_chunks_from_index("\n\n".join(texts), heading_index, n)
+
+    async def _get_n_chunks_from_index(
+        self, text: str, heading_index: HeadingIndex, n: int
+    ) -> List[DocumentChunk]:
+        heading_scores = await asyncio.to_thread(
+            self.score_headings, heading_index.headings
+        )
         chunks = await asyncio.to_thread(
-            self.get_chunks_from_headings, text, headings, heading_scores, n
+            self.get_chunks_from_headings,
+            text,
+            heading_index.headings,
+            heading_scores,
+            n,
+            heading_index,
         )
         if len(chunks) < n:
             raise ValueError(f"Only {len(chunks)} chunks found, requested {n}")
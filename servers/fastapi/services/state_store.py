@@ -0,0 +1,213 @@
+from abc import ABC, abstractmethod
+import json
+import time
+from typing import Any, Optional
+
+from redis import asyncio as redis
+
+from utils.get_env import get_redis_url_env
+
+
+class StateStore(ABC):
+    """
+    Key value store for state shared between workers.
+    - Values are JSON serializable and can expire after a ttl in seconds.
+    - Used for job claims, Ollama pull status, rate limit counters and layout
+    cache versions.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None): ...
+
+    @abstractmethod
+    async def set_if_not_exists(
+        self, key: str, value: Any, ttl: Optional[int] = None
+    ) -> bool: ...
+
+    @abstractmethod
+    async def delete(self, key: str): ...
+
+    @abstractmethod
+    async def expire(self, key: str, ttl: int) -> bool: ...
+
+    @abstractmethod
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        """
+        Deletes the key only while it holds value, so a claim is only released
+        by its owner.
+        """
+
+    @abstractmethod
+    async def expire_if_equals(self, key: str, value: Any, ttl: int) -> bool:
+        """
+        Refreshes the ttl of the key only while it holds value.
+        """
+
+    @abstractmethod
+    async def increment(
+        self, key: str, amount: int = 1, ttl: Optional[int] = None
+    ) -> int:
+        """
+        Adds amount to a counter, a new counter expires after ttl seconds.
+        """
+
+
+class InMemoryStateStore(StateStore):
+    """
+    State store for a single worker process.
+    """
+
+    def __init__(self):
+        self._values: dict[str, Any] = {}
+        self._expires_at: dict[str, float] = {}
+
+    def _is_expired(self, key: str) -> bool:
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self._values.pop(key, None)
+            self._expires_at.pop(key, None)
+            return True
+        return False
+
+    def _set(self, key: str, value: Any, ttl: Optional[int]):
+        self._values[key] = json.loads(json.dumps(value))
+        if ttl:
+            self._expires_at[key] = time.time() + ttl
+        else:
+            self._expires_at.pop(key, None)
+
+    async def get(self, key: str) -> Optional[Any]:
+        if self._is_expired(key):
+            return None
+        return self._values.get(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        self._set(key, value, ttl)
+
+    async def set_if_not_exists(
+        self, key: str, value: Any, ttl: Optional[int] = None
+    ) -> bool:
+        if not self._is_expired(key) and key in self._values:
+            return False
+        self._set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str):
+        self._values.pop(key, None)
+        self._expires_at.pop(key, None)
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        if self._is_expired(key) or key not in self._values:
+            return False
+        self._expires_at[key] = time.time() + ttl
+        return True
+
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        if await self.get(key) != value:
+            return False
+        await self.delete(key)
+        return True
+
+    async def expire_if_equals(self, key: str, value: Any, ttl: int) -> bool:
+        if await self.get(key) != value:
+            return False
+        return await self.expire(key, ttl)
+
+    async def increment(
+        self, key: str, amount: int = 1, ttl: Optional[int] = None
+    ) -> int:
+        if self._is_expired(key) or key not in self._values:
+            self._set(key, amount, ttl)
+            return amount
+        self._values[key] += amount
+        return self._values[key]
+
+
+# Compare and delete or expire atomically, values are compared as stored JSON
+DELETE_IF_EQUALS_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+EXPIRE_IF_EQUALS_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("pexpire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisStateStore(StateStore):
+    """
+    State store shared by every worker and node connected to the same Redis.
+    """
+
+    def __init__(self, client: redis.Redis, prefix: str = "presenton:"):
+        self._client = client
+        self._prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self._client.get(self._key(key))
+        if value is None:
+            return None
+        return json.loads(value)
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        await self._client.set(self._key(key), json.dumps(value), ex=ttl)
+
+    async def set_if_not_exists(
+        self, key: str, value: Any, ttl: Optional[int] = None
+    ) -> bool:
+        return bool(
+            await self._client.set(self._key(key), json.dumps(value), ex=ttl, nx=True)
+        )
+
+    async def delete(self, key: str):
+        await self._client.delete(self._key(key))
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        return bool(await self._client.expire(self._key(key), ttl))
+
+    async def delete_if_equals(self, key: str, value: Any) -> bool:
+        return bool(
+            await self._client.eval(
+                DELETE_IF_EQUALS_SCRIPT, 1, self._key(key), json.dumps(value)
+            )
+        )
+
+    async def expire_if_equals(self, key: str, value: Any, ttl: int) -> bool:
+        return bool(
+            await self._client.eval(
+                EXPIRE_IF_EQUALS_SCRIPT,
+                1,
+                self._key(key),
+                json.dumps(value),
+                int(ttl * 1000),
+            )
+        )
+
+    async def increment(
+        self, key: str, amount: int = 1, ttl: Optional[int] = None
+    ) -> int:
+        value = await self._client.incrby(self._key(key), amount)
+        # Counter was just created, start its window
+        if ttl and value == amount:
+            await self._client.expire(self._key(key), ttl)
+        return value
+
+
+def create_state_store() -> StateStore:
+    redis_url = get_redis_url_env()
+    if redis_url:
+        return RedisStateStore(redis.Redis.from_url(redis_url))
+    return InMemoryStateStore()
+
+
+STATE_STORE = create_state_store()
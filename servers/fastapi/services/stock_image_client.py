@@ -0,0 +1,273 @@
+import asyncio
+import math
+import random
+import time
+from typing import Dict, Optional
+
+import aiohttp
+from multidict import CIMultiDictProxy
+
+from constants.images import (
+    STOCK_IMAGE_HTTP_TIMEOUT,
+    STOCK_IMAGE_MAX_RETRIES,
+    STOCK_IMAGE_MAX_RETRY_DELAY,
+    STOCK_IMAGE_PROVIDER_LIMITS,
+    STOCK_IMAGE_RETRY_BASE_DELAY,
+)
+from services.state_store import STATE_STORE, InMemoryStateStore, StateStore
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Allows requests_per_second on average with bursts of up to burst requests.
+    - pause_until holds every request back, e.g. until a rate limit resets.
+    """
+
+    def __init__(self, requests_per_second: float, burst: int):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+
+    def pause_until(self, paused_until: float):
+        self._paused_until = max(self._paused_until, paused_until)
+
+    async def pause(self, delay: float):
+        self.pause_until(time.monotonic() + delay)
+
+    def get_wait_time(self) -> float:
+        """
+        Takes a token and returns 0, or returns how long to wait for one.
+        """
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        self._tokens = min(
+            self.burst,
+            self._tokens + (now - self._updated_at) * self.requests_per_second,
+        )
+        self._updated_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.requests_per_second
+
+    async def acquire(self):
+        while True:
+            wait_time = self.get_wait_time()
+            if not wait_time:
+                return
+            await asyncio.sleep(wait_time)
+
+
+class SharedRateLimiter:
+    """
+    Rate limit shared by every worker through counters in the state store.
+    - Allows burst requests per window of burst / requests_per_second seconds.
+    - A pause, e.g. until a rate limit resets, holds back requests of every worker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_second: float,
+        burst: int,
+        state_store: StateStore = STATE_STORE,
+    ):
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.window = burst / requests_per_second
+        self._state_store = state_store
+        self._key = f"stock_image_rate_limit:{name}"
+
+    async def pause(self, delay: float):
+        paused_until = time.time() + delay
+        current = await self._state_store.get(f"{self._key}:paused_until")
+        if current is None or current < paused_until:
+            await self._state_store.set(
+                f"{self._key}:paused_until", paused_until, math.ceil(delay) + 1
+            )
+
+    async def get_wait_time(self) -> float:
+        """
+        Counts a request in the current window and returns 0, or returns how
+        long to wait for the next window.
+        """
+        now = time.time()
+        paused_until = await self._state_store.get(f"{self._key}:paused_until")
+        if paused_until and now < paused_until:
+            return paused_until - now
+
+        window_index = int(now // self.window)
+        requests = await self._state_store.increment(
+            f"{self._key}:{window_index}", ttl=math.ceil(self.window) + 1
+        )
+        if requests <= self.burst:
+            return 0.0
+        return (window_index + 1) * self.window - now
+
+    async def acquire(self):
+        while True:
+            wait_time = await self.get_wait_time()
+            if not wait_time:
+                return
+            await asyncio.sleep(wait_time)
+
+
+def create_rate_limiter(name: str, requests_per_second: float, burst: int):
+    """
+    Returns a token bucket of the worker, or a limiter shared with the other
+    workers when the state store is shared.
+    """
+    if isinstance(STATE_STORE, InMemoryStateStore):
+        return TokenBucket(requests_per_second, burst)
+    return SharedRateLimiter(name, requests_per_second, burst)
+
+
+class StockImageClient:
+    """
+    Long lived HTTP client of a stock image provider.
+    - One aiohttp session keeps connections alive between searches, it is recreated
+    when used from a different event loop.
+    - Requests are limited by a semaphore and a rate limiter, shared between
+    workers when REDIS_URL is set.
+    - Rate limited and failed requests are retried with jittered exponential backoff,
+    waiting as long as Retry-After or X-Ratelimit-Reset headers ask for.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        requests_per_second: float,
+        burst: int,
+        max_retries: int = STOCK_IMAGE_MAX_RETRIES,
+        retry_base_delay: float = STOCK_IMAGE_RETRY_BASE_DELAY,
+        max_retry_delay: float = STOCK_IMAGE_MAX_RETRY_DELAY,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.max_retry_delay = max_retry_delay
+        self.rate_limiter = create_rate_limiter(name, requests_per_second, burst)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.sessions_created = 0
+        self.requests_sent = 0
+        self.rate_limited = 0
+        self.retries = 0
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            # Session of another event loop is dropped, it can not be closed from here
+            self._session = aiohttp.ClientSession(
+                trust_env=True,
+                timeout=aiohttp.ClientTimeout(total=STOCK_IMAGE_HTTP_TIMEOUT),
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            self.sessions_created += 1
+        return self._session
+
+    def get_retry_delay(self, headers: CIMultiDictProxy) -> Optional[float]:
+        """
+        Returns the delay requested by rate limit headers, None if there is none.
+        """
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+
+        if headers.get("X-Ratelimit-Remaining") == "0":
+            try:
+                reset = float(headers.get("X-Ratelimit-Reset", ""))
+            except ValueError:
+                return None
+            # Pexels sends a unix timestamp, Pixabay sends seconds until reset
+            return max(0.0, reset - time.time()) if reset > 1e9 else reset
+        return None
+
+    def get_backoff_delay(self, attempt: int) -> float:
+        return random.uniform(0, self.retry_base_delay * 2**attempt)
+
+    async def get_json(
+        self,
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+    ) -> dict:
+        session = self._get_session()
+        semaphore = self._semaphore
+
+        for attempt in range(self.max_retries + 1):
+            async with semaphore:
+                # Taken once a slot is free, so pauses reach queued requests too
+                await self.rate_limiter.acquire()
+                async with session.get(url, params=params, headers=headers) as response:
+                    self.requests_sent += 1
+                    header_delay = self.get_retry_delay(response.headers)
+
+                    if response.status not in RETRY_STATUSES:
+                        if header_delay and header_delay <= self.max_retry_delay:
+                            # Quota is used up, later requests wait for the reset
+                            await self.rate_limiter.pause(header_delay)
+                        response.raise_for_status()
+                        return await response.json()
+
+                    if response.status == 429:
+                        self.rate_limited += 1
+                    if attempt == self.max_retries or (
+                        header_delay and header_delay > self.max_retry_delay
+                    ):
+                        response.raise_for_status()
+
+            delay = header_delay
+            if delay is None:
+                delay = self.get_backoff_delay(attempt)
+            else:
+                await self.rate_limiter.pause(delay)
+            # Jitter keeps waiting requests from retrying at the same moment
+            delay += random.uniform(0, self.retry_base_delay)
+            self.retries += 1
+            print(
+                f"{self.name} responded with {response.status}, "
+                f"retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_stats(self) -> dict:
+        return {
+            "shared_rate_limit": isinstance(self.rate_limiter, SharedRateLimiter),
+            "sessions_created": self.sessions_created,
+            "requests_sent": self.requests_sent,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+        }
+
+
+STOCK_IMAGE_CLIENTS: Dict[str, StockImageClient] = {
+    name: StockImageClient(name, **limits)
+    for name, limits in STOCK_IMAGE_PROVIDER_LIMITS.items()
+}
+
+
+async def close_stock_image_clients():
+    for client in STOCK_IMAGE_CLIENTS.values():
+        await client.close()
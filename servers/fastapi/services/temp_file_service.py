@@ -1,4 +1,5 @@
 import os
+import time
 from typing import Optional, Union
 
 from utils.get_env import get_temp_directory_env
@@ -7,9 +8,9 @@ import uuid
 
 class TempFileService:
 
-    def __init__(self):
+    def __init__(self, stale_after: int = 24 * 60 * 60):
         self.base_dir = get_temp_directory_env() or "/tmp/presenton"
-        self.cleanup_base_dir()
+        self.stale_after = stale_after
         os.makedirs(self.base_dir, exist_ok=True)
 
     def create_dir_in_dir(self, base_dir: str, dir_name: Optional[str] = None) -> str:
@@ -66,5 +67,26 @@ class TempFileService:
     def cleanup_base_dir(self):
         self.cleanup_temp_dir(self.base_dir)
 
+    def cleanup_stale_files(self):
+        """
+        Removes files left over by previous runs, called by the startup warm up.
+        - Other workers share the base dir, so only old entries are removed.
+        """
+        if not os.path.exists(self.base_dir):
+            return
+
+        stale_before = time.time() - self.stale_after
+        for entry in os.scandir(self.base_dir):
+            try:
+                if entry.stat(follow_symlinks=False).st_mtime >= stale_before:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    self.cleanup_temp_dir(entry.path)
+                else:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                # Removed by another worker
+                pass
+
 
 TEMP_FILE_SERVICE = TempFileService()
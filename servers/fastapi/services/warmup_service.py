@@ -0,0 +1,56 @@
+import asyncio
+import time
+from typing import Callable, Dict, Optional
+
+
+class WarmupService:
+    """
+    Initializes heavy services in the background once the server has started.
+    - Each component is warmed up in a thread, so requests are served meanwhile.
+    - Components that are used before they are warmed up initialize on first use.
+    """
+
+    def __init__(self):
+        self.components: Dict[str, str] = {}
+        self.durations: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, components: Dict[str, Callable[[], None]]):
+        for name in components:
+            self.components[name] = "pending"
+        self._task = asyncio.create_task(self._warm_up(components))
+
+    async def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _warm_up(self, components: Dict[str, Callable[[], None]]):
+        for name, warm_up in components.items():
+            started_at = time.perf_counter()
+            try:
+                await asyncio.to_thread(warm_up)
+                self.components[name] = "ready"
+            except Exception as e:
+                print(f"Failed to warm up {name}: {e}")
+                self.components[name] = "error"
+            self.durations[name] = time.perf_counter() - started_at
+            print(f"Warmed up {name} in {self.durations[name]:.2f}s")
+
+    def is_ready(self) -> bool:
+        return all(status != "pending" for status in self.components.values())
+
+    def get_status(self) -> dict:
+        return {
+            "ready": self.is_ready(),
+            "components": {
+                name: {"status": status, "duration": self.durations.get(name)}
+                for name, status in self.components.items()
+            },
+        }
+
+
+WARMUP_SERVICE = WarmupService()
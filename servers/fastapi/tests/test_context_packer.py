@@ -0,0 +1,85 @@
+import os
+from unittest.mock import patch
+
+from services.context_packer import ContextPacker, estimate_tokens
+from utils.llm_provider import get_outline_context_token_budget
+
+
+def make_document(name: str, sections: int, paragraph_words: int = 200) -> str:
+    parts = [f"{name} annual report"]
+    for i in range(sections):
+        heading = f"# {name} chapter {i}" if i % 3 == 0 else f"#### {name} note {i}"
+        paragraph = " ".join(f"{name}{i}word" for _ in range(paragraph_words))
+        parts.append(f"{heading}\n\n{paragraph}")
+    return "\n\n".join(parts)
+
+
+class TestContextPacker:
+
+    def setup_method(self):
+        self.context_packer = ContextPacker()
+
+    def test_documents_within_budget_are_unchanged(self):
+        documents = ["# Report\nShort", "Notes"]
+
+        packed_context = self.context_packer.pack(documents, budget=1000)
+
+        assert packed_context.text == "# Report\nShort\n\nNotes"
+        assert packed_context.tokens_saved == 0
+
+    def test_highest_scoring_sections_fit_budget(self):
+        documents = [make_document("alpha", 30), make_document("beta", 30)]
+
+        packed_context = self.context_packer.pack(documents, budget=3000)
+
+        assert packed_context.tokens_after <= 3000
+        assert packed_context.tokens_before == estimate_tokens("\n\n".join(documents))
+        assert packed_context.tokens_saved > 0
+        # Both documents are represented, chapters are kept before notes
+        for name in ("alpha", "beta"):
+            assert f"{name} annual report" in packed_context.text
+            assert f"# {name} chapter 3\n" in packed_context.text
+            assert f"#### {name} note 29" not in packed_context.text
+        # Sections keep document order
+        text = packed_context.text
+        assert text.index("# alpha chapter 3") < text.index("# alpha chapter 6")
+        assert text.index("alpha annual report") < text.index("beta annual report")
+
+    def test_small_documents_are_kept_whole(self):
+        small_document = "# Agenda\nKickoff and budget review"
+        documents = [make_document("alpha", 60), small_document]
+
+        packed_context = self.context_packer.pack(documents, budget=2000)
+
+        assert small_document in packed_context.text
+        assert packed_context.tokens_after <= 2000
+
+    def test_long_sections_are_truncated(self):
+        document = "# Only chapter\n\n" + "\n\n".join(
+            f"Paragraph {i} " + "word " * 100 for i in range(50)
+        )
+
+        packed_context = self.context_packer.pack([document], budget=500)
+
+        assert packed_context.text.startswith("# Only chapter")
+        assert packed_context.text.endswith("word")
+        assert packed_context.tokens_after <= 500
+
+    def test_tokens_saved_are_reported(self):
+        self.context_packer.pack(["short"], budget=1000)
+        packed_context = self.context_packer.pack(
+            [make_document("alpha", 30)], budget=1000
+        )
+
+        stats = self.context_packer.get_stats()
+        assert stats["requests"] == 2
+        assert stats["packed_requests"] == 1
+        assert stats["tokens_saved"] == packed_context.tokens_saved
+
+    def test_budget_per_provider(self):
+        with patch.dict(os.environ, {"LLM": "ollama"}):
+            assert get_outline_context_token_budget() == 4000
+        with patch.dict(
+            os.environ, {"LLM": "openai", "OUTLINE_CONTEXT_TOKEN_BUDGET": "1234"}
+        ):
+            assert get_outline_context_token_budget() == 1234
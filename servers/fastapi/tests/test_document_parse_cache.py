@@ -0,0 +1,71 @@
+import os
+import tempfile
+import time
+
+from services.document_parse_cache import DocumentParseCache
+
+
+class TestDocumentParseCache:
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.images_dir = os.path.join(self.temp_dir.name, "images")
+        os.makedirs(self.images_dir)
+        self.cache = DocumentParseCache(self.cache_dir, max_size=1024 * 1024)
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def write_file(self, name: str, content: bytes) -> str:
+        file_path = os.path.join(self.temp_dir.name, name)
+        with open(file_path, "wb") as f:
+            f.write(content)
+        return file_path
+
+    def test_key_depends_on_contents_and_options(self):
+        first = self.write_file("first.pdf", b"same contents")
+        renamed_copy = self.write_file("renamed.pdf", b"same contents")
+        different = self.write_file("different.pdf", b"other contents")
+
+        assert self.cache.get_key(first, do_ocr=False) == self.cache.get_key(
+            renamed_copy, do_ocr=False
+        )
+        assert self.cache.get_key(first, do_ocr=False) != self.cache.get_key(
+            different, do_ocr=False
+        )
+        assert self.cache.get_key(first, do_ocr=False) != self.cache.get_key(
+            first, do_ocr=True
+        )
+
+    def test_stores_markdown_and_page_images(self):
+        image_path = self.write_file("page_1.png", b"png bytes")
+        self.cache.set_sync("key", "# Report", [image_path])
+        os.remove(image_path)
+
+        document, image_paths = self.cache.get_sync("key", self.images_dir)
+
+        assert document == "# Report"
+        assert image_paths == [os.path.join(self.images_dir, "page_1.png")]
+        with open(image_paths[0], "rb") as f:
+            assert f.read() == b"png bytes"
+        assert self.cache.get_sync("missing", self.images_dir) is None
+        assert self.cache.get_stats()["hit_rate"] == 0.5
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = DocumentParseCache(self.cache_dir, max_size=250)
+        cache.set_sync("first", "a" * 100, [])
+        cache.set_sync("second", "b" * 100, [])
+
+        # Reading the first entry makes the second the least recently used
+        entry_time = time.time() - 10
+        os.utime(os.path.join(self.cache_dir, "second"), (entry_time, entry_time))
+        os.utime(os.path.join(self.cache_dir, "first"), (entry_time, entry_time))
+        cache.get_sync("first", self.images_dir)
+
+        cache.set_sync("third", "c" * 100, [])
+
+        assert cache.get_sync("first", self.images_dir) is not None
+        assert cache.get_sync("second", self.images_dir) is None
+        assert cache.get_sync("third", self.images_dir) is not None
+        assert cache.evictions == 1
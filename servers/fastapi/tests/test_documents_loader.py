@@ -0,0 +1,247 @@
+import asyncio
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from services.document_parse_cache import DocumentParseCache
+from services.document_parser_pool import DocumentParserPool, _warm_up_worker
+from services.documents_loader import DocumentsLoader
+from services.score_based_chunker import ScoreBasedChunker
+
+
+class TestDocumentsLoader:
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_paths = []
+        for name in ("report.docx", "deck.pptx", "notes.txt"):
+            file_path = os.path.join(self.temp_dir.name, name)
+            with open(file_path, "w") as f:
+                f.write(f"Contents of {name}")
+            self.file_paths.append(file_path)
+
+        self.parse_cache = DocumentParseCache(
+            os.path.join(self.temp_dir.name, "cache"), max_size=1024 * 1024
+        )
+        self.parse_cache_patch = patch(
+            "services.documents_loader.DOCUMENT_PARSE_CACHE", self.parse_cache
+        )
+        self.parse_cache_patch.start()
+
+    def teardown_method(self):
+        self.parse_cache_patch.stop()
+        self.temp_dir.cleanup()
+
+    def test_documents_are_parsed_concurrently_in_order(self):
+        running = 0
+        max_running = 0
+        loop_ran_while_parsing = False
+
+        async def run():
+            # Parses only finish once all three are running at the same time
+            all_running = asyncio.Event()
+
+            async def parse_to_markdown(file_path: str) -> str:
+                nonlocal running, max_running
+                running += 1
+                max_running = max(max_running, running)
+                if running == 3:
+                    all_running.set()
+                await asyncio.wait_for(all_running.wait(), timeout=10)
+                running -= 1
+                return f"# {os.path.basename(file_path)}"
+
+            async def watch():
+                nonlocal loop_ran_while_parsing
+                await all_running.wait()
+                loop_ran_while_parsing = running > 0
+
+            documents_loader = DocumentsLoader(
+                file_paths=[*self.file_paths, self.file_paths[0]]
+            )
+            watcher = asyncio.create_task(watch())
+            with patch(
+                "services.documents_loader.DOCUMENT_PARSER_POOL.parse_to_markdown",
+                parse_to_markdown,
+            ):
+                await documents_loader.load_documents(self.temp_dir.name)
+            await watcher
+            return documents_loader.documents
+
+        documents = asyncio.run(run())
+
+        assert documents == [
+            "# report.docx",
+            "# deck.pptx",
+            "Contents of notes.txt",
+            "# report.docx",
+        ]
+        assert max_running == 3
+        # Event loop kept running while documents were parsed
+        assert loop_ran_while_parsing
+
+    def test_parsed_documents_are_cached_by_contents(self):
+        parsed_files = []
+
+        async def parse_to_markdown(file_path: str) -> str:
+            parsed_files.append(os.path.basename(file_path))
+            return f"# {os.path.basename(file_path)}"
+
+        async def run():
+            documents = []
+            for _ in range(2):
+                documents_loader = DocumentsLoader(file_paths=self.file_paths)
+                await documents_loader.load_documents(self.temp_dir.name)
+                documents.append(documents_loader.documents)
+            return documents
+
+        with patch(
+            "services.documents_loader.DOCUMENT_PARSER_POOL.parse_to_markdown",
+            parse_to_markdown,
+        ):
+            first_documents, second_documents = asyncio.run(run())
+
+        assert first_documents == second_documents
+        assert sorted(parsed_files) == ["deck.pptx", "report.docx"]
+        assert self.parse_cache.get_stats()["hits"] == 2
+
+    def test_missing_file_raises_not_found(self):
+        documents_loader = DocumentsLoader(
+            file_paths=[os.path.join(self.temp_dir.name, "missing.pdf")]
+        )
+
+        with pytest.raises(Exception) as exc_info:
+            asyncio.run(documents_loader.load_documents(self.temp_dir.name))
+
+        assert exc_info.value.status_code == 404
+
+
+class TestPdfStreaming:
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(self.temp_dir.name, "report.pdf")
+        pages = [Image.new("RGB", (72, 72), "white") for _ in range(25)]
+        pages[0].save(self.file_path, save_all=True, append_images=pages[1:])
+
+        self.parse_cache_patch = patch(
+            "services.documents_loader.DOCUMENT_PARSE_CACHE",
+            DocumentParseCache(max_size=0),
+        )
+        self.parse_cache_patch.start()
+
+    def teardown_method(self):
+        self.parse_cache_patch.stop()
+        self.temp_dir.cleanup()
+
+    async def parse_to_markdown(self, file_path, page_range):
+        start, end = page_range
+        return "\n".join(
+            f"# Page {page}\nText of page {page}" for page in range(start, end + 1)
+        )
+
+    def test_sections_are_yielded_in_page_order(self):
+        async def run():
+            documents_loader = DocumentsLoader(file_paths=[self.file_path])
+            return [
+                section
+                async for section in documents_loader.stream_pdf(
+                    self.file_path, self.temp_dir.name
+                )
+            ]
+
+        with patch(
+            "services.documents_loader.DOCUMENT_PARSER_POOL.parse_to_markdown",
+            self.parse_to_markdown,
+        ):
+            sections = asyncio.run(run())
+
+        assert [section.page_numbers[0] for section in sections] == [1, 11, 21]
+        assert sections[-1].page_numbers == [21, 22, 23, 24, 25]
+        assert sections[1].markdown.startswith("# Page 11")
+        # Page images are only rendered on demand
+        assert not [
+            name for name in os.listdir(self.temp_dir.name) if name.endswith(".png")
+        ]
+
+    def test_page_images_are_rendered_lazily_at_given_resolution(self):
+        async def run():
+            documents_loader = DocumentsLoader(file_paths=[self.file_path])
+            async for section in documents_loader.stream_pdf(
+                self.file_path, self.temp_dir.name, load_text=False
+            ):
+                return await section.get_images(resolution=144)
+
+        image_paths = asyncio.run(run())
+
+        assert len(image_paths) == 10
+        with Image.open(image_paths[0]) as image:
+            assert image.size == (144, 144)
+
+    def test_load_pdf_joins_sections(self):
+        async def run():
+            documents_loader = DocumentsLoader(file_paths=[self.file_path])
+            return await documents_loader.load_pdf(
+                self.file_path, True, True, self.temp_dir.name
+            )
+
+        with patch(
+            "services.documents_loader.DOCUMENT_PARSER_POOL.parse_to_markdown",
+            self.parse_to_markdown,
+        ):
+            document, image_paths = asyncio.run(run())
+
+        assert document.count("# Page") == 25
+        assert len(image_paths) == 25
+
+    def test_chunker_consumes_stream(self):
+        async def run():
+            documents_loader = DocumentsLoader(file_paths=[self.file_path])
+            document, _ = await documents_loader.load_pdf(
+                self.file_path, True, False, self.temp_dir.name
+            )
+            chunker = ScoreBasedChunker()
+            streamed_chunks = await chunker.get_n_chunks_from_stream(
+                documents_loader.stream_document(self.file_path, self.temp_dir.name),
+                5,
+            )
+            return await chunker.get_n_chunks(document, 5), streamed_chunks
+
+        with patch(
+            "services.documents_loader.DOCUMENT_PARSER_POOL.parse_to_markdown",
+            self.parse_to_markdown,
+        ):
+            chunks, streamed_chunks = asyncio.run(run())
+
+        assert streamed_chunks == chunks
+        assert len(chunks) == 5
+
+
+class TestDocumentParserPool:
+
+    def test_max_workers_from_env(self):
+        pool = DocumentParserPool()
+
+        with patch.dict(os.environ, {"DOCUMENT_PARSING_WORKERS": "4"}):
+            assert pool.get_max_workers() == 4
+        with patch.dict(os.environ, {"DOCUMENT_PARSING_WORKERS": "invalid"}):
+            assert pool.get_max_workers() == 2
+
+    def test_work_runs_in_reused_worker_processes(self):
+        pytest.importorskip("docling")
+        pool = DocumentParserPool()
+
+        async def run():
+            return [await pool._run(_warm_up_worker) for _ in range(3)]
+
+        with patch.dict(os.environ, {"DOCUMENT_PARSING_WORKERS": "1"}):
+            try:
+                worker_pids = asyncio.run(run())
+            finally:
+                pool.shutdown()
+
+        assert os.getpid() not in worker_pids
+        assert len(set(worker_pids)) == 1
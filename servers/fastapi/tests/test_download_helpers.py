@@ -0,0 +1,108 @@
+import asyncio
+import os
+from collections import Counter
+
+from aiohttp import web
+
+from utils.download_helpers import download_file, download_files
+
+
+class StubImageServer:
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.requests = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def image(self, request: web.Request) -> web.Response:
+        name = request.match_info["name"]
+        self.requests[name] += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if name.startswith("slow"):
+                # Stalls after part of the body was written
+                response = web.StreamResponse(headers={"Content-Type": "image/jpeg"})
+                await response.prepare(request)
+                await response.write(b"x" * 100_000)
+                await asyncio.sleep(1)
+                return response
+        finally:
+            self.in_flight -= 1
+        if name.startswith("missing"):
+            return web.Response(status=404)
+        return web.Response(body=name.encode() * 1000, content_type="image/jpeg")
+
+    async def run(self, callback):
+        app = web.Application()
+        app.router.add_get("/images/{name}", self.image)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await callback(f"http://127.0.0.1:{port}/images")
+        finally:
+            await runner.cleanup()
+
+
+class TestDownloadFiles:
+
+    def test_identical_urls_are_downloaded_once(self, tmp_path):
+        server = StubImageServer()
+
+        async def callback(base_url):
+            urls = [f"{base_url}/{name}.jpg" for name in ["a", "b", "a", "c", "a"]]
+            return await download_files(urls, str(tmp_path))
+
+        paths = asyncio.run(server.run(callback))
+
+        assert paths == [
+            str(tmp_path / f"{name}.jpg") for name in ["a", "b", "a", "c", "a"]
+        ]
+        assert server.requests == {"a.jpg": 1, "b.jpg": 1, "c.jpg": 1}
+        with open(paths[1], "rb") as f:
+            assert f.read() == b"b.jpg" * 1000
+
+    def test_concurrency_is_bounded(self, tmp_path):
+        server = StubImageServer()
+
+        async def callback(base_url):
+            urls = [f"{base_url}/{i}.jpg" for i in range(30)]
+            return await download_files(urls, str(tmp_path), max_concurrency=4)
+
+        paths = asyncio.run(server.run(callback))
+
+        assert all(paths)
+        assert server.max_in_flight <= 4
+
+    def test_failed_downloads_return_none(self, tmp_path):
+        server = StubImageServer()
+
+        async def callback(base_url):
+            urls = [
+                f"{base_url}/a.jpg",
+                f"{base_url}/missing.jpg",
+                f"{base_url}/slow.jpg",
+            ]
+            return await download_files(urls, str(tmp_path), timeout=0.2)
+
+        paths = asyncio.run(server.run(callback))
+
+        assert paths == [str(tmp_path / "a.jpg"), None, None]
+        # Timed out downloads leave no partial files behind
+        assert os.listdir(tmp_path) == ["a.jpg"]
+
+    def test_download_file_guesses_extension(self, tmp_path):
+        server = StubImageServer()
+
+        async def callback(base_url):
+            return await download_file(f"{base_url}/photo", str(tmp_path))
+
+        path = asyncio.run(server.run(callback))
+
+        assert path.endswith(".jpg")
+        assert server.requests == {"photo": 2}
@@ -0,0 +1,230 @@
+import asyncio
+import os
+import uuid
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.presentation_and_path import PresentationAndPath
+from models.sql.presentation import PresentationModel
+from models.sql.presentation_export import PresentationExportModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.slide import SlideModel
+from models.sql.template import TemplateModel
+from api.v1.ppt.endpoints.presentation import export_presentation_by_id
+from services.export_cache import ExportCache
+from utils.export_utils import export_presentation
+
+
+class TestExportCache:
+
+    def setup_method(self):
+        self.env = patch.dict(os.environ, {"EXPORT_CACHE": "true"})
+        self.env.start()
+        self.cache = ExportCache()
+        self.exports = 0
+
+    def teardown_method(self):
+        self.env.stop()
+
+    async def create_database(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn,
+                    tables=[
+                        PresentationModel.__table__,
+                        SlideModel.__table__,
+                        PresentationExportModel.__table__,
+                        PresentationLayoutCodeModel.__table__,
+                        TemplateModel.__table__,
+                    ],
+                )
+            )
+        return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+    async def add_presentation(
+        self, session_maker, layout_group: str = "general"
+    ) -> uuid.UUID:
+        presentation = PresentationModel(
+            content="Solar energy", n_slides=2, language="English", title="Solar"
+        )
+        async with session_maker() as session:
+            session.add(presentation)
+            session.add_all(
+                SlideModel(
+                    presentation=presentation.id,
+                    layout_group=layout_group,
+                    layout=f"{layout_group}:title",
+                    index=index,
+                    content={"title": f"Slide {index}"},
+                )
+                for index in range(2)
+            )
+            await session.commit()
+        return presentation.id
+
+    def export(self, tmp_path):
+        async def _export_presentation(presentation_id, title, export_as):
+            self.exports += 1
+            path = str(tmp_path / f"{title}.{export_as}")
+            with open(path, "w") as f:
+                f.write("x" * self.exports)
+            return PresentationAndPath(presentation_id=presentation_id, path=path)
+
+        return patch("utils.export_utils._export_presentation", _export_presentation)
+
+    def run(self, tmp_path, steps):
+        async def run():
+            engine, session_maker = await self.create_database(tmp_path)
+            presentation_id = await self.add_presentation(session_maker)
+            with patch("services.database.async_session_maker", session_maker), patch(
+                "utils.export_utils.EXPORT_CACHE", self.cache
+            ), self.export(tmp_path):
+                await steps(presentation_id, session_maker)
+            await engine.dispose()
+
+        asyncio.run(run())
+
+    def test_unchanged_presentations_are_exported_once(self, tmp_path):
+        async def steps(presentation_id, session_maker):
+            first = await export_presentation(presentation_id, "deck", "pptx")
+            second = await export_presentation(presentation_id, "deck", "pptx")
+            await export_presentation(presentation_id, "deck", "pdf")
+
+            assert first.path == second.path
+
+        self.run(tmp_path, steps)
+
+        assert self.exports == 2
+        assert self.cache.get_stats()["hits"] == 1
+
+    def test_saved_presentations_are_exported_again_from_cache(self, tmp_path):
+        async def steps(presentation_id, session_maker):
+            async with session_maker() as session:
+                first = await export_presentation_by_id(
+                    presentation_id, "pptx", session
+                )
+                second = await export_presentation_by_id(
+                    presentation_id, "pptx", session
+                )
+                with pytest.raises(HTTPException) as error:
+                    await export_presentation_by_id(uuid.uuid4(), "pptx", session)
+
+            assert first == second
+            assert first.path == str(tmp_path / "Solar.pptx")
+            assert first.edit_path == f"/presentation?id={presentation_id}"
+            assert error.value.status_code == 404
+
+        self.run(tmp_path, steps)
+
+        assert self.exports == 1
+        assert self.cache.get_stats()["hits"] == 1
+
+    def test_changes_and_invalidation_export_again(self, tmp_path):
+        async def steps(presentation_id, session_maker):
+            await export_presentation(presentation_id, "deck", "pptx")
+
+            async with session_maker() as session:
+                slide = await session.scalar(
+                    select(SlideModel).where(SlideModel.index == 0)
+                )
+                slide.content = {"title": "Edited"}
+                session.add(slide)
+                await session.commit()
+            await export_presentation(presentation_id, "deck", "pptx")
+
+            async with session_maker() as session:
+                await self.cache.invalidate(session, presentation_id)
+                await session.commit()
+            await export_presentation(presentation_id, "deck", "pptx")
+
+        self.run(tmp_path, steps)
+
+        assert self.exports == 3
+        assert self.cache.get_stats()["hits"] == 0
+
+    def test_custom_templates_saved_again_export_again(self, tmp_path):
+        template_id = uuid.uuid4()
+
+        async def save_template(session_maker, layout_code: str, name: str):
+            async with session_maker() as session:
+                layout = await session.scalar(select(PresentationLayoutCodeModel))
+                if not layout:
+                    layout = PresentationLayoutCodeModel(
+                        presentation=template_id,
+                        layout_id="title",
+                        layout_name="Title",
+                        layout_code=layout_code,
+                    )
+                layout.layout_code = layout_code
+                template = await session.get(TemplateModel, template_id)
+                if not template:
+                    template = TemplateModel(id=template_id, name=name)
+                template.name = name
+                session.add_all([layout, template])
+                await session.commit()
+
+        async def steps(_, session_maker):
+            await save_template(session_maker, "<Title />", "Brand")
+            presentation_id = await self.add_presentation(
+                session_maker, f"custom-{template_id}"
+            )
+            await export_presentation(presentation_id, "custom", "pptx")
+            await export_presentation(presentation_id, "custom", "pptx")
+
+            await save_template(session_maker, "<Title large />", "Brand")
+            await export_presentation(presentation_id, "custom", "pptx")
+
+            await save_template(session_maker, "<Title large />", "Brand 2")
+            await export_presentation(presentation_id, "custom", "pptx")
+
+            with patch("services.export_cache.EXPORT_LAYOUT_VERSION", 0):
+                await export_presentation(presentation_id, "custom", "pptx")
+
+        self.run(tmp_path, steps)
+
+        assert self.exports == 4
+        assert self.cache.get_stats()["hits"] == 1
+
+    def test_file_times_are_stored_exactly(self, tmp_path):
+        async def steps(presentation_id, session_maker):
+            await export_presentation(presentation_id, "deck", "pptx")
+            async with session_maker() as session:
+                self.saved = await session.scalar(select(PresentationExportModel))
+
+        self.run(tmp_path, steps)
+
+        assert self.saved.modified_at_ns == os.stat(tmp_path / "deck.pptx").st_mtime_ns
+        # Nanoseconds since the epoch do not fit a 32-bit INTEGER or a FLOAT
+        assert isinstance(
+            PresentationExportModel.__table__.c.modified_at_ns.type, BigInteger
+        )
+
+    def test_overwritten_files_are_not_reused(self, tmp_path):
+        async def steps(presentation_id, session_maker):
+            await export_presentation(presentation_id, "deck", "pptx")
+            with open(tmp_path / "deck.pptx", "w") as f:
+                f.write("another deck with the same title")
+            await export_presentation(presentation_id, "deck", "pptx")
+
+        self.run(tmp_path, steps)
+
+        assert self.exports == 2
+
+    def test_disabled_cache_always_exports(self, tmp_path):
+        async def steps(presentation_id, session_maker):
+            await export_presentation(presentation_id, "deck", "pptx")
+            await export_presentation(presentation_id, "deck", "pptx")
+
+        with patch.dict(os.environ, {"EXPORT_CACHE": "false"}):
+            self.run(tmp_path, steps)
+
+        assert self.exports == 2
+        assert self.cache.get_stats()["stores"] == 0
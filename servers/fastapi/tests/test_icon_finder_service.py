@@ -0,0 +1,65 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from services.icon_finder_service import IconFinderService
+
+
+class TestIconFinderServiceBatchSearch:
+
+    def setup_method(self):
+        self.service = IconFinderService()
+        self.service._index = MagicMock()
+        self.service.index.query.side_effect = lambda queries, k: [
+            [f"{query.replace(' ', '-')}-{i}-bold" for i in range(k)]
+            for query in queries
+        ]
+
+    def test_batch_search_embeds_all_queries_once(self):
+        results = asyncio.run(
+            self.service.search_icons_batch(["chart", "rocket", "chart"], 2)
+        )
+
+        assert results == [
+            [
+                "/static/icons/bold/chart-0-bold.png",
+                "/static/icons/bold/chart-1-bold.png",
+            ],
+            [
+                "/static/icons/bold/rocket-0-bold.png",
+                "/static/icons/bold/rocket-1-bold.png",
+            ],
+            [
+                "/static/icons/bold/chart-0-bold.png",
+                "/static/icons/bold/chart-1-bold.png",
+            ],
+        ]
+        self.service.index.query.assert_called_once_with(["chart", "rocket"], 2)
+
+    def test_cached_queries_are_not_embedded_again(self):
+        asyncio.run(self.service.search_icons_batch(["chart", "rocket"]))
+        results = asyncio.run(self.service.search_icons_batch(["rocket", "team"]))
+
+        assert results == [
+            ["/static/icons/bold/rocket-0-bold.png"],
+            ["/static/icons/bold/team-0-bold.png"],
+        ]
+        assert self.service.index.query.call_count == 2
+        self.service.index.query.assert_called_with(["team"], 1)
+        assert self.service.get_stats()["cache_hits"] == 1
+
+    def test_search_icons_uses_batch_search(self):
+        result = asyncio.run(self.service.search_icons("chart"))
+
+        assert result == ["/static/icons/bold/chart-0-bold.png"]
+
+    def test_cache_evicts_least_recently_used_queries(self):
+        with patch("services.icon_finder_service.ICON_SEARCH_CACHE_SIZE", 2):
+            asyncio.run(self.service.search_icons_batch(["chart", "rocket"]))
+            asyncio.run(self.service.search_icons_batch(["chart"]))
+            asyncio.run(self.service.search_icons_batch(["team"]))
+
+        assert list(self.service._search_cache.keys()) == [("chart", 1), ("team", 1)]
+
+    def test_empty_batch_does_not_query(self):
+        assert asyncio.run(self.service.search_icons_batch([])) == []
+        self.service.index.query.assert_not_called()
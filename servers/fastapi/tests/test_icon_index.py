@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from services.icon_index import NumpyIconIndex
+
+
+class TestNumpyIconIndex:
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.embeddings_path = os.path.join(self.temp_dir.name, "embeddings.npy")
+        self.ids_path = os.path.join(self.temp_dir.name, "ids.json")
+
+        rng = np.random.default_rng(0)
+        self.embeddings = rng.normal(size=(50, 8)).astype(np.float32)
+        self.embeddings /= np.linalg.norm(self.embeddings, axis=1, keepdims=True)
+        self.ids = [f"icon-{i}-bold" for i in range(50)]
+        self.query_embeddings = {
+            "chart": rng.normal(size=8).astype(np.float32),
+            "rocket": rng.normal(size=8).astype(np.float32),
+        }
+
+        np.save(self.embeddings_path, self.embeddings)
+        with open(self.ids_path, "w") as f:
+            json.dump(self.ids, f)
+
+        self.index = NumpyIconIndex(self.embeddings_path, self.ids_path)
+        self.index._embedding_function = lambda queries: [
+            self.query_embeddings[query] for query in queries
+        ]
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def test_query_returns_exact_top_k_by_cosine_similarity(self):
+        results = self.index.query(["chart", "rocket"], 5)
+
+        for query, result in zip(["chart", "rocket"], results):
+            query_embedding = self.query_embeddings[query]
+            scores = self.embeddings @ (
+                query_embedding / np.linalg.norm(query_embedding)
+            )
+            expected = [self.ids[i] for i in np.argsort(-scores)[:5]]
+            assert result == expected
+
+    def test_embeddings_are_memory_mapped(self):
+        assert isinstance(self.index.embeddings, np.memmap)
+
+    def test_k_is_capped_by_number_of_icons(self):
+        assert len(self.index.query(["chart"], 100)[0]) == 50
+        assert self.index.query(["chart"], 0) == [[]]
+
+    def test_chromadb_is_not_imported(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys\n"
+                "from services.icon_index import NumpyIconIndex\n"
+                "assert 'chromadb' not in sys.modules",
+            ],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
@@ -0,0 +1,165 @@
+import asyncio
+import os
+import time
+import uuid
+from unittest.mock import patch
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.image_prompt import ImagePrompt
+from models.sql.image_asset import ImageAsset
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.image_asset_cache import ImageAssetCache
+from services.image_generation_service import ImageGenerationService
+
+
+class TestImageAssetCache:
+
+    def write_image(self, tmp_path, name: str, size: int = 10) -> str:
+        path = str(tmp_path / name)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        return path
+
+    def test_key_normalizes_prompts(self, tmp_path):
+        cache = ImageAssetCache(db_path=str(tmp_path / "cache.db"))
+
+        key = cache.get_key("A sunset over  mountains.", None, "pexels", "large")
+
+        assert key == cache.get_key(" a sunset over mountains", "", "pexels", "large")
+        assert key != cache.get_key("A sunset over mountains", None, "pixabay", "large")
+        assert key != cache.get_key(
+            "A sunset over mountains", "dark", "pexels", "large"
+        )
+
+    def test_get_and_set(self, tmp_path):
+        cache = ImageAssetCache(db_path=str(tmp_path / "cache.db"))
+        image_path = self.write_image(tmp_path, "image.jpg")
+
+        cache.set_sync("url", "https://images.pexels.com/photo.jpg")
+        cache.set_sync("file", image_path)
+
+        assert cache.get_sync("url") == "https://images.pexels.com/photo.jpg"
+        assert cache.get_sync("file") == image_path
+        os.remove(image_path)
+        assert cache.get_sync("file") is None
+        assert cache.get_sync("missing") is None
+
+    def test_expired_entries_are_dropped(self, tmp_path):
+        cache = ImageAssetCache(db_path=str(tmp_path / "cache.db"), ttl=60)
+        cache.set_sync("key", "https://images.pexels.com/photo.jpg")
+
+        with patch(
+            "services.image_asset_cache.time.time", return_value=time.time() + 120
+        ):
+            assert cache.get_sync("key") is None
+        assert cache.evictions == 1
+
+    def test_least_recently_used_files_are_evicted(self, tmp_path):
+        cache = ImageAssetCache(db_path=str(tmp_path / "cache.db"), max_size=25)
+        first = self.write_image(tmp_path, "first.jpg")
+        second = self.write_image(tmp_path, "second.jpg")
+
+        cache.set_sync("first", first)
+        cache.set_sync("second", second)
+        # Touch first so second becomes the least recently used entry
+        cache.get_sync("first")
+        evicted_paths = cache.set_sync("third", self.write_image(tmp_path, "third.jpg"))
+
+        assert evicted_paths == [second]
+        assert cache.get_sync("first") == first
+        assert cache.get_sync("second") is None
+
+    def test_evicted_files_are_deleted_unless_used_by_slides(self, tmp_path):
+        cache = ImageAssetCache(db_path=str(tmp_path / "cache.db"))
+        used = self.write_image(tmp_path, "used.jpg")
+        unused = self.write_image(tmp_path, "unused.jpg")
+
+        async def run():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(
+                    lambda sync_conn: SQLModel.metadata.create_all(
+                        sync_conn,
+                        tables=[
+                            PresentationModel.__table__,
+                            SlideModel.__table__,
+                            ImageAsset.__table__,
+                        ],
+                    )
+                )
+            session_maker = async_sessionmaker(engine, expire_on_commit=False)
+            async with session_maker() as session:
+                session.add(
+                    SlideModel(
+                        presentation=uuid.uuid4(),
+                        layout_group="general",
+                        layout="general:image",
+                        index=0,
+                        content={"image": {"__image_url__": used}},
+                    )
+                )
+                session.add(ImageAsset(path=unused))
+                await session.commit()
+
+            with patch("services.database.async_session_maker", session_maker):
+                await cache.delete_unused_files([used, unused])
+
+            async with session_maker() as session:
+                assets = (await session.scalars(select(ImageAsset))).all()
+            await engine.dispose()
+            return assets
+
+        assets = asyncio.run(run())
+
+        assert os.path.exists(used)
+        assert not os.path.exists(unused)
+        assert assets == []
+
+
+class TestImageGenerationServiceCache:
+
+    def setup_method(self):
+        self.calls = []
+
+    async def get_image_from_pexels(self, prompt: str) -> str:
+        self.calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return f"https://images.pexels.com/{len(self.calls)}.jpg"
+
+    def generate_images(self, tmp_path, prompts, force_fresh=False):
+        cache = ImageAssetCache(db_path=str(tmp_path / "cache.db"))
+
+        async def run():
+            service = ImageGenerationService(str(tmp_path), force_fresh)
+            service.image_gen_func = self.get_image_from_pexels
+            return await asyncio.gather(
+                *[service.generate_image(ImagePrompt(prompt=p)) for p in prompts]
+            )
+
+        with patch.dict(
+            os.environ, {"IMAGE_PROVIDER": "pexels", "IMAGE_ASSET_CACHE": "true"}
+        ), patch("services.image_generation_service.IMAGE_ASSET_CACHE", cache):
+            return asyncio.run(run()), cache
+
+    def test_identical_prompts_are_fetched_once(self, tmp_path):
+        images, cache = self.generate_images(
+            tmp_path, ["Team meeting", "team meeting.", "Office"]
+        )
+        images_again, _ = self.generate_images(tmp_path, ["Team meeting"])
+
+        # Either spelling of the duplicated prompt may be fetched first
+        assert len(self.calls) == 2 and "Office" in self.calls
+        assert images[0] == images[1] == images_again[0]
+        assert cache.deduplicated == 1
+
+    def test_force_fresh_generates_new_images(self, tmp_path):
+        self.generate_images(tmp_path, ["Team meeting"])
+        images, _ = self.generate_images(tmp_path, ["Team meeting"], force_fresh=True)
+        images_again, _ = self.generate_images(tmp_path, ["Team meeting"])
+
+        assert len(self.calls) == 2
+        # Fresh image replaces the cached one
+        assert images_again == images
@@ -134,7 +134,12 @@ class TestImageGenerationService:
                                 })
                                 
                                 mock_session = AsyncMock()
-                                mock_session.get = AsyncMock(return_value=mock_response)
+                                mock_response.status = 200
+                                mock_response.headers = {}
+                                mock_response.raise_for_status = Mock()
+                                mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+                                mock_response.__aexit__ = AsyncMock(return_value=None)
+                                mock_session.get = Mock(return_value=mock_response)
                                 mock_session.__aenter__ = AsyncMock(return_value=mock_session)
                                 mock_session.__aexit__ = AsyncMock(return_value=None)
                                 
@@ -246,7 +251,12 @@ class TestImageGenerationService:
                 })
                 
                 mock_session = AsyncMock()
-                mock_session.get = AsyncMock(return_value=mock_response)
+                mock_response.status = 200
+                mock_response.headers = {}
+                mock_response.raise_for_status = Mock()
+                mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+                mock_response.__aexit__ = AsyncMock(return_value=None)
+                mock_session.get = Mock(return_value=mock_response)
                 mock_session.__aenter__ = AsyncMock(return_value=mock_session)
                 mock_session.__aexit__ = AsyncMock(return_value=None)
                 
@@ -277,7 +287,12 @@ class TestImageGenerationService:
                 })
                 
                 mock_session = AsyncMock()
-                mock_session.get = AsyncMock(return_value=mock_response)
+                mock_response.status = 200
+                mock_response.headers = {}
+                mock_response.raise_for_status = Mock()
+                mock_response.__aenter__ = AsyncMock(return_value=mock_response)
+                mock_response.__aexit__ = AsyncMock(return_value=None)
+                mock_session.get = Mock(return_value=mock_response)
                 mock_session.__aenter__ = AsyncMock(return_value=mock_session)
                 mock_session.__aexit__ = AsyncMock(return_value=None)
                 
@@ -374,6 +389,25 @@ class TestImageGenerationEndpoint:
                 
                 assert response.status_code == 200
 
+    def test_generate_image_endpoint_force_fresh(self, client, mock_images_directory):
+        """
+        Test the endpoint passes force_fresh to the image generation service
+        - Ensures that cached images are only bypassed when asked for
+        """
+        with patch('api.v1.ppt.endpoints.images.get_images_directory', return_value=mock_images_directory):
+            with patch('api.v1.ppt.endpoints.images.ImageGenerationService') as mock_service_class:
+                mock_service_instance = Mock()
+                mock_service_instance.generate_image = AsyncMock(return_value="https://example.com/image.jpg")
+                mock_service_class.return_value = mock_service_instance
+
+                client.get("/images/generate?prompt=test")
+                client.get("/images/generate?prompt=test&force_fresh=true")
+
+                assert [call.args for call in mock_service_class.call_args_list] == [
+                    (mock_images_directory, False),
+                    (mock_images_directory, True),
+                ]
+
     def test_generate_image_endpoint_with_async_client(self, mock_images_directory):
         """
         Test the image generation endpoint using an async client
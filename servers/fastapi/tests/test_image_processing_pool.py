@@ -0,0 +1,256 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image, ImageChops
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+from api.v1.ppt.endpoints.presentation import PRESENTATION_ROUTER
+from models.pptx_models import (
+    PptxBoxShapeEnum,
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services.image_processing_pool import ImageProcessingPool
+from services.pptx_presentation_creator import (
+    PptxPresentationCreator,
+    get_pptx_image_dpi,
+)
+from utils.image_utils import (
+    get_picture_transform_params,
+    transform_picture,
+    transform_picture_file,
+)
+
+
+def create_picture_model(image_path: str, **kwargs) -> PptxPictureBoxModel:
+    return PptxPictureBoxModel(
+        position=PptxPositionModel(left=10, top=10, width=200, height=120),
+        picture=PptxPictureModel(is_network=False, path=image_path),
+        **kwargs,
+    )
+
+
+class TestImageProcessingPool:
+
+    def setup_method(self):
+        self.env = patch.dict(os.environ, {"IMAGE_PROCESSING_WORKERS": "2"})
+        self.env.start()
+
+    def teardown_method(self):
+        self.env.stop()
+
+    def save_image(self, tmp_path, name: str, color) -> str:
+        path = str(tmp_path / name)
+        Image.new("RGB", (400, 300), color).save(path)
+        return path
+
+    def test_pictures_without_transforms_are_unchanged(self, tmp_path):
+        picture_model = create_picture_model("image.png", clip=False)
+
+        assert get_picture_transform_params(picture_model) is None
+        assert get_picture_transform_params(
+            create_picture_model("image.png", border_radius=[10, 10, 10, 10])
+        )
+
+    def test_pictures_are_transformed_once_and_cached(self, tmp_path):
+        red = self.save_image(tmp_path, "red.png", "red")
+        blue = self.save_image(tmp_path, "blue.png", "blue")
+        cover = get_picture_transform_params(
+            create_picture_model(
+                red,
+                border_radius=[20, 20, 20, 20],
+                object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.COVER),
+            )
+        )
+        circle = get_picture_transform_params(
+            create_picture_model(red, shape=PptxBoxShapeEnum.CIRCLE, opacity=0.5)
+        )
+        pictures = [
+            (red, cover),
+            (blue, cover),
+            (red, cover),
+            (red, circle),
+            (str(tmp_path / "missing.png"), cover),
+        ]
+        pool = ImageProcessingPool(cache_dir=str(tmp_path / "cache"))
+
+        try:
+            paths = asyncio.run(pool.process_pictures(pictures))
+            paths_again = asyncio.run(pool.process_pictures(pictures[:4]))
+        finally:
+            pool.shutdown()
+
+        assert paths[0] == paths[2] and len(set(paths[:4])) == 3
+        assert paths[4] is None
+        assert paths_again == paths[:4]
+        assert pool.get_stats()["misses"] == 3
+        assert pool.get_stats()["hits"] == 4
+        # Results match transforming the picture on the event loop
+        with Image.open(red) as image:
+            expected = transform_picture(image, cover)
+        with Image.open(paths[0]) as image:
+            assert image.size == (200, 120)
+            assert not ImageChops.difference(image, expected).getbbox()
+
+    def test_least_recently_used_results_are_evicted(self, tmp_path):
+        images = [
+            self.save_image(tmp_path, f"{color}.png", color)
+            for color in ["red", "green", "blue"]
+        ]
+        params = get_picture_transform_params(create_picture_model(images[0]))
+        pool = ImageProcessingPool(cache_dir=str(tmp_path / "cache"), max_size=1)
+
+        with patch("services.image_processing_pool.PROCESSED_IMAGE_CACHE_MIN_AGE", 0):
+            try:
+                paths = asyncio.run(
+                    pool.process_pictures([(image, params) for image in images])
+                )
+            finally:
+                pool.shutdown()
+
+        assert all(paths)
+        assert os.listdir(tmp_path / "cache") == []
+        assert pool.evictions == 3
+
+
+class TestPptxPresentationCreatorPictures:
+
+    def test_pictures_are_processed_before_slides_are_added(self, tmp_path):
+        image_path = str(tmp_path / "photo.png")
+        Image.new("RGB", (400, 300), "red").save(image_path)
+        pptx_model = PptxPresentationModel(
+            slides=[
+                PptxSlideModel(
+                    shapes=[
+                        create_picture_model(image_path),
+                        create_picture_model(image_path, invert=True),
+                        create_picture_model(str(tmp_path / "missing.png")),
+                    ]
+                )
+                for _ in range(3)
+            ]
+        )
+        pool = ImageProcessingPool(cache_dir=str(tmp_path / "cache"))
+
+        with patch.dict(os.environ, {"IMAGE_PROCESSING_WORKERS": "2"}), patch(
+            "services.pptx_presentation_creator.IMAGE_PROCESSING_POOL", pool
+        ):
+            try:
+                creator = PptxPresentationCreator(pptx_model, str(tmp_path))
+                asyncio.run(creator.create_ppt())
+            finally:
+                pool.shutdown()
+
+        for slide in creator._ppt.slides:
+            assert [shape.shape_type for shape in slide.shapes] == [
+                MSO_SHAPE_TYPE.PICTURE
+            ] * 2
+        assert pool.get_stats()["misses"] == 2
+        assert pool.get_stats()["failures"] == 3
+
+    def test_pictures_failed_by_the_pool_are_transformed_inline(self, tmp_path):
+        image_path = str(tmp_path / "photo.png")
+        Image.new("RGB", (400, 300), "red").save(image_path)
+        pptx_model = PptxPresentationModel(
+            slides=[
+                PptxSlideModel(
+                    shapes=[
+                        create_picture_model(image_path),
+                        create_picture_model(str(tmp_path / "missing.png")),
+                    ]
+                )
+            ]
+        )
+
+        async def process_pictures(pictures):
+            # Pool broke, e.g. a worker was killed
+            return [None] * len(pictures)
+
+        with patch(
+            "services.pptx_presentation_creator.IMAGE_PROCESSING_POOL.process_pictures",
+            process_pictures,
+        ):
+            creator = PptxPresentationCreator(pptx_model, str(tmp_path))
+            asyncio.run(creator.create_ppt())
+
+        [slide] = creator._ppt.slides
+        assert [shape.shape_type for shape in slide.shapes] == [MSO_SHAPE_TYPE.PICTURE]
+
+
+class TestPptxImageResampling:
+
+    def test_pictures_are_resampled_to_dpi(self, tmp_path):
+        photo = str(tmp_path / "photo.png")
+        Image.effect_noise((1500, 1000), 40).convert("RGB").save(photo)
+        params = get_picture_transform_params(
+            create_picture_model(photo, clip=False), image_dpi=144
+        )
+        rounded_params = get_picture_transform_params(
+            create_picture_model(photo, border_radius=[8, 8, 8, 8]), image_dpi=144
+        )
+
+        path = transform_picture_file(photo, str(tmp_path / "photo_144"), params)
+        rounded_path = transform_picture_file(
+            photo, str(tmp_path / "rounded_144"), rounded_params
+        )
+
+        # Box of 200x120 points at twice 72 DPI
+        with Image.open(path) as image:
+            assert (image.format, image.size) == ("JPEG", (360, 240))
+        with Image.open(rounded_path) as image:
+            assert (image.format, image.size) == ("PNG", (400, 240))
+        assert os.path.getsize(path) < os.path.getsize(photo) / 10
+
+    def test_export_reports_bytes_saved(self, tmp_path):
+        photo = str(tmp_path / "photo.png")
+        Image.effect_noise((1500, 1000), 40).convert("RGB").save(photo)
+        pptx_model = PptxPresentationModel(
+            slides=[
+                PptxSlideModel(shapes=[create_picture_model(photo, clip=False)])
+                for _ in range(3)
+            ]
+        )
+        pool = ImageProcessingPool(cache_dir=str(tmp_path / "cache"))
+
+        reports = []
+        with patch.dict(os.environ, {"IMAGE_PROCESSING_WORKERS": "1"}), patch(
+            "services.pptx_presentation_creator.IMAGE_PROCESSING_POOL", pool
+        ):
+            try:
+                for image_dpi in [None, 150]:
+                    creator = PptxPresentationCreator(
+                        pptx_model, str(tmp_path), image_dpi
+                    )
+                    asyncio.run(creator.create_ppt())
+                    reports.append(creator.image_report)
+            finally:
+                pool.shutdown()
+
+        # The same picture on every slide is embedded once
+        assert [report.embedded_images for report in reports] == [1, 1]
+        assert reports[0].bytes_saved == 0
+        assert reports[1].bytes_saved > reports[1].source_bytes * 0.9
+
+    def test_dpi_out_of_bounds_is_rejected(self):
+        app = FastAPI()
+        app.include_router(PRESENTATION_ROUTER)
+        client = TestClient(app)
+
+        for image_dpi in [0, -72, 601]:
+            response = client.post(
+                f"/presentation/export/pptx?image_dpi={image_dpi}",
+                json={"slides": []},
+            )
+            assert response.status_code == 422
+
+        for env_dpi, image_dpi in [("96", 96), ("-72", None), ("1200", None)]:
+            with patch.dict(os.environ, {"PPTX_IMAGE_DPI": env_dpi}):
+                assert get_pptx_image_dpi() == image_dpi
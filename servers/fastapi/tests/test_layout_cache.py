@@ -0,0 +1,172 @@
+import asyncio
+import uuid
+from unittest.mock import patch
+
+import pytest
+from aiohttp import web
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from api.v1.ppt.endpoints.slide_to_html import (
+    LayoutData,
+    SaveLayoutsRequest,
+    save_layouts,
+)
+from models.presentation_layout import PresentationLayoutModel
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from services.layout_cache import LayoutCache
+from services.renderer_client import RendererClient
+from services.state_store import InMemoryStateStore
+from utils.get_layout_by_name import get_layout_by_name
+
+
+class StubRenderer:
+    """
+    Serves layouts of groups like the /api/layout route of the Next.js app.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.peers = set()
+
+    async def layout(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        group = request.query["group"]
+        if group == "missing":
+            return web.Response(status=500, text="No layouts")
+        return web.json_response(
+            {
+                "name": group,
+                "ordered": False,
+                "slides": [{"id": f"{group}:title", "json_schema": {}}],
+            }
+        )
+
+    async def run(self, callback):
+        app = web.Application()
+        app.router.add_get("/api/layout", self.layout)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        client = RendererClient(f"http://127.0.0.1:{runner.addresses[0][1]}")
+        try:
+            with patch("utils.get_layout_by_name.RENDERER_CLIENT", client):
+                return await callback()
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+
+class TestLayoutCache:
+
+    def run(self, renderer, cache, callback):
+        with patch("utils.get_layout_by_name.LAYOUT_CACHE", cache):
+            return asyncio.run(renderer.run(callback))
+
+    def test_layouts_are_fetched_once_per_group(self):
+        renderer = StubRenderer()
+        cache = LayoutCache(ttl=60, state_store=InMemoryStateStore())
+
+        async def callback():
+            layouts = [await get_layout_by_name("general") for _ in range(3)]
+            layouts.append(await get_layout_by_name("modern"))
+            return layouts
+
+        layouts = self.run(renderer, cache, callback)
+
+        assert [layout.name for layout in layouts] == ["general"] * 3 + ["modern"]
+        assert renderer.requests == 2
+        assert len(renderer.peers) == 1
+        # Callers get their own copy
+        layouts[0].slides.clear()
+        assert len(layouts[1].slides) == 1
+        assert cache.get_stats()["hits"] == 2
+
+    def test_invalidated_and_expired_layouts_are_fetched_again(self):
+        renderer = StubRenderer()
+        cache = LayoutCache(ttl=60, state_store=InMemoryStateStore())
+
+        async def callback():
+            await get_layout_by_name("custom-1")
+            await cache.invalidate("custom-1")
+            await get_layout_by_name("custom-1")
+            cache._ttl = 0
+            await cache.invalidate()
+            await get_layout_by_name("custom-1")
+            await get_layout_by_name("custom-1")
+
+        self.run(renderer, cache, callback)
+
+        assert renderer.requests == 4
+        assert cache.get_stats()["entries"] == 0
+
+    def test_invalidations_reach_workers_sharing_the_state_store(self):
+        renderer = StubRenderer()
+        state_store = InMemoryStateStore()
+        cache = LayoutCache(ttl=60, state_store=state_store)
+        other_worker_cache = LayoutCache(ttl=60, state_store=state_store)
+
+        async def callback():
+            await get_layout_by_name("custom-1")
+            await get_layout_by_name("general")
+            # Template saved through another worker
+            await other_worker_cache.invalidate("custom-1")
+            await get_layout_by_name("custom-1")
+            await get_layout_by_name("general")
+
+        self.run(renderer, cache, callback)
+
+        assert renderer.requests == 3
+        assert cache.get_stats()["hits"] == 1
+
+    def test_missing_layouts_are_not_cached(self):
+        renderer = StubRenderer()
+        cache = LayoutCache(ttl=60, state_store=InMemoryStateStore())
+
+        async def callback():
+            for _ in range(2):
+                with pytest.raises(HTTPException) as error:
+                    await get_layout_by_name("missing")
+                assert error.value.status_code == 404
+
+        self.run(renderer, cache, callback)
+
+        assert renderer.requests == 2
+
+    def test_saving_templates_invalidates_their_layouts(self, tmp_path):
+        presentation = uuid.uuid4()
+        cache = LayoutCache(ttl=60, state_store=InMemoryStateStore())
+        for group in [f"custom-{presentation}", "general"]:
+            cache.set(group, PresentationLayoutModel(name=group, slides=[]), (0, 0))
+
+        async def run():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(
+                    lambda sync_conn: SQLModel.metadata.create_all(
+                        sync_conn, tables=[PresentationLayoutCodeModel.__table__]
+                    )
+                )
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                await save_layouts(
+                    SaveLayoutsRequest(
+                        layouts=[
+                            LayoutData(
+                                presentation=presentation,
+                                layout_id="title",
+                                layout_name="Title",
+                                layout_code="export default function Title() {}",
+                            )
+                        ]
+                    ),
+                    session,
+                )
+            await engine.dispose()
+
+        with patch("api.v1.ppt.endpoints.slide_to_html.LAYOUT_CACHE", cache):
+            asyncio.run(run())
+
+        assert list(cache._entries) == ["general"]
@@ -0,0 +1,106 @@
+import asyncio
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import threading
+from unittest.mock import patch
+
+import httpx
+
+from services.llm_client import LLMClient, LLMClientRegistry
+
+
+def create_llm_client(registry: LLMClientRegistry) -> LLMClient:
+    with patch("services.llm_client.LLM_CLIENT_REGISTRY", registry):
+        return LLMClient()
+
+
+class TestLLMClientRegistry:
+
+    def test_reuses_client_for_same_provider_and_key(self):
+        registry = LLMClientRegistry()
+
+        async def run_test():
+            with patch.dict(os.environ, {"LLM": "openai", "OPENAI_API_KEY": "key-1"}):
+                first = create_llm_client(registry)
+                second = create_llm_client(registry)
+            return first, second
+
+        first, second = asyncio.run(run_test())
+        assert first._client is second._client
+        assert registry.clients_created == 1
+        assert registry.clients_reused == 1
+
+    def test_creates_new_client_when_key_changes(self):
+        registry = LLMClientRegistry()
+
+        async def run_test():
+            with patch.dict(os.environ, {"LLM": "openai", "OPENAI_API_KEY": "key-1"}):
+                first = create_llm_client(registry)
+            with patch.dict(os.environ, {"LLM": "openai", "OPENAI_API_KEY": "key-2"}):
+                second = create_llm_client(registry)
+            return first, second
+
+        first, second = asyncio.run(run_test())
+        assert first._client is not second._client
+        assert second._client.api_key == "key-2"
+        assert registry.clients_created == 2
+
+    def test_invalidate_drops_clients(self):
+        registry = LLMClientRegistry()
+
+        async def run_test():
+            with patch.dict(os.environ, {"LLM": "anthropic", "ANTHROPIC_API_KEY": "key"}):
+                first = create_llm_client(registry)
+                registry.invalidate()
+                second = create_llm_client(registry)
+            return first, second
+
+        first, second = asyncio.run(run_test())
+        assert first._client is not second._client
+
+    def test_recreates_client_for_new_event_loop(self):
+        registry = LLMClientRegistry()
+
+        async def run_test():
+            with patch.dict(os.environ, {"LLM": "openai", "OPENAI_API_KEY": "key"}):
+                return create_llm_client(registry)
+
+        first = asyncio.run(run_test())
+        second = asyncio.run(run_test())
+        assert first._client is not second._client
+
+    def test_counts_requests_and_opened_connections(self):
+        registry = LLMClientRegistry()
+
+        class KeepAliveHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+        async def run_test():
+            async with httpx.AsyncClient(
+                **registry.get_async_http_client_args()
+            ) as client:
+                for _ in range(3):
+                    await client.get(url)
+
+        try:
+            asyncio.run(run_test())
+        finally:
+            server.shutdown()
+
+        stats = registry.get_stats()
+        assert stats["requests_sent"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 2
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import time
+from unittest.mock import AsyncMock, patch
+
+from models.llm_message import LLMSystemMessage, LLMUserMessage
+from services.llm_client import LLMClient
+from services.llm_response_cache import LLMResponseCache
+
+
+def get_messages(timestamp: str, outline: str = "Slide about AI"):
+    return [
+        LLMSystemMessage(content="Generate structured slide"),
+        LLMUserMessage(
+            content=f"## Current Date and Time\n{timestamp}\n\n## Slide Outline\n{outline}"
+        ),
+    ]
+
+
+class TestLLMResponseCache:
+
+    def test_key_ignores_volatile_timestamps(self, tmp_path):
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+        schema = {"type": "object"}
+
+        first = cache.get_key(
+            "generate_structured", "openai", "gpt", get_messages("2025-01-01 10:00:00"), schema
+        )
+        second = cache.get_key(
+            "generate_structured", "openai", "gpt", get_messages("2025-06-30 23:59:59"), schema
+        )
+        other_outline = cache.get_key(
+            "generate_structured",
+            "openai",
+            "gpt",
+            get_messages("2025-01-01 10:00:00", "Slide about ML"),
+            schema,
+        )
+        other_model = cache.get_key(
+            "generate_structured", "openai", "gpt-mini", get_messages("2025-01-01 10:00:00"), schema
+        )
+
+        assert first == second
+        assert first != other_outline
+        assert first != other_model
+
+    def test_get_and_set(self, tmp_path):
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+
+        assert cache.get_sync("key") is None
+        cache.set_sync("key", {"title": "Hello"})
+
+        assert cache.get_sync("key") == {"title": "Hello"}
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_expired_entries_are_dropped(self, tmp_path):
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"), ttl=60)
+        cache.set_sync("key", "value")
+
+        with patch("services.llm_response_cache.time.time", return_value=time.time() + 120):
+            assert cache.get_sync("key") is None
+        assert cache.evictions == 1
+
+    def test_least_recently_used_entries_are_evicted(self, tmp_path):
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"), max_size=25)
+
+        cache.set_sync("first", "a" * 8)
+        cache.set_sync("second", "b" * 8)
+        # Touch first so second becomes the least recently used entry
+        cache.get_sync("first")
+        cache.set_sync("third", "c" * 8)
+
+        assert cache.get_sync("first") == "a" * 8
+        assert cache.get_sync("second") is None
+        assert cache.get_sync("third") == "c" * 8
+
+
+class TestLLMClientResponseCache:
+
+    def test_generate_structured_uses_cache(self, tmp_path):
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+        generate = AsyncMock(return_value={"title": "Cached"})
+
+        async def run_test():
+            client = LLMClient()
+            with patch.object(client, "_generate_openai_structured", generate):
+                first = await client.generate_structured(
+                    "gpt", get_messages("2025-01-01 10:00:00"), {"type": "object"}
+                )
+                second = await client.generate_structured(
+                    "gpt", get_messages("2025-01-02 11:00:00"), {"type": "object"}
+                )
+            return first, second
+
+        env = {"LLM": "openai", "OPENAI_API_KEY": "key", "LLM_RESPONSE_CACHE": "true"}
+        with patch.dict(os.environ, env):
+            with patch("services.llm_client.LLM_RESPONSE_CACHE", cache):
+                first, second = asyncio.run(run_test())
+
+        assert first == second == {"title": "Cached"}
+        assert generate.await_count == 1
+        assert cache.hits == 1
+
+    def test_stream_structured_uses_cache(self, tmp_path):
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+        calls = 0
+
+        async def stream(**kwargs):
+            nonlocal calls
+            calls += 1
+            for chunk in ['{"slides": ', "[]", "}"]:
+                yield chunk
+
+        async def collect(client: LLMClient):
+            chunks = []
+            async for chunk in client.stream_structured(
+                "gpt", get_messages("2025-01-01 10:00:00"), {"type": "object"}
+            ):
+                chunks.append(chunk)
+            return "".join(chunks)
+
+        async def run_test():
+            client = LLMClient()
+            with patch.object(client, "_stream_openai_structured", stream):
+                return await collect(client), await collect(client)
+
+        env = {"LLM": "openai", "OPENAI_API_KEY": "key", "LLM_RESPONSE_CACHE": "true"}
+        with patch.dict(os.environ, env):
+            with patch("services.llm_client.LLM_RESPONSE_CACHE", cache):
+                first, second = asyncio.run(run_test())
+
+        assert first == second == '{"slides": []}'
+        assert calls == 1
+
+    def test_cache_is_opt_in(self, tmp_path):
+        cache = LLMResponseCache(db_path=str(tmp_path / "cache.db"))
+        generate = AsyncMock(return_value={"title": "Fresh"})
+
+        async def run_test():
+            client = LLMClient()
+            with patch.object(client, "_generate_openai_structured", generate):
+                for _ in range(2):
+                    await client.generate_structured(
+                        "gpt", get_messages("2025-01-01 10:00:00"), {"type": "object"}
+                    )
+
+        env = {"LLM": "openai", "OPENAI_API_KEY": "key", "LLM_RESPONSE_CACHE": "false"}
+        with patch.dict(os.environ, env):
+            with patch("services.llm_client.LLM_RESPONSE_CACHE", cache):
+                asyncio.run(run_test())
+
+        assert generate.await_count == 2
+        assert cache.get_stats()["misses"] == 0
@@ -0,0 +1,178 @@
+import asyncio
+import os
+from unittest.mock import patch
+
+from lxml.etree import tostring
+from PIL import Image
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+
+from models.pptx_models import (
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxParagraphModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+    PptxTextBoxModel,
+)
+from services.image_processing_pool import ImageProcessingPool
+from services.pptx_presentation_creator import PptxPresentationCreator
+from services.pptx_slide_cache import PptxSlideCache
+
+
+def create_slide_model(title: str, image_path: str) -> PptxSlideModel:
+    return PptxSlideModel(
+        note=f"Notes of {title}",
+        shapes=[
+            PptxTextBoxModel(
+                position=PptxPositionModel(left=40, top=40, width=600, height=80),
+                paragraphs=[PptxParagraphModel(text=title)],
+            ),
+            PptxPictureBoxModel(
+                position=PptxPositionModel(left=40, top=160, width=300, height=200),
+                picture=PptxPictureModel(is_network=False, path=image_path),
+                border_radius=[12, 12, 12, 12],
+                object_fit=PptxObjectFitModel(fit=PptxObjectFitEnum.COVER),
+            ),
+        ],
+    )
+
+
+def get_shapes_xml(slide) -> bytes:
+    return tostring(slide.shapes._spTree, method="c14n", exclusive=True)
+
+
+def get_slide_images(slide):
+    return [
+        relationship.target_part.blob
+        for relationship in slide.part.rels.values()
+        if relationship.reltype == RT.IMAGE
+    ]
+
+
+class TestPptxSlideCache:
+
+    def setup_method(self):
+        self.env = patch.dict(os.environ, {"IMAGE_PROCESSING_WORKERS": "1"})
+        self.env.start()
+
+    def teardown_method(self):
+        self.env.stop()
+
+    def save_images(self, tmp_path):
+        paths = []
+        for color in ["red", "green", "blue"]:
+            path = str(tmp_path / f"{color}.png")
+            Image.new("RGB", (400, 300), color).save(path)
+            paths.append(path)
+        return paths
+
+    def export(self, tmp_path, slide_cache, pool, slide_models):
+        with patch(
+            "services.pptx_presentation_creator.PPTX_SLIDE_CACHE", slide_cache
+        ), patch("services.pptx_presentation_creator.IMAGE_PROCESSING_POOL", pool):
+            creator = PptxPresentationCreator(
+                PptxPresentationModel(slides=slide_models), str(tmp_path)
+            )
+            asyncio.run(creator.create_ppt())
+        return creator
+
+    def test_only_changed_slides_are_built_again(self, tmp_path):
+        images = self.save_images(tmp_path)
+        slide_cache = PptxSlideCache(cache_dir=str(tmp_path / "slides"))
+        pool = ImageProcessingPool(cache_dir=str(tmp_path / "images"))
+
+        try:
+            full = self.export(
+                tmp_path,
+                slide_cache,
+                pool,
+                [create_slide_model(f"Slide {i}", images[i]) for i in range(3)],
+            )
+            incremental = self.export(
+                tmp_path,
+                slide_cache,
+                pool,
+                [
+                    create_slide_model("Slide 0", images[0]),
+                    create_slide_model("Edited slide", images[0]),
+                    create_slide_model("Slide 2", images[2]),
+                ],
+            )
+        finally:
+            pool.shutdown()
+
+        assert slide_cache.get_stats()["stores"] == 4
+        assert slide_cache.get_stats()["hits"] == 2
+        # Pictures of restored slides are not transformed again
+        assert pool.get_stats()["misses"] + pool.get_stats()["hits"] == 4
+
+        full_slides = list(full._ppt.slides)
+        incremental_slides = list(incremental._ppt.slides)
+        for index in [0, 2]:
+            assert get_shapes_xml(incremental_slides[index]) == get_shapes_xml(
+                full_slides[index]
+            )
+            assert get_slide_images(incremental_slides[index]) == get_slide_images(
+                full_slides[index]
+            )
+        assert incremental_slides[1].shapes[0].text_frame.text == "Edited slide"
+        # Only pictures of the built slide are reported
+        assert incremental.image_report.embedded_images == 1
+
+        pptx_path = str(tmp_path / "deck.pptx")
+        incremental.save(pptx_path)
+        slides = list(Presentation(pptx_path).slides)
+        assert [slide.notes_slide.notes_text_frame.text for slide in slides] == [
+            "Notes of Slide 0",
+            "Notes of Edited slide",
+            "Notes of Slide 2",
+        ]
+        assert all(len(get_slide_images(slide)) == 1 for slide in slides)
+        # Identical images of built and restored slides are embedded once
+        image_parts = {
+            relationship.target_part.partname
+            for slide in slides
+            for relationship in slide.part.rels.values()
+            if relationship.reltype == RT.IMAGE
+        }
+        assert len(image_parts) == 2
+
+    def test_slides_with_missing_pictures_are_not_cached(self, tmp_path):
+        slide_cache = PptxSlideCache(cache_dir=str(tmp_path / "slides"))
+        pool = ImageProcessingPool(cache_dir=str(tmp_path / "images"))
+
+        try:
+            creator = self.export(
+                tmp_path,
+                slide_cache,
+                pool,
+                [create_slide_model("Slide 0", str(tmp_path / "missing.png"))],
+            )
+        finally:
+            pool.shutdown()
+
+        assert len(creator._ppt.slides) == 1
+        assert slide_cache.get_stats()["stores"] == 0
+
+    def test_disabled_cache_builds_every_slide(self, tmp_path):
+        images = self.save_images(tmp_path)
+        slide_cache = PptxSlideCache(cache_dir=str(tmp_path / "slides"), max_size=0)
+        pool = ImageProcessingPool(cache_dir=str(tmp_path / "images"))
+
+        try:
+            for _ in range(2):
+                self.export(
+                    tmp_path,
+                    slide_cache,
+                    pool,
+                    [create_slide_model("Slide 0", images[0])],
+                )
+        finally:
+            pool.shutdown()
+
+        assert slide_cache.get_stats()["hits"] == 0
+        assert slide_cache.get_stats()["stores"] == 0
@@ -0,0 +1,196 @@
+import asyncio
+import os
+import tempfile
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from models.generate_presentation_request import (
+    GeneratePresentationAsyncRequest,
+    GeneratePresentationRequest,
+)
+from models.presentation_and_path import PresentationPathAndEditPath
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
+from services.presentation_generation_job_service import (
+    PresentationGenerationJobService,
+)
+
+
+class TestPresentationGenerationJobService:
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "jobs.db")
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    async def _get_session_maker(self):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{self.db_path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn, tables=[PresentationGenerationJobModel.__table__]
+                )
+            )
+        return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+    async def _create_job(self, session_maker, **kwargs):
+        job = PresentationGenerationJobModel(
+            request={"content": "Introduction to Machine Learning"}, **kwargs
+        )
+        async with session_maker() as session:
+            session.add(job)
+            await session.commit()
+        return job.id
+
+    async def _wait_for_jobs(self, service: PresentationGenerationJobService):
+        while service._tasks:
+            await asyncio.gather(*list(service._tasks.values()))
+
+    def test_job_completes_with_progress(self):
+        async def run():
+            engine, session_maker = await self._get_session_maker()
+            progress_updates = []
+
+            async def handler(request, presentation_id, sql_session, on_progress):
+                assert request.content == "Introduction to Machine Learning"
+                await on_progress("Generating slides", 50)
+                async with session_maker() as session:
+                    job = await session.get(PresentationGenerationJobModel, job_id)
+                    progress_updates.append((job.status, job.stage, job.progress))
+                return PresentationPathAndEditPath(
+                    presentation_id=presentation_id,
+                    path="/tmp/presentation.pptx",
+                    edit_path=f"/presentation?id={presentation_id}",
+                )
+
+            with patch(
+                "services.presentation_generation_job_service.async_session_maker",
+                session_maker,
+            ):
+                job_id = await self._create_job(session_maker)
+                service = PresentationGenerationJobService()
+                service.submit(job_id, handler)
+                await self._wait_for_jobs(service)
+
+            async with session_maker() as session:
+                job = await session.get(PresentationGenerationJobModel, job_id)
+            await engine.dispose()
+            return job, progress_updates
+
+        job, progress_updates = asyncio.run(run())
+
+        assert progress_updates == [("running", "Generating slides", 50)]
+        assert job.status == "completed"
+        assert job.progress == 100
+        assert job.result["path"] == "/tmp/presentation.pptx"
+        assert job.result["presentation_id"] == str(job.presentation)
+
+    def test_job_failure_is_recorded(self):
+        async def run():
+            engine, session_maker = await self._get_session_maker()
+
+            async def handler(*_):
+                raise HTTPException(status_code=400, detail="Failed to generate")
+
+            with patch(
+                "services.presentation_generation_job_service.async_session_maker",
+                session_maker,
+            ):
+                job_id = await self._create_job(session_maker)
+                service = PresentationGenerationJobService()
+                service.submit(job_id, handler)
+                await self._wait_for_jobs(service)
+
+            async with session_maker() as session:
+                job = await session.get(PresentationGenerationJobModel, job_id)
+            await engine.dispose()
+            return job
+
+        job = asyncio.run(run())
+
+        assert job.status == "failed"
+        assert job.error == "Failed to generate"
+
+    def test_concurrent_generations_are_capped(self):
+        async def run():
+            engine, session_maker = await self._get_session_maker()
+            running = 0
+            max_running = 0
+
+            async def handler(request, presentation_id, *_):
+                nonlocal running, max_running
+                running += 1
+                max_running = max(max_running, running)
+                await asyncio.sleep(0.05)
+                running -= 1
+                return PresentationPathAndEditPath(
+                    presentation_id=presentation_id,
+                    path="/tmp/presentation.pptx",
+                    edit_path=f"/presentation?id={presentation_id}",
+                )
+
+            with patch(
+                "services.presentation_generation_job_service.async_session_maker",
+                session_maker,
+            ), patch.dict(os.environ, {"MAX_CONCURRENT_GENERATIONS": "2"}):
+                service = PresentationGenerationJobService()
+                for _ in range(5):
+                    service.submit(await self._create_job(session_maker), handler)
+                await self._wait_for_jobs(service)
+
+            await engine.dispose()
+            return max_running
+
+        assert asyncio.run(run()) == 2
+
+    def test_resume_runs_unfinished_jobs(self):
+        async def run():
+            engine, session_maker = await self._get_session_maker()
+            handled = []
+
+            async def handler(request, presentation_id, *_):
+                handled.append(presentation_id)
+                return PresentationPathAndEditPath(
+                    presentation_id=presentation_id,
+                    path="/tmp/presentation.pptx",
+                    edit_path=f"/presentation?id={presentation_id}",
+                )
+
+            with patch(
+                "services.presentation_generation_job_service.async_session_maker",
+                session_maker,
+            ), patch.object(
+                PresentationGenerationJobService, "_delete_presentation"
+            ) as delete_presentation:
+                await self._create_job(session_maker, status="pending")
+                await self._create_job(session_maker, status="running")
+                await self._create_job(session_maker, status="completed")
+
+                service = PresentationGenerationJobService()
+                await service.resume(handler)
+                await self._wait_for_jobs(service)
+
+            await engine.dispose()
+            return handled, delete_presentation.await_count
+
+        handled, delete_count = asyncio.run(run())
+
+        assert len(handled) == 2
+        assert delete_count == 1
+
+    def test_webhook_url_is_only_accepted_as_http_on_async_requests(self):
+        request = GeneratePresentationAsyncRequest(
+            content="AI", webhook_url="https://example.com/hooks/presenton"
+        )
+
+        assert str(request.webhook_url) == "https://example.com/hooks/presenton"
+        for webhook_url in ["file:///etc/passwd", "ftp://example.com", "example"]:
+            with pytest.raises(ValidationError):
+                GeneratePresentationAsyncRequest(content="AI", webhook_url=webhook_url)
+        assert "webhook_url" not in GeneratePresentationRequest.model_fields
@@ -0,0 +1,163 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import event, inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from api.v1.ppt.endpoints.presentation import get_all_presentations
+from models.sql.presentation import PresentationModel
+from models.sql.slide import SlideModel
+from services.database import create_presentation_list_indexes
+
+
+class TestPresentationList:
+
+    def setup_method(self):
+        self.statements = []
+
+    async def create_database(self, tmp_path, presentations: int):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn,
+                    tables=[PresentationModel.__table__, SlideModel.__table__],
+                )
+            )
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+        updated_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        async with session_maker() as session:
+            for i in range(presentations):
+                presentation = PresentationModel(
+                    content=f"Presentation {i}",
+                    n_slides=2,
+                    language="English",
+                    title=f"Presentation {i}",
+                    layout={"name": "general", "slides": []},
+                    outlines={"slides": []},
+                    # Pairs of presentations share their update time
+                    updated_at=updated_at + timedelta(minutes=i // 2),
+                )
+                session.add(presentation)
+                # The last presentation has not been generated yet
+                if i == presentations - 1:
+                    continue
+                session.add_all(
+                    SlideModel(
+                        presentation=presentation.id,
+                        layout_group="general",
+                        layout="general:title",
+                        index=index,
+                        content={"title": f"Slide {index}"},
+                    )
+                    for index in range(2)
+                )
+            await session.commit()
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def count_statement(conn, cursor, statement, *args):
+            self.statements.append(statement)
+
+        return engine, session_maker
+
+    def list_pages(self, tmp_path, presentations: int, limit=None):
+        return self.list_pages_with_limits(tmp_path, presentations, [limit])[0]
+
+    def list_pages_with_limits(self, tmp_path, presentations: int, limits):
+        async def run():
+            engine, session_maker = await self.create_database(tmp_path, presentations)
+            pages_by_limit = []
+            for limit in limits:
+                self.statements = []
+                pages = []
+                after = None
+                async with session_maker() as session:
+                    while True:
+                        response = Response()
+                        pages.append(
+                            await get_all_presentations(response, limit, after, session)
+                        )
+                        after = response.headers.get("X-Next-Cursor")
+                        if not after:
+                            break
+                pages_by_limit.append(pages)
+            await engine.dispose()
+            return pages_by_limit
+
+        return asyncio.run(run())
+
+    def test_presentations_are_listed_with_their_first_slide_in_one_query(
+        self, tmp_path
+    ):
+        pages = self.list_pages(tmp_path, 20)
+
+        assert len(pages) == 1
+        assert len(self.statements) == 1
+        presentations = pages[0]
+        assert len(presentations) == 19
+        assert all(
+            [(slide.presentation, slide.index) for slide in presentation.slides]
+            == [(presentation.id, 0)]
+            for presentation in presentations
+        )
+        assert presentations[0].title == "Presentation 18"
+        assert [p.updated_at for p in presentations] == sorted(
+            (p.updated_at for p in presentations), reverse=True
+        )
+
+    def test_large_columns_are_not_loaded(self, tmp_path):
+        presentations = self.list_pages(tmp_path, 3)[0]
+
+        for column in ["layout", "outlines", "structure", "file_paths"]:
+            assert f"presentations.{column}" not in self.statements[0]
+            assert not hasattr(presentations[0], column)
+
+    def test_pages_follow_the_cursor(self, tmp_path):
+        [all_presentations], pages = self.list_pages_with_limits(
+            tmp_path, 25, [None, 5]
+        )
+
+        assert [len(page) for page in pages] == [5] * 4 + [4]
+        assert len(self.statements) == 5
+        # Presentations updated at the same time are not skipped or repeated
+        assert [p.id for page in pages for p in page] == [
+            p.id for p in all_presentations
+        ]
+
+    def test_invalid_cursor_is_rejected(self, tmp_path):
+        async def run():
+            engine, session_maker = await self.create_database(tmp_path, 1)
+            async with session_maker() as session:
+                with pytest.raises(HTTPException) as error:
+                    await get_all_presentations(Response(), 5, "not-a-cursor", session)
+            await engine.dispose()
+            return error.value
+
+        assert asyncio.run(run()).status_code == 400
+
+    def test_list_indexes_are_added_to_existing_tables(self, tmp_path):
+        async def run():
+            engine, _ = await self.create_database(tmp_path, 1)
+            async with engine.begin() as conn:
+                await conn.execute(text("DROP INDEX ix_presentations_updated_at_id"))
+                await conn.execute(text("DROP INDEX ix_slides_presentation_index"))
+                await conn.run_sync(create_presentation_list_indexes)
+                await conn.run_sync(create_presentation_list_indexes)
+                indexes = await conn.run_sync(
+                    lambda sync_conn: {
+                        index["name"]: index["column_names"]
+                        for table in ["presentations", "slides"]
+                        for index in inspect(sync_conn).get_indexes(table)
+                    }
+                )
+            await engine.dispose()
+            return indexes
+
+        indexes = asyncio.run(run())
+
+        assert indexes["ix_presentations_updated_at_id"] == ["updated_at", "id"]
+        assert indexes["ix_slides_presentation_index"] == ["presentation", "index"]
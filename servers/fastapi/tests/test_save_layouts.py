@@ -0,0 +1,214 @@
+import asyncio
+import uuid
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event, inspect, text
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from api.v1.ppt.endpoints.slide_to_html import (
+    LAYOUT_CODE_UPDATE_COLUMNS,
+    LayoutData,
+    SaveLayoutsRequest,
+    save_layouts,
+)
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from services.database import create_layout_code_unique_index
+from utils.db_utils import get_upsert_statement
+
+
+def create_layout(presentation: uuid.UUID, layout_id: str, code: str) -> LayoutData:
+    return LayoutData(
+        presentation=presentation,
+        layout_id=layout_id,
+        layout_name=layout_id.title(),
+        layout_code=code,
+        fonts=[f"https://fonts/{layout_id}"],
+    )
+
+
+class TestSaveLayouts:
+
+    def setup_method(self):
+        self.statements = []
+
+    async def create_database(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: SQLModel.metadata.create_all(
+                    sync_conn, tables=[PresentationLayoutCodeModel.__table__]
+                )
+            )
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def count_statement(conn, cursor, statement, *args):
+            self.statements.append(statement)
+
+        return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+    def save(self, tmp_path, requests):
+        async def run():
+            engine, session_maker = await self.create_database(tmp_path)
+            statements = []
+            for layouts in requests:
+                self.statements = []
+                async with session_maker() as session:
+                    await save_layouts(SaveLayoutsRequest(layouts=layouts), session)
+                statements.append(self.statements)
+            self.statements = []
+            async with session_maker() as session:
+                saved = (
+                    await session.scalars(
+                        select(PresentationLayoutCodeModel).order_by(
+                            PresentationLayoutCodeModel.id
+                        )
+                    )
+                ).all()
+            await engine.dispose()
+            return statements, saved
+
+        return asyncio.run(run())
+
+    def test_layouts_are_upserted_in_one_statement(self, tmp_path):
+        presentation = uuid.uuid4()
+        first = [create_layout(presentation, f"layout-{i}", "v1") for i in range(50)]
+        second = [
+            create_layout(presentation, "layout-0", "v2"),
+            create_layout(presentation, "layout-50", "v1"),
+        ]
+
+        statements, saved = self.save(tmp_path, [first, second])
+
+        assert [len(request_statements) for request_statements in statements] == [1, 1]
+        assert len(saved) == 51
+        assert [layout.layout_code for layout in saved[:2]] == ["v2", "v1"]
+        assert saved[0].updated_at > saved[0].created_at
+        assert saved[0].fonts == ["https://fonts/layout-0"]
+
+    def test_layout_saved_twice_in_a_request_keeps_the_last(self, tmp_path):
+        presentation = uuid.uuid4()
+
+        _, saved = self.save(
+            tmp_path,
+            [
+                [
+                    create_layout(presentation, "title", "v1"),
+                    create_layout(presentation, "title", "v2"),
+                    create_layout(uuid.uuid4(), "title", "v1"),
+                ]
+            ],
+        )
+
+        assert [layout.layout_code for layout in saved] == ["v2", "v1"]
+
+    def test_databases_without_upsert_load_saved_layouts_at_once(self, tmp_path):
+        presentation = uuid.uuid4()
+        first = [create_layout(presentation, f"layout-{i}", "v1") for i in range(10)]
+        second = [
+            create_layout(presentation, f"layout-{i}", "v2") for i in range(5, 15)
+        ]
+
+        with patch(
+            "api.v1.ppt.endpoints.slide_to_html.get_upsert_statement",
+            return_value=None,
+        ):
+            statements, saved = self.save(tmp_path, [first, second])
+
+        # One select, then the inserts and updates flushed on commit
+        assert statements[1][0].startswith("SELECT")
+        assert not any(s.startswith("SELECT") for s in statements[1][1:])
+        assert len(saved) == 15
+        assert [layout.layout_code for layout in saved] == ["v1"] * 5 + ["v2"] * 10
+
+    def test_upsert_statements_of_network_databases(self):
+        table = PresentationLayoutCodeModel.__table__
+        rows = [
+            {
+                "presentation": uuid.uuid4(),
+                "layout_id": "title",
+                "layout_name": "Title",
+                "layout_code": "code",
+                "fonts": None,
+            }
+        ]
+        statements = {
+            name: str(
+                get_upsert_statement(
+                    name,
+                    table,
+                    rows,
+                    ("presentation", "layout_id"),
+                    LAYOUT_CODE_UPDATE_COLUMNS,
+                ).compile(dialect=dialect)
+            )
+            for name, dialect in [
+                ("postgresql", postgresql.dialect()),
+                ("mysql", mysql.dialect()),
+            ]
+        }
+
+        assert "ON CONFLICT (presentation, layout_id) DO UPDATE" in (
+            statements["postgresql"]
+        )
+        assert "ON DUPLICATE KEY UPDATE" in statements["mysql"]
+        assert get_upsert_statement("mssql", table, rows, [], []) is None
+
+    def test_unique_index_is_added_to_existing_tables(self, tmp_path):
+        presentation = uuid.uuid4()
+
+        async def run():
+            engine, session_maker = await self.create_database(tmp_path)
+            async with engine.begin() as conn:
+                await conn.execute(
+                    text(
+                        "DROP INDEX ux_presentation_layout_codes_presentation_layout_id"
+                    )
+                )
+            async with session_maker() as session:
+                session.add_all(
+                    PresentationLayoutCodeModel(
+                        presentation=presentation,
+                        layout_id="title",
+                        layout_name="Title",
+                        layout_code=code,
+                    )
+                    for code in ["v1", "v2"]
+                )
+                await session.commit()
+
+            async with engine.begin() as conn:
+                await conn.run_sync(create_layout_code_unique_index)
+                # Tables with the index are left as is
+                await conn.run_sync(create_layout_code_unique_index)
+                indexes = await conn.run_sync(
+                    lambda sync_conn: inspect(sync_conn).get_indexes(
+                        "presentation_layout_codes"
+                    )
+                )
+
+            async with session_maker() as session:
+                saved = (
+                    await session.scalars(select(PresentationLayoutCodeModel))
+                ).all()
+                codes = [layout.layout_code for layout in saved]
+                session.add(
+                    PresentationLayoutCodeModel(
+                        presentation=presentation,
+                        layout_id="title",
+                        layout_name="Title",
+                        layout_code="v3",
+                    )
+                )
+                with pytest.raises(IntegrityError):
+                    await session.commit()
+            await engine.dispose()
+            return indexes, codes
+
+        indexes, codes = asyncio.run(run())
+
+        assert codes == ["v2"]
+        assert any(index["unique"] for index in indexes)
@@ -0,0 +1,85 @@
+import asyncio
+
+from benchmarks.score_based_chunker import (
+    extract_headings_before,
+    generate_markdown,
+    get_chunks_from_headings_before,
+)
+from services.score_based_chunker import HeadingIndex, ScoreBasedChunker
+
+MARKDOWN = """Intro without heading
+
+# Annual report
+Overview
+   ## Revenue  \r
+Revenue grew.
+
+## Annual report
+#### Details
+Line one
+  Line two
+
+\t### Outlook
+Next year
+## Annual report"""
+
+
+class TestScoreBasedChunker:
+
+    def setup_method(self):
+        self.chunker = ScoreBasedChunker()
+
+    def assert_same_chunks(self, text, headings, top_k):
+        heading_scores = self.chunker.score_headings(headings)
+        assert self.chunker.get_chunks_from_headings(
+            text, headings, heading_scores, top_k
+        ) == get_chunks_from_headings_before(
+            self.chunker, text, headings, heading_scores, top_k
+        )
+
+    def test_heading_index_records_levels_and_offsets(self):
+        heading_index = HeadingIndex(MARKDOWN)
+
+        assert heading_index.headings == extract_headings_before(MARKDOWN)
+        assert heading_index.levels == [1, 2, 2, 4, 3, 2]
+        start, end = heading_index.starts[1], heading_index.ends[1]
+        assert MARKDOWN[start:end] == "   ## Revenue  \r"
+
+    def test_chunks_are_identical_to_line_based_chunking(self):
+        headings = self.chunker.extract_headings(MARKDOWN)
+        for top_k in range(1, 8):
+            self.assert_same_chunks(MARKDOWN, headings, top_k)
+
+        # Headings that are not in the text, or only partly
+        self.assert_same_chunks(MARKDOWN, ["# Missing", *headings[2:]], 4)
+        self.assert_same_chunks(MARKDOWN, list(reversed(headings)), 6)
+
+        text = generate_markdown(200_000, seed=1)
+        headings = self.chunker.extract_headings(text)
+        for top_k in (5, 10, 40):
+            self.assert_same_chunks(text, headings, top_k)
+
+    def test_chunks_are_yielded_lazily(self):
+        headings = self.chunker.extract_headings(MARKDOWN)
+        chunks = self.chunker.iter_chunks_from_headings(
+            MARKDOWN, headings, self.chunker.score_headings(headings), 3
+        )
+
+        assert next(chunks).heading == "# Annual report"
+        assert len(list(chunks)) == 2
+
+    def test_stream_and_text_give_same_chunks(self):
+        sections = [MARKDOWN[:60], MARKDOWN[60:], "# Appendix\nTables"]
+
+        async def stream():
+            for section in sections:
+                yield section
+
+        async def run():
+            return await self.chunker.get_n_chunks(
+                "\n\n".join(sections), 5
+            ), await self.chunker.get_n_chunks_from_stream(stream(), 5)
+
+        chunks, streamed_chunks = asyncio.run(run())
+
+        assert streamed_chunks == chunks
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from services.warmup_service import WarmupService
+
+FASTAPI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be loaded on first use or by the startup warm up
+LAZY_MODULES = ("chromadb", "docling", "onnxruntime", "torch")
+
+
+class TestImportTime:
+
+    def test_app_import_does_not_load_heavy_modules(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                "import api.main\n"
+                "from services.icon_finder_service import ICON_FINDER_SERVICE\n"
+                "from services import docling_service\n"
+                "assert ICON_FINDER_SERVICE._index is None\n"
+                "assert docling_service._DOCLING_SERVICE is None",
+            ],
+            cwd=FASTAPI_DIR,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr[-2000:]
+
+        imported_modules = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line.removeprefix("import time:").split("|")
+            imported_modules[name.strip()] = int(cumulative)
+
+        print(f"api.main import time: {imported_modules['api.main'] / 1_000_000:.2f}s")
+        assert not [
+            name for name in imported_modules if name.split(".")[0] in LAZY_MODULES
+        ]
+
+
+class TestWarmupService:
+
+    def test_components_are_warmed_up_in_background(self):
+        async def run():
+            warmup_service = WarmupService()
+
+            def failing_warm_up():
+                raise RuntimeError("Model not found")
+
+            warmup_service.start(
+                {
+                    "slow": lambda: time.sleep(0.05),
+                    "failing": failing_warm_up,
+                }
+            )
+            ready_at_start = warmup_service.is_ready()
+            await warmup_service._task
+            return ready_at_start, warmup_service.get_status()
+
+        ready_at_start, status = asyncio.run(run())
+
+        assert ready_at_start is False
+        assert status["ready"] is True
+        assert status["components"]["slow"]["status"] == "ready"
+        assert status["components"]["failing"]["status"] == "error"
@@ -0,0 +1,258 @@
+import asyncio
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel, select
+
+from models.presentation_and_path import PresentationPathAndEditPath
+from models.sql.presentation_generation_job import PresentationGenerationJobModel
+from services.presentation_generation_job_service import (
+    PresentationGenerationJobService,
+)
+from services.state_store import (
+    DELETE_IF_EQUALS_SCRIPT,
+    EXPIRE_IF_EQUALS_SCRIPT,
+    InMemoryStateStore,
+    RedisStateStore,
+)
+
+
+class FakeRedis:
+    """
+    Test double for the subset of redis.asyncio.Redis used by RedisStateStore.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.expires_at = {}
+
+    def _expire_key(self, key):
+        expires_at = self.expires_at.get(key)
+        if expires_at is not None and expires_at <= time.time():
+            self.values.pop(key, None)
+            self.expires_at.pop(key, None)
+
+    async def get(self, key):
+        self._expire_key(key)
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        self._expire_key(key)
+        if nx and key in self.values:
+            return None
+        self.values[key] = value.encode("utf-8")
+        if ex:
+            self.expires_at[key] = time.time() + ex
+        else:
+            self.expires_at.pop(key, None)
+        return True
+
+    async def delete(self, key):
+        self.expires_at.pop(key, None)
+        return 1 if self.values.pop(key, None) is not None else 0
+
+    async def expire(self, key, ttl):
+        self._expire_key(key)
+        if key not in self.values:
+            return False
+        self.expires_at[key] = time.time() + ttl
+        return True
+
+    async def eval(self, script, numkeys, key, value, *args):
+        self._expire_key(key)
+        if self.values.get(key) != value.encode("utf-8"):
+            return 0
+        if script == DELETE_IF_EQUALS_SCRIPT:
+            return await self.delete(key)
+        if script == EXPIRE_IF_EQUALS_SCRIPT:
+            return await self.expire(key, int(args[0]) / 1000)
+        raise NotImplementedError(script)
+
+    async def incrby(self, key, amount):
+        self._expire_key(key)
+        value = int(self.values.get(key, b"0")) + amount
+        self.values[key] = str(value).encode("utf-8")
+        return value
+
+
+@pytest.fixture(params=["memory", "redis"])
+def state_store(request):
+    if request.param == "memory":
+        return InMemoryStateStore()
+    return RedisStateStore(FakeRedis())
+
+
+class TestStateStore:
+
+    def test_get_set_delete(self, state_store):
+        async def run():
+            assert await state_store.get("key") is None
+            await state_store.set("key", {"status": "pulling", "done": False})
+            value = await state_store.get("key")
+            await state_store.delete("key")
+            return value, await state_store.get("key")
+
+        value, deleted_value = asyncio.run(run())
+
+        assert value == {"status": "pulling", "done": False}
+        assert deleted_value is None
+
+    def test_values_expire(self, state_store):
+        async def run():
+            await state_store.set("key", "value", ttl=1)
+            with patch("time.time", return_value=time.time() + 2):
+                return await state_store.get("key")
+
+        assert asyncio.run(run()) is None
+
+    def test_set_if_not_exists(self, state_store):
+        async def run():
+            first = await state_store.set_if_not_exists("claim", True, ttl=60)
+            second = await state_store.set_if_not_exists("claim", True, ttl=60)
+            with patch("time.time", return_value=time.time() + 61):
+                after_expiry = await state_store.set_if_not_exists("claim", True)
+            return first, second, after_expiry
+
+        assert asyncio.run(run()) == (True, False, True)
+
+    def test_compare_and_delete_or_expire(self, state_store):
+        async def run():
+            await state_store.set("claim", "worker-1", ttl=10)
+            results = [
+                await state_store.expire_if_equals("claim", "worker-2", 60),
+                await state_store.delete_if_equals("claim", "worker-2"),
+                await state_store.expire_if_equals("claim", "worker-1", 60),
+            ]
+            with patch("time.time", return_value=time.time() + 11):
+                results.append(await state_store.get("claim"))
+            results.append(await state_store.delete_if_equals("claim", "worker-1"))
+            results.append(await state_store.get("claim"))
+            return results
+
+        assert asyncio.run(run()) == [False, False, True, "worker-1", True, None]
+
+    def test_increment_window(self, state_store):
+        async def run():
+            counts = [await state_store.increment("requests", ttl=10) for _ in range(3)]
+            with patch("time.time", return_value=time.time() + 11):
+                counts.append(await state_store.increment("requests", ttl=10))
+            return counts
+
+        assert asyncio.run(run()) == [1, 2, 3, 1]
+
+
+class TestGenerationJobClaims:
+
+    def run_workers(
+        self, jobs, workers: int, stale_claims: bool = False, on_handle=None
+    ):
+        """
+        Resumes the jobs, given as their status, on workers sharing a state
+        store and returns the presentations generated.
+        """
+        self.redis = FakeRedis()
+        state_store = RedisStateStore(self.redis)
+
+        async def run():
+            with tempfile.TemporaryDirectory() as temp_dir:
+                engine = create_async_engine(
+                    f"sqlite+aiosqlite:///{os.path.join(temp_dir, 'jobs.db')}"
+                )
+                async with engine.begin() as conn:
+                    await conn.run_sync(
+                        lambda sync_conn: SQLModel.metadata.create_all(
+                            sync_conn, tables=[PresentationGenerationJobModel.__table__]
+                        )
+                    )
+                session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+                async with session_maker() as session:
+                    session.add_all(
+                        [
+                            PresentationGenerationJobModel(
+                                request={"content": "AI"}, status=status
+                            )
+                            for status in jobs
+                        ]
+                    )
+                    await session.commit()
+                    job_ids = await session.scalars(
+                        select(PresentationGenerationJobModel.id)
+                    )
+
+                # Claims left behind by a worker that was killed
+                if stale_claims:
+                    for job_id in job_ids:
+                        await state_store.set(
+                            f"presentation_generation_job:{job_id}", True, ttl=0.3
+                        )
+
+                handled = []
+
+                async def handler(request, presentation_id, *_):
+                    handled.append(presentation_id)
+                    if on_handle:
+                        on_handle()
+                    await asyncio.sleep(0.01)
+                    return PresentationPathAndEditPath(
+                        presentation_id=presentation_id,
+                        path="/tmp/presentation.pptx",
+                        edit_path=f"/presentation?id={presentation_id}",
+                    )
+
+                service_workers = [
+                    PresentationGenerationJobService() for _ in range(workers)
+                ]
+                with patch(
+                    "services.presentation_generation_job_service.async_session_maker",
+                    session_maker,
+                ), patch(
+                    "services.presentation_generation_job_service.STATE_STORE",
+                    state_store,
+                ), patch(
+                    "services.presentation_generation_job_service.GENERATION_JOB_CLAIM_TTL",
+                    0.3,
+                ), patch.object(
+                    PresentationGenerationJobService, "_delete_presentation"
+                ):
+                    for worker in service_workers:
+                        await worker.resume(handler)
+                    await asyncio.gather(
+                        *[
+                            task
+                            for worker in service_workers
+                            for task in list(worker._tasks.values())
+                        ]
+                    )
+
+                await engine.dispose()
+                return handled
+
+        return asyncio.run(run())
+
+    def test_workers_sharing_redis_run_each_job_once(self):
+        handled = self.run_workers(["pending"] * 4, workers=3)
+
+        assert len(handled) == 4
+        assert len(set(handled)) == 4
+
+    def test_claims_of_a_stopped_worker_are_waited_for(self):
+        handled = self.run_workers(["running"] * 2, workers=2, stale_claims=True)
+
+        assert len(handled) == 2
+        assert len(set(handled)) == 2
+
+    def test_claims_taken_over_are_not_released(self):
+        def take_over_claims():
+            # The claim lapsed and another worker took the job over
+            for key in self.redis.values:
+                self.redis.values[key] = b'"another-worker"'
+
+        handled = self.run_workers(["pending"], workers=1, on_handle=take_over_claims)
+
+        assert len(handled) == 1
+        assert list(self.redis.values.values()) == [b'"another-worker"']
@@ -0,0 +1,260 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+from aiohttp import web
+
+from services.image_generation_service import ImageGenerationService
+from services.state_store import InMemoryStateStore, RedisStateStore
+from services.stock_image_client import (
+    SharedRateLimiter,
+    StockImageClient,
+    TokenBucket,
+)
+
+
+class StubStockImageServer:
+    """
+    Serves searches like a stock image API that allows quota requests per window.
+    """
+
+    def __init__(self, quota: int, window: float, retry_after: bool = True):
+        self.quota = quota
+        self.window = window
+        self.retry_after = retry_after
+        self.window_started_at = 0.0
+        self.window_requests = 0
+
+        self.requests = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.peers = set()
+
+    async def search(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        self.peers.add(request.transport.get_extra_info("peername"))
+        now = time.monotonic()
+        if now - self.window_started_at >= self.window:
+            self.window_started_at = now
+            self.window_requests = 0
+
+        reset = self.window - (now - self.window_started_at)
+        if self.window_requests >= self.quota:
+            self.rejected += 1
+            headers = {"X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset": str(reset)}
+            if self.retry_after:
+                headers["Retry-After"] = str(reset)
+            return web.json_response({}, status=429, headers=headers)
+
+        self.window_requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.in_flight -= 1
+        return web.json_response(
+            {
+                "photos": [
+                    {"src": {"large": f"https://images/{request.query['query']}"}}
+                ]
+            },
+            headers={
+                "X-Ratelimit-Remaining": str(self.quota - self.window_requests),
+                "X-Ratelimit-Reset": str(reset),
+            },
+        )
+
+    async def run(self, callback):
+        app = web.Application()
+        app.router.add_get("/search", self.search)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await callback(f"http://127.0.0.1:{port}/search")
+        finally:
+            await runner.cleanup()
+
+
+class TestTokenBucket:
+
+    def test_waits_once_burst_is_used(self):
+        bucket = TokenBucket(requests_per_second=10, burst=2)
+
+        assert bucket.get_wait_time() == 0
+        assert bucket.get_wait_time() == 0
+        assert 0 < bucket.get_wait_time() <= 0.1
+
+    def test_pause_holds_requests_back(self):
+        bucket = TokenBucket(requests_per_second=10, burst=2)
+        bucket.pause_until(time.monotonic() + 5)
+
+        assert bucket.get_wait_time() > 4
+
+
+class TestSharedRateLimiter:
+
+    def create_limiters(self, workers: int):
+        state_store = InMemoryStateStore()
+        return [
+            SharedRateLimiter(
+                "stub", requests_per_second=4 / 60, burst=4, state_store=state_store
+            )
+            for _ in range(workers)
+        ]
+
+    def test_workers_share_the_budget_of_a_window(self):
+        limiters = self.create_limiters(2)
+
+        async def run():
+            return [
+                await limiter.get_wait_time() for _ in range(3) for limiter in limiters
+            ]
+
+        # Start of a 60 second window
+        with patch("time.time", return_value=6000.0):
+            wait_times = asyncio.run(run())
+
+        assert wait_times[:4] == [0] * 4
+        assert wait_times[4:] == [60.0, 60.0]
+
+    def test_pause_holds_back_every_worker(self):
+        limiters = self.create_limiters(2)
+
+        async def run():
+            await limiters[0].pause(5)
+            return await limiters[1].get_wait_time()
+
+        assert asyncio.run(run()) > 4
+
+    def test_clients_share_limits_with_a_shared_state_store(self):
+        with patch(
+            "services.stock_image_client.STATE_STORE", RedisStateStore(client=None)
+        ):
+            shared = StockImageClient(
+                "stub", max_concurrency=1, requests_per_second=1, burst=1
+            )
+        local = StockImageClient(
+            "stub", max_concurrency=1, requests_per_second=1, burst=1
+        )
+
+        assert isinstance(shared.rate_limiter, SharedRateLimiter)
+        assert isinstance(local.rate_limiter, TokenBucket)
+        assert shared.get_stats()["shared_rate_limit"]
+
+
+class TestStockImageClient:
+
+    def search(self, server, client, prompts):
+        async def callback(url):
+            results = await asyncio.gather(
+                *[client.get_json(url, params={"query": p}) for p in prompts]
+            )
+            await client.close()
+            return results
+
+        return asyncio.run(server.run(callback))
+
+    def test_concurrency_is_bounded_and_connections_reused(self):
+        server = StubStockImageServer(quota=100, window=10)
+        client = StockImageClient(
+            "stub", max_concurrency=3, requests_per_second=1000, burst=100
+        )
+
+        results = self.search(server, client, [str(i) for i in range(20)])
+
+        assert [r["photos"][0]["src"]["large"] for r in results] == [
+            f"https://images/{i}" for i in range(20)
+        ]
+        assert server.max_in_flight <= 3
+        assert len(server.peers) <= 3
+        assert client.get_stats()["sessions_created"] == 1
+
+    def test_rate_limited_requests_wait_for_retry_after(self):
+        server = StubStockImageServer(quota=4, window=0.3)
+        client = StockImageClient(
+            "stub",
+            max_concurrency=8,
+            requests_per_second=1000,
+            burst=100,
+            retry_base_delay=0.01,
+        )
+
+        started_at = time.monotonic()
+        results = self.search(server, client, [str(i) for i in range(10)])
+
+        assert len(results) == 10
+        # Ten requests need three quota windows
+        assert time.monotonic() - started_at >= 0.6
+        # Retries wait for the reset, so each window rejects a single burst at most
+        assert server.rejected <= 8
+        assert client.rate_limited == server.rejected
+
+    def test_remaining_quota_header_pauses_requests(self):
+        server = StubStockImageServer(quota=3, window=0.3, retry_after=False)
+        client = StockImageClient(
+            "stub",
+            max_concurrency=1,
+            requests_per_second=1000,
+            burst=100,
+            retry_base_delay=0.01,
+        )
+
+        results = self.search(server, client, [str(i) for i in range(6)])
+
+        assert len(results) == 6
+        assert server.rejected == 0
+
+    def test_long_retry_after_is_not_waited_for(self):
+        server = StubStockImageServer(quota=0, window=3600)
+        client = StockImageClient(
+            "stub", max_concurrency=1, requests_per_second=1000, burst=100
+        )
+
+        async def callback(url):
+            try:
+                await client.get_json(url, params={"query": "office"})
+            finally:
+                await client.close()
+
+        started_at = time.monotonic()
+        try:
+            asyncio.run(server.run(callback))
+            assert False, "Expected the rate limit error"
+        except Exception as e:
+            assert getattr(e, "status", None) == 429
+        assert time.monotonic() - started_at < 5
+        assert server.requests == 1
+
+
+class TestImageGenerationServiceStockImages:
+
+    def test_pexels_search_uses_shared_client(self, tmp_path):
+        server = StubStockImageServer(quota=100, window=10)
+        client = StockImageClient(
+            "pexels", max_concurrency=2, requests_per_second=1000, burst=100
+        )
+
+        async def callback(url):
+            with patch(
+                "services.image_generation_service.PEXELS_SEARCH_URL", url
+            ), patch.dict(
+                "services.image_generation_service.STOCK_IMAGE_CLIENTS",
+                {"pexels": client},
+            ):
+                service = ImageGenerationService(str(tmp_path))
+                results = await asyncio.gather(
+                    service.get_image_from_pexels("team meeting"),
+                    service.get_image_from_pexels("office"),
+                )
+            await client.close()
+            return results
+
+        results = asyncio.run(server.run(callback))
+
+        assert results == ["https://images/team meeting", "https://images/office"]
+        assert client.get_stats()["sessions_created"] == 1
@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from utils.user_config import UserConfigSnapshot
+
+
+class TestUserConfigSnapshot:
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.user_config_path = os.path.join(self.temp_dir.name, "userConfig.json")
+        self.write_config({"LLM": "openai", "OPENAI_MODEL": "gpt-4.1"})
+
+        self.env_patch = patch.dict(
+            os.environ, {"USER_CONFIG_PATH": self.user_config_path}
+        )
+        self.env_patch.start()
+
+    def teardown_method(self):
+        self.env_patch.stop()
+        self.temp_dir.cleanup()
+
+    def write_config(self, config: dict):
+        with open(self.user_config_path, "w") as f:
+            json.dump(config, f)
+
+    def test_refresh_reads_config_once(self):
+        snapshot = UserConfigSnapshot()
+
+        with patch("builtins.open", wraps=open) as mock_open:
+            assert snapshot.refresh() is True
+            assert snapshot.refresh() is False
+            assert snapshot.refresh() is False
+
+        assert mock_open.call_count == 1
+        assert snapshot.reloads == 1
+        assert snapshot.config.OPENAI_MODEL == "gpt-4.1"
+        assert os.environ["OPENAI_MODEL"] == "gpt-4.1"
+
+    def test_refresh_reloads_changed_config(self):
+        snapshot = UserConfigSnapshot()
+        snapshot.refresh()
+
+        self.write_config({"LLM": "openai", "OPENAI_MODEL": "gpt-4o-mini"})
+        stat = os.stat(self.user_config_path)
+        os.utime(
+            self.user_config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000)
+        )
+
+        assert snapshot.refresh() is True
+        assert snapshot.reloads == 2
+        assert snapshot.config.OPENAI_MODEL == "gpt-4o-mini"
+        assert os.environ["OPENAI_MODEL"] == "gpt-4o-mini"
+
+    def test_reload_reads_unchanged_config(self):
+        snapshot = UserConfigSnapshot()
+        snapshot.refresh()
+        snapshot.reload()
+
+        assert snapshot.reloads == 2
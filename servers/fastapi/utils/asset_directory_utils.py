@@ -13,7 +13,28 @@ def get_exports_directory():
     os.makedirs(export_directory, exist_ok=True)
     return export_directory
 
+
 def get_uploads_directory():
     uploads_directory = os.path.join(get_app_data_directory_env(), "uploads")
     os.makedirs(uploads_directory, exist_ok=True)
     return uploads_directory
+
+
+def get_document_parse_cache_directory():
+    cache_directory = os.path.join(get_app_data_directory_env(), "document_parse_cache")
+    os.makedirs(cache_directory, exist_ok=True)
+    return cache_directory
+
+
+def get_processed_image_cache_directory():
+    cache_directory = os.path.join(
+        get_app_data_directory_env(), "processed_image_cache"
+    )
+    os.makedirs(cache_directory, exist_ok=True)
+    return cache_directory
+
+
+def get_pptx_slide_cache_directory():
+    cache_directory = os.path.join(get_app_data_directory_env(), "pptx_slide_cache")
+    os.makedirs(cache_directory, exist_ok=True)
+    return cache_directory
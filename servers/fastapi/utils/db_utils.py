@@ -1,4 +1,8 @@
 import os
+from typing import Iterable, List, Optional
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.sql.dml import Insert
 from utils.get_env import get_app_data_directory_env, get_database_url_env
 from urllib.parse import urlsplit, urlunsplit, parse_qsl
 import ssl
@@ -46,3 +50,30 @@ def get_database_url_and_connect_args() -> tuple[str, dict]:
         pass
 
     return database_url, connect_args
+
+
+def get_upsert_statement(
+    dialect_name: str,
+    table: Table,
+    rows: List[dict],
+    index_elements: Iterable[str],
+    update_columns: Iterable[str],
+) -> Optional[Insert]:
+    """
+    Returns one INSERT of rows that updates update_columns of rows conflicting
+    on the unique index_elements, None if the dialect has no upsert.
+    """
+    if dialect_name == "mysql":
+        statement = mysql.insert(table).values(rows)
+        return statement.on_duplicate_key_update(
+            {column: statement.inserted[column] for column in update_columns}
+        )
+
+    if dialect_name in ("postgresql", "sqlite"):
+        insert = postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+        statement = insert(table).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=list(index_elements),
+            set_={column: statement.excluded[column] for column in update_columns},
+        )
+    return None
@@ -8,69 +8,142 @@ import aiohttp
 
 import uuid
 
+from constants.images import (
+    DOWNLOAD_CHUNK_SIZE,
+    DOWNLOAD_MAX_CONCURRENCY,
+    DOWNLOAD_TIMEOUT,
+)
 
-async def download_file(
-    url: str, save_directory: str, headers: Optional[dict] = None
-) -> Optional[str]:
+
+def create_download_session(
+    max_concurrency: int = DOWNLOAD_MAX_CONCURRENCY,
+) -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(
+        trust_env=True,
+        connector=aiohttp.TCPConnector(limit=max_concurrency),
+    )
+
+
+def remove_file(path: str):
     try:
-        os.makedirs(save_directory, exist_ok=True)
+        os.remove(path)
+    except FileNotFoundError:
+        pass
 
-        parsed_url = urlparse(url)
-        filename = os.path.basename(parsed_url.path)
 
-        if not filename or "." not in filename:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.head(url, headers=headers) as response:
-                    if response.status == 200:
-                        content_disposition = response.headers.get(
-                            "Content-Disposition", ""
-                        )
-                        if "filename=" in content_disposition:
-                            filename = content_disposition.split("filename=")[1].strip(
-                                "\"'"
-                            )
-                        else:
-                            content_type = response.headers.get("Content-Type", "")
-                            if content_type:
-                                extension = mimetypes.guess_extension(
-                                    content_type.split(";")[0]
-                                )
-                                if extension:
-                                    filename = f"{uuid.uuid4()}{extension}"
-
-        filename = filename or str(uuid.uuid4())
-        save_path = os.path.join(save_directory, filename)
-
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    with open(save_path, "wb") as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                    print(f"File downloaded successfully: {save_path}")
-                    return save_path
+async def _download_file(
+    session: aiohttp.ClientSession,
+    url: str,
+    save_directory: str,
+    headers: Optional[dict] = None,
+) -> Optional[str]:
+    parsed_url = urlparse(url)
+    filename = os.path.basename(parsed_url.path)
+
+    if not filename or "." not in filename:
+        async with session.head(url, headers=headers) as response:
+            if response.status == 200:
+                content_disposition = response.headers.get("Content-Disposition", "")
+                if "filename=" in content_disposition:
+                    filename = content_disposition.split("filename=")[1].strip("\"'")
                 else:
-                    print(f"Failed to download file. HTTP status: {response.status}")
-                    return None
+                    content_type = response.headers.get("Content-Type", "")
+                    if content_type:
+                        extension = mimetypes.guess_extension(
+                            content_type.split(";")[0]
+                        )
+                        if extension:
+                            filename = f"{uuid.uuid4()}{extension}"
+
+    filename = filename or str(uuid.uuid4())
+    save_path = os.path.join(save_directory, filename)
+
+    async with session.get(url, headers=headers) as response:
+        if response.status != 200:
+            print(f"Failed to download file. HTTP status: {response.status}")
+            return None
+
+        # Written next to the target and renamed, failed downloads leave no partial file
+        part_path = f"{save_path}.{uuid.uuid4()}.part"
+        file = await asyncio.to_thread(open, part_path, "wb")
+        try:
+            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                await asyncio.to_thread(file.write, chunk)
+            await asyncio.to_thread(file.close)
+            await asyncio.to_thread(os.replace, part_path, save_path)
+        except BaseException:
+            file.close()
+            await asyncio.to_thread(remove_file, part_path)
+            raise
 
+    print(f"File downloaded successfully: {save_path}")
+    return save_path
+
+
+async def download_file(
+    url: str,
+    save_directory: str,
+    headers: Optional[dict] = None,
+    session: Optional[aiohttp.ClientSession] = None,
+    timeout: float = DOWNLOAD_TIMEOUT,
+) -> Optional[str]:
+    """
+    Downloads a file into the directory and returns its path, None if it failed.
+    - Pass a session to reuse its connections, otherwise one is opened for the call.
+    - timeout covers the whole download, including writing the file.
+    """
+    try:
+        await asyncio.to_thread(os.makedirs, save_directory, exist_ok=True)
+        async with asyncio.timeout(timeout):
+            if session:
+                return await _download_file(session, url, save_directory, headers)
+            async with create_download_session(1) as session:
+                return await _download_file(session, url, save_directory, headers)
+
+    except TimeoutError:
+        print(f"Timed out downloading file from {url} after {timeout}s")
+        return None
     except Exception as e:
         print(f"Error downloading file from {url}: {e}")
         return None
 
 
 async def download_files(
-    urls: List[str], save_directory: str, headers: Optional[dict] = None
+    urls: List[str],
+    save_directory: str,
+    headers: Optional[dict] = None,
+    max_concurrency: int = DOWNLOAD_MAX_CONCURRENCY,
+    timeout: float = DOWNLOAD_TIMEOUT,
 ) -> List[Optional[str]]:
-    print(f"Starting download of {len(urls)} files to {save_directory}")
-    coroutines = [download_file(url, save_directory, headers) for url in urls]
-    results = await asyncio.gather(*coroutines, return_exceptions=True)
-    final_results = []
-    for i, result in enumerate(results):
+    """
+    Downloads files into the directory, returns their paths in the order of urls.
+    - Identical urls are downloaded once and share the path.
+    - Downloads share one session and at most max_concurrency run at a time.
+    """
+    unique_urls = list(dict.fromkeys(urls))
+    print(
+        f"Starting download of {len(urls)} files ({len(unique_urls)} unique) "
+        f"to {save_directory}"
+    )
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def download(url: str, session: aiohttp.ClientSession) -> Optional[str]:
+        async with semaphore:
+            return await download_file(url, save_directory, headers, session, timeout)
+
+    async with create_download_session(max_concurrency) as session:
+        results = await asyncio.gather(
+            *[download(url, session) for url in unique_urls],
+            return_exceptions=True,
+        )
+
+    paths = {}
+    for url, result in zip(unique_urls, results):
         if isinstance(result, Exception):
-            print(f"Exception during download of {urls[i]}: {result}")
-            final_results.append(None)
-        else:
-            final_results.append(result)
+            print(f"Exception during download of {url}: {result}")
+            result = None
+        paths[url] = result
+    final_results = [paths[url] for url in urls]
 
     successful_downloads = sum(1 for result in final_results if result is not None)
     print(
@@ -1,6 +1,5 @@
 import json
 import os
-import aiohttp
 from typing import Literal
 import uuid
 from fastapi import HTTPException
@@ -8,7 +7,12 @@ from pathvalidate import sanitize_filename
 
 from models.pptx_models import PptxPresentationModel
 from models.presentation_and_path import PresentationAndPath
-from services.pptx_presentation_creator import PptxPresentationCreator
+from services.export_cache import EXPORT_CACHE
+from services.pptx_presentation_creator import (
+    PptxPresentationCreator,
+    get_pptx_image_dpi,
+)
+from services.renderer_client import RENDERER_CLIENT
 from services.temp_file_service import TEMP_FILE_SERVICE
 from utils.asset_directory_utils import get_exports_directory
 import uuid
@@ -16,22 +20,49 @@ import uuid
 
 async def export_presentation(
     presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
+) -> PresentationAndPath:
+    """
+    Exports the presentation, or returns its last export if nothing changed since.
+    """
+    fingerprint = None
+    if EXPORT_CACHE.is_enabled():
+        fingerprint = await EXPORT_CACHE.get_presentation_fingerprint(
+            presentation_id,
+            export_as=export_as,
+            image_dpi=get_pptx_image_dpi() if export_as == "pptx" else None,
+        )
+    if fingerprint:
+        cached_path = await EXPORT_CACHE.get(fingerprint, presentation_id)
+        if cached_path:
+            return PresentationAndPath(
+                presentation_id=presentation_id, path=cached_path
+            )
+
+    presentation_and_path = await _export_presentation(
+        presentation_id, title, export_as
+    )
+    if fingerprint:
+        await EXPORT_CACHE.set(fingerprint, presentation_and_path.path, presentation_id)
+    return presentation_and_path
+
+
+async def _export_presentation(
+    presentation_id: uuid.UUID, title: str, export_as: Literal["pptx", "pdf"]
 ) -> PresentationAndPath:
     if export_as == "pptx":
 
         # Get the converted PPTX model from the Next.js service
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"http://localhost/api/presentation_to_pptx_model?id={presentation_id}"
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    print(f"Failed to get PPTX model: {error_text}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail="Failed to convert presentation to PPTX model",
-                    )
-                pptx_model_data = await response.json()
+        async with RENDERER_CLIENT.get(
+            f"/api/presentation_to_pptx_model?id={presentation_id}"
+        ) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                print(f"Failed to get PPTX model: {error_text}")
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to convert presentation to PPTX model",
+                )
+            pptx_model_data = await response.json()
 
         # Create PPTX file using the converted model
         pptx_model = PptxPresentationModel(**pptx_model_data)
@@ -51,15 +82,14 @@ async def export_presentation(
             path=pptx_path,
         )
     else:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "http://localhost/api/export-as-pdf",
-                json={
-                    "id": presentation_id,
-                    "title": sanitize_filename(title or str(uuid.uuid4())),
-                },
-            ) as response:
-                response_json = await response.json()
+        async with RENDERER_CLIENT.post(
+            "/api/export-as-pdf",
+            json={
+                "id": presentation_id,
+                "title": sanitize_filename(title or str(uuid.uuid4())),
+            },
+        ) as response:
+            response_json = await response.json()
 
         return PresentationAndPath(
             presentation_id=presentation_id,
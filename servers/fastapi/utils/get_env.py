@@ -95,3 +95,83 @@ def get_extended_reasoning_env():
 
 def get_web_grounding_env():
     return os.getenv("WEB_GROUNDING")
+
+
+def get_llm_concurrency_env():
+    return os.getenv("LLM_CONCURRENCY")
+
+
+def get_llm_response_cache_env():
+    return os.getenv("LLM_RESPONSE_CACHE")
+
+
+def get_llm_response_cache_ttl_env():
+    return os.getenv("LLM_RESPONSE_CACHE_TTL")
+
+
+def get_llm_response_cache_max_size_env():
+    return os.getenv("LLM_RESPONSE_CACHE_MAX_SIZE")
+
+
+def get_max_concurrent_generations_env():
+    return os.getenv("MAX_CONCURRENT_GENERATIONS")
+
+
+def get_redis_url_env():
+    return os.getenv("REDIS_URL")
+
+
+def get_icon_index_env():
+    return os.getenv("ICON_INDEX")
+
+
+def get_document_parsing_workers_env():
+    return os.getenv("DOCUMENT_PARSING_WORKERS")
+
+
+def get_document_parse_cache_max_size_env():
+    return os.getenv("DOCUMENT_PARSE_CACHE_MAX_SIZE")
+
+
+def get_pdf_page_image_resolution_env():
+    return os.getenv("PDF_PAGE_IMAGE_RESOLUTION")
+
+
+def get_outline_context_token_budget_env():
+    return os.getenv("OUTLINE_CONTEXT_TOKEN_BUDGET")
+
+
+def get_image_asset_cache_env():
+    return os.getenv("IMAGE_ASSET_CACHE")
+
+
+def get_image_asset_cache_ttl_env():
+    return os.getenv("IMAGE_ASSET_CACHE_TTL")
+
+
+def get_image_asset_cache_max_size_env():
+    return os.getenv("IMAGE_ASSET_CACHE_MAX_SIZE")
+
+
+def get_image_processing_workers_env():
+    return os.getenv("IMAGE_PROCESSING_WORKERS")
+
+
+def get_processed_image_cache_max_size_env():
+    return os.getenv("PROCESSED_IMAGE_CACHE_MAX_SIZE")
+
+
+def get_pptx_image_dpi_env():
+    return os.getenv("PPTX_IMAGE_DPI")
+
+
+def get_pptx_slide_cache_max_size_env():
+    return os.getenv("PPTX_SLIDE_CACHE_MAX_SIZE")
+
+
+def get_export_cache_env():
+    return os.getenv("EXPORT_CACHE")
+
+
+def get_layout_cache_ttl_env():
+    return os.getenv("LAYOUT_CACHE_TTL")
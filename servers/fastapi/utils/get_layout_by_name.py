@@ -1,18 +1,25 @@
-import aiohttp
 from fastapi import HTTPException
 from models.presentation_layout import PresentationLayoutModel
+from services.layout_cache import LAYOUT_CACHE
+from services.renderer_client import RENDERER_CLIENT
 from typing import List
 
 async def get_layout_by_name(layout_name: str) -> PresentationLayoutModel:
-    url = f"http://localhost/api/layout?group={layout_name}"
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                error_text = await response.text()
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Layout '{layout_name}' not found: {error_text}"
-                )
-            layout_json = await response.json()
+    # Read before fetching, an invalidation during the fetch makes the entry stale
+    version = await LAYOUT_CACHE.get_version(layout_name)
+    layout = LAYOUT_CACHE.get(layout_name, version)
+    if layout:
+        return layout
+
+    async with RENDERER_CLIENT.get("/api/layout", params={"group": layout_name}) as response:
+        if response.status != 200:
+            error_text = await response.text()
+            raise HTTPException(
+                status_code=404,
+                detail=f"Layout '{layout_name}' not found: {error_text}"
+            )
+        layout_json = await response.json()
     # Parse the JSON into your Pydantic model
-    return PresentationLayoutModel(**layout_json)
+    layout = PresentationLayoutModel(**layout_json)
+    LAYOUT_CACHE.set(layout_name, layout, version)
+    return layout
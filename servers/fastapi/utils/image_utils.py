@@ -1,8 +1,15 @@
-from typing import List
+import os
+from typing import List, Optional
 
 from PIL import Image, ImageDraw
 
-from models.pptx_models import PptxObjectFitEnum, PptxObjectFitModel
+from constants.images import PPTX_IMAGE_JPEG_QUALITY
+from models.pptx_models import (
+    PptxBoxShapeEnum,
+    PptxObjectFitEnum,
+    PptxObjectFitModel,
+    PptxPictureBoxModel,
+)
 
 
 def clip_image(
@@ -256,3 +263,109 @@ def fit_image(
         return image.resize((width, height), Image.LANCZOS)
 
     return image
+
+
+def get_picture_transform_params(
+    picture_model: PptxPictureBoxModel, image_dpi: Optional[int] = None
+) -> Optional[dict]:
+    """
+    Returns the transforms of a picture as a JSON serializable dict,
+    None if the picture is added unchanged.
+    - image_dpi resamples the picture to its box size at that resolution and
+    saves opaque pictures as JPEG.
+    """
+    if not (
+        image_dpi
+        or picture_model.clip
+        or picture_model.border_radius
+        or picture_model.invert
+        or picture_model.opacity
+        or picture_model.object_fit
+        or picture_model.shape
+    ):
+        return None
+
+    # Boxes are in points, transforms are applied at 72 DPI unless image_dpi is set
+    scale = image_dpi / 72 if image_dpi else 1
+    width = max(1, round(picture_model.position.width * scale))
+    height = max(1, round(picture_model.position.height * scale))
+    border_radius = picture_model.border_radius
+    object_fit = picture_model.object_fit
+    return {
+        "width": width,
+        "height": height,
+        "clip": picture_model.clip,
+        "border_radius": (
+            [round(radius * scale) for radius in border_radius]
+            if border_radius
+            else None
+        ),
+        "object_fit": object_fit.model_dump(mode="json") if object_fit else None,
+        "circle": picture_model.shape == PptxBoxShapeEnum.CIRCLE,
+        "invert": picture_model.invert,
+        "opacity": picture_model.opacity,
+        "max_size": [width, height] if image_dpi else None,
+        "format": "auto" if image_dpi else "png",
+    }
+
+
+def transform_picture(image: Image.Image, params: dict) -> Image.Image:
+    image = image.convert("RGBA")
+    # ? Applying border radius twice to support both clip and object fit
+    if params["border_radius"]:
+        image = round_image_corners(image, params["border_radius"])
+    if params["object_fit"]:
+        image = fit_image(
+            image,
+            params["width"],
+            params["height"],
+            PptxObjectFitModel(**params["object_fit"]),
+        )
+    elif params["clip"]:
+        image = clip_image(image, params["width"], params["height"])
+    if params["border_radius"]:
+        image = round_image_corners(image, params["border_radius"])
+    if params["circle"]:
+        image = create_circle_image(image)
+    if params["invert"]:
+        image = invert_image(image)
+    if params["opacity"]:
+        image = set_image_opacity(image, params["opacity"])
+    if params.get("max_size"):
+        # Only downscales, keeping the aspect ratio
+        image.thumbnail(params["max_size"], Image.LANCZOS)
+    return image
+
+
+def is_opaque(image: Image.Image) -> bool:
+    return image.mode != "RGBA" or image.getchannel("A").getextrema()[0] == 255
+
+
+def transform_picture_file(
+    source_path: str, output_path: str, params: dict
+) -> Optional[str]:
+    """
+    Saves the transformed picture to output_path plus its extension and returns
+    the saved path, None if the source can not be opened.
+    - Pictures are saved as PNG, or as JPEG when the format is auto and they are opaque.
+    """
+    try:
+        image = Image.open(source_path)
+        image.load()
+    except Exception:
+        print(f"Could not open image: {source_path}")
+        return None
+
+    image = transform_picture(image, params)
+    # Saved next to the target and renamed, readers never see a partial file
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    if params.get("format") == "auto" and is_opaque(image):
+        image.convert("RGB").save(
+            temp_path, format="JPEG", quality=PPTX_IMAGE_JPEG_QUALITY, optimize=True
+        )
+        saved_path = f"{output_path}.jpg"
+    else:
+        image.save(temp_path, format="PNG")
+        saved_path = f"{output_path}.png"
+    os.replace(temp_path, saved_path)
+    return saved_path
@@ -3,16 +3,20 @@ from fastapi import HTTPException
 from constants.llm import (
     DEFAULT_ANTHROPIC_MODEL,
     DEFAULT_GOOGLE_MODEL,
+    DEFAULT_LLM_CONCURRENCY,
     DEFAULT_OPENAI_MODEL,
+    DEFAULT_OUTLINE_CONTEXT_TOKEN_BUDGET,
 )
 from enums.llm_provider import LLMProvider
 from utils.get_env import (
     get_anthropic_model_env,
     get_custom_model_env,
     get_google_model_env,
+    get_llm_concurrency_env,
     get_llm_provider_env,
     get_ollama_model_env,
     get_openai_model_env,
+    get_outline_context_token_budget_env,
 )
 
 
@@ -63,3 +67,31 @@ def get_model():
             status_code=500,
             detail=f"Invalid LLM provider. Please select one of: openai, google, anthropic, ollama, custom",
         )
+
+
+def get_llm_concurrency() -> int:
+    """
+    Returns the maximum number of concurrent LLM calls for the selected provider.
+    LLM_CONCURRENCY overrides the per provider default.
+    """
+    llm_concurrency_env = get_llm_concurrency_env()
+    if llm_concurrency_env:
+        try:
+            return max(1, int(llm_concurrency_env))
+        except ValueError:
+            print(f"Invalid LLM_CONCURRENCY: {llm_concurrency_env}")
+    return DEFAULT_LLM_CONCURRENCY.get(get_llm_provider().value, 1)
+
+
+def get_outline_context_token_budget() -> int:
+    """
+    Returns the maximum tokens of document context for outline generation.
+    OUTLINE_CONTEXT_TOKEN_BUDGET overrides the per provider default.
+    """
+    token_budget_env = get_outline_context_token_budget_env()
+    if token_budget_env:
+        try:
+            return max(0, int(token_budget_env))
+        except ValueError:
+            print(f"Invalid OUTLINE_CONTEXT_TOKEN_BUDGET: {token_budget_env}")
+    return DEFAULT_OUTLINE_CONTEXT_TOKEN_BUDGET.get(get_llm_provider().value, 8000)
@@ -7,6 +7,11 @@ from models.ollama_model_status import OllamaModelStatus
 from utils.get_env import get_ollama_url_env
 
 
+def get_ollama_pull_status_key(model: str) -> str:
+    # Each Ollama server pulls its own models
+    return f"ollama_pull_status:{get_ollama_url_env()}:{model}"
+
+
 async def pull_ollama_model(model: str) -> AsyncGenerator[dict, None]:
     async with aiohttp.ClientSession() as session:
         async with session.post(
@@ -29,13 +29,14 @@ async def process_slide_and_fetch_assets(
             )
         )
 
-    for icon_path in icon_paths:
-        __icon_query__parent = get_dict_at_path(slide.content, icon_path)
-        async_tasks.append(
-            ICON_FINDER_SERVICE.search_icons(__icon_query__parent["__icon_query__"])
-        )
+    # All icons of the slide are searched with a single embedding pass
+    icon_queries = [
+        get_dict_at_path(slide.content, icon_path)["__icon_query__"]
+        for icon_path in icon_paths
+    ]
+    async_tasks.append(ICON_FINDER_SERVICE.search_icons_batch(icon_queries))
 
-    results = await asyncio.gather(*async_tasks)
+    *results, icon_results = await asyncio.gather(*async_tasks)
     results.reverse()
 
     return_assets = []
@@ -49,9 +50,9 @@ async def process_slide_and_fetch_assets(
             image_dict["__image_url__"] = result
         set_dict_at_path(slide.content, image_path, image_dict)
 
-    for icon_path in icon_paths:
+    for icon_path, icon_result in zip(icon_paths, icon_results):
         icon_dict = get_dict_at_path(slide.content, icon_path)
-        icon_dict["__icon_url__"] = results.pop()[0]
+        icon_dict["__icon_url__"] = icon_result[0]
         set_dict_at_path(slide.content, icon_path, icon_dict)
 
     return return_assets
@@ -100,8 +101,8 @@ async def process_old_and_new_slides_and_fetch_assets(
     async_image_fetch_tasks = []
     new_images_fetch_status = []
 
-    # Creates async tasks for fetching new icons
-    async_icon_fetch_tasks = []
+    # Collects queries of new icons to search them in one batch
+    new_icon_queries = []
     new_icons_fetch_status = []
 
     # Creates async tasks for fetching new images
@@ -135,13 +136,13 @@ async def process_old_and_new_slides_and_fetch_assets(
             new_icons_fetch_status.append(False)
             continue
 
-        async_icon_fetch_tasks.append(
-            ICON_FINDER_SERVICE.search_icons(new_icon["__icon_query__"])
-        )
+        new_icon_queries.append(new_icon["__icon_query__"])
         new_icons_fetch_status.append(True)
 
-    new_images = await asyncio.gather(*async_image_fetch_tasks)
-    new_icons = await asyncio.gather(*async_icon_fetch_tasks)
+    new_images, new_icons = await asyncio.gather(
+        asyncio.gather(*async_image_fetch_tasks),
+        ICON_FINDER_SERVICE.search_icons_batch(new_icon_queries),
+    )
 
     # list of new assets
     new_assets = []
@@ -157,9 +158,10 @@ async def process_old_and_new_slides_and_fetch_assets(
                 image_url = fetched_image
             new_image_dicts[i]["__image_url__"] = image_url
 
-    for i, new_icon in enumerate(new_icons):
+    fetched_icons = iter(new_icons)
+    for i, new_icon_dict in enumerate(new_icon_dicts):
         if new_icons_fetch_status[i]:
-            new_icon_dicts[i]["__icon_url__"] = new_icons[i][0]
+            new_icon_dict["__icon_url__"] = next(fetched_icons)[0]
 
     for i, new_image_dict in enumerate(new_image_dicts):
         set_dict_at_path(new_slide_content, new_image_dict_paths[i], new_image_dict)
@@ -1,7 +1,9 @@
 import os
 import json
+from typing import Optional
 
 from models.user_config import UserConfig
+from services.llm_client import LLM_CLIENT_REGISTRY
 from utils.get_env import (
     get_anthropic_api_key_env,
     get_anthropic_model_env,
@@ -101,8 +103,22 @@ def get_user_config():
     )
 
 
-def update_env_with_user_config():
+def get_llm_client_env() -> tuple:
+    return (
+        get_llm_provider_env(),
+        get_openai_api_key_env(),
+        get_google_api_key_env(),
+        get_anthropic_api_key_env(),
+        get_ollama_url_env(),
+        get_custom_llm_url_env(),
+        get_custom_llm_api_key_env(),
+    )
+
+
+def update_env_with_user_config() -> UserConfig:
     user_config = get_user_config()
+    previous_llm_client_env = get_llm_client_env()
+
     if user_config.LLM:
         set_llm_provider_env(user_config.LLM)
     if user_config.OPENAI_API_KEY:
@@ -141,3 +157,48 @@ def update_env_with_user_config():
         set_extended_reasoning_env(str(user_config.EXTENDED_REASONING))
     if user_config.WEB_GROUNDING is not None:
         set_web_grounding_env(str(user_config.WEB_GROUNDING))
+
+    # Drop shared LLM clients if provider, keys or urls have changed
+    if get_llm_client_env() != previous_llm_client_env:
+        LLM_CLIENT_REGISTRY.invalidate()
+
+    return user_config
+
+
+class UserConfigSnapshot:
+    """
+    User config last applied to the environment.
+    - The config file is only read again when its modification time or size changes,
+    or when reload is called explicitly.
+    """
+
+    def __init__(self):
+        self._file_state = None
+        self.config: Optional[UserConfig] = None
+        self.reloads = 0
+
+    def _get_file_state(self) -> tuple:
+        user_config_path = get_user_config_path_env()
+        try:
+            stat = os.stat(user_config_path)
+            return (user_config_path, stat.st_mtime_ns, stat.st_size)
+        except (OSError, TypeError):
+            return (user_config_path, None, None)
+
+    def refresh(self) -> bool:
+        file_state = self._get_file_state()
+        if self.config is not None and file_state == self._file_state:
+            return False
+        self._apply(file_state)
+        return True
+
+    def reload(self):
+        self._apply(self._get_file_state())
+
+    def _apply(self, file_state: tuple):
+        self._file_state = file_state
+        self.config = update_env_with_user_config()
+        self.reloads += 1
+
+
+USER_CONFIG_SNAPSHOT = UserConfigSnapshot()
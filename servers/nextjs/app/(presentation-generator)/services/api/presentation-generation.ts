@@ -152,7 +152,8 @@ export class PresentationGenerationApi {
   static async generateImage(imageGenerate: ImageGenerate) {
     try {
       const response = await fetch(
-        `/api/v1/ppt/images/generate?prompt=${imageGenerate.prompt}`,
+        // Asking the editor for an image again generates a new one
+        `/api/v1/ppt/images/generate?prompt=${imageGenerate.prompt}&force_fresh=true`,
         {
           method: "GET",
           headers: getHeader(),